@@ -5,11 +5,28 @@ import json
 import os
 import random
 import asyncio
+import hashlib
+import functools
+import multiprocessing
 from dotenv import load_dotenv
-from typing import Dict, List, Optional, Union
-from models.character import Character, Attributes, Skills
+from typing import Dict, List, Optional, Tuple, Union
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from models.character import Character, Attributes, Skills, iter_fields
+from models.character_store import CharacterStore
+from models.sqlite_store import SqliteCharacterStore
+from models.persistence import PersistenceWorker
+from models.roster import LazyCharacterMap
+from models.schema import SchemaSweeper
+from models import codec
 from models.items import Item, ConsumableItem, Inventory
+from models.catalog import registry as item_registry
+from models.item_search import ItemSearchIndex, build_item_index
+from models.gear_spec import GearSpec, compile_starting_gear
 from models.dice import DiceRoll
+from models.system_renderer import paginate
+from models import generation_jobs
 import datetime
 import re
 
@@ -30,14 +47,36 @@ def log_event(msg: str):
 
 class DataManager:
     def __init__(self):
-        self.CHARACTER_FILE = "characters.json"
+        self.PLAYERS_DIR = "players"
+        self.DATABASE_FILE = os.getenv("DATABASE_FILE", "data/alien_rpg.db")
+        self.LEGACY_CHARACTER_FILE = "characters.json"  # Migrated on first run
         self.PLAYERGEN_FILE = "data/playerGenData.json"
+        self.CHARACTER_CACHE_SIZE = int(os.getenv("CHARACTER_CACHE_SIZE", "256"))
         self.characters: Dict[str, Character] = {}
         self.playergen: Dict = {}
-        
-        if not os.path.exists(self.CHARACTER_FILE):
-            with open(self.CHARACTER_FILE, "w") as f:
-                json.dump({}, f)
+        self.item_index = ItemSearchIndex()  # Catalog + starting gear names, for autocomplete
+        self.starting_gear: Dict[str, Tuple[GearSpec, ...]] = {}  # Career -> parsed starting_gear
+        self._playergen_stamp: Optional[tuple] = None  # (mtime_ns, size, sha1) when last read
+        # "json" (per-player files) or "sqlite"
+        self.STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "json").lower()
+        if self.STORAGE_BACKEND == "sqlite":
+            self.character_store = SqliteCharacterStore(self.DATABASE_FILE, self.LEGACY_CHARACTER_FILE)
+        else:
+            self.character_store = CharacterStore(self.PLAYERS_DIR, self.LEGACY_CHARACTER_FILE)
+        # Writes happen in the background once the bot is running; see save_characters
+        self.persistence = PersistenceWorker(
+            take=lambda: self.character_store.take_pending(self.characters),
+            write=self.character_store.write_pending,
+            on_failure=self.character_store.mark_all_dirty,
+        )
+        self.character_store.on_migrated = self.persistence.mark_dirty
+        # Set SCHEMA_SWEEP=1 to upgrade old sheets on disk in the background;
+        # otherwise they are upgraded as they are read and saved
+        self.SCHEMA_SWEEP = os.getenv("SCHEMA_SWEEP", "").lower() in ("1", "true", "yes")
+        self.schema_sweeper = SchemaSweeper(
+            self.character_store, self.persistence,
+            is_loaded=lambda char_id: self.characters.is_loaded(char_id),
+        )
                 
         self.reload_all()
     
@@ -46,37 +85,110 @@ class DataManager:
         self.reload_playergen()
     
     def reload_characters(self):
+        # Only the index is read here; sheets are parsed on first access
         try:
-            with open(self.CHARACTER_FILE, "r") as f:
-                char_data = json.load(f)
-                self.characters = {}
-                for char_id, data in char_data.items():
-                    try:
-                        self.characters[char_id] = Character.from_json(char_id, data)
-                    except Exception as e:
-                        print(f"Error loading character {char_id}: {e}")
+            index = self.character_store.load_roster()
         except Exception as e:
-            print(f"Error loading characters file: {e}")
-            self.characters = {}
+            print(f"Error loading characters: {e}")
+            index = {}
+        self.characters = LazyCharacterMap(self.character_store, index, self.CHARACTER_CACHE_SIZE)
     
     def reload_playergen(self):
+        self._playergen_stamp = None
         try:
-            with open(self.PLAYERGEN_FILE, "r") as f:
-                self.playergen = json.load(f)
+            self.playergen = self._read_playergen_if_changed()
         except Exception as e:
             print(f"Error loading playergen: {e}")
             self.playergen = {}
+        self.item_index = build_item_index(self.playergen)
+        self.starting_gear = compile_starting_gear(self.playergen, self.item_index)
+
+    def _read_playergen_if_changed(self) -> Optional[Dict]:
+        """Parse playerGenData.json only if it changed since it was last read, else None."""
+        st = os.stat(self.PLAYERGEN_FILE)
+        if self._playergen_stamp and self._playergen_stamp[:2] == (st.st_mtime_ns, st.st_size):
+            return None
+        with open(self.PLAYERGEN_FILE, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha1(raw).hexdigest()
+        if self._playergen_stamp and self._playergen_stamp[2] == digest:
+            self._playergen_stamp = (st.st_mtime_ns, st.st_size, digest)
+            return None
+        playergen = codec.loads(raw)
+        self._playergen_stamp = (st.st_mtime_ns, st.st_size, digest)
+        return playergen
+
+    async def reload_changed(self) -> Tuple[int, bool]:
+        """
+        Incremental /reloaddata: re-parse only the character sheets and
+        playergen data that changed on disk. The new state is built in a
+        thread and published with one reference swap each, so commands and
+        creation sessions see either the old state or the new, never a mix.
+        Returns (sheets re-parsed, whether playergen changed).
+        """
+        # Only characters already in memory can be stale; the rest load fresh on access
+        current = self.characters.cached()
+
+        def build():
+            loaded, reparsed = self.character_store.load_changed(current, hydrate=False)
+            playergen = self._read_playergen_if_changed()
+            item_index = starting_gear = None
+            if playergen is not None:
+                item_index = build_item_index(playergen)
+                starting_gear = compile_starting_gear(playergen, item_index)
+            return loaded, reparsed, playergen, item_index, starting_gear
+
+        loaded, reparsed, playergen, item_index, starting_gear = await self.persistence.run_exclusive(build)
+        characters = LazyCharacterMap(self.character_store, self.character_store.index,
+                                      self.CHARACTER_CACHE_SIZE, loaded)
+        # Anything changed while the reload ran is newer than what was on disk
+        for char_id in self.character_store.dirty:
+            if char_id in self.characters:
+                characters[char_id] = self.characters[char_id]
+            else:
+                characters.discard(char_id)
+        self.characters = characters
+        if playergen is not None:
+            self.playergen = playergen
+            self.item_index = item_index
+            self.starting_gear = starting_gear
+        return reparsed, playergen is not None
     
+    def set_character(self, char_id: str, char: Character):
+        self.characters[char_id] = char
+        self.character_store.mark_dirty(char_id)
+
+    def delete_character(self, char_id: str):
+        self.characters.discard(char_id)
+        self.character_store.mark_dirty(char_id)
+
+    def mark_dirty(self, char_id: str):
+        """Call after changing a loaded character in place."""
+        self.character_store.mark_dirty(char_id)
+
     def save_characters(self):
+        """
+        Write the characters that changed since the last save. Once the
+        persistence worker is running this only schedules a debounced
+        background write, so command handlers never wait on disk.
+        """
+        if self.persistence.running:
+            self.persistence.mark_dirty()
+            return
         try:
-            char_data = {
-                char_id: char.to_json() 
-                for char_id, char in self.characters.items()
-            }
-            with open(self.CHARACTER_FILE, "w") as f:
-                json.dump(char_data, f, indent=2)
+            self.character_store.save(self.characters)
         except Exception as e:
             print(f"Error saving characters: {e}")
+
+    async def flush(self):
+        """Write every pending change now, e.g. before shutdown."""
+        await self.persistence.flush()
+
+    async def shutdown(self):
+        """Final flush, then fold the journal into the player files."""
+        await self.schema_sweeper.stop()
+        await self.persistence.stop()
+        await asyncio.to_thread(self.character_store.checkpoint)
     
     def get_characters(self) -> Dict[str, Character]:
         return self.characters
@@ -84,16 +196,170 @@ class DataManager:
     def get_playergen(self) -> Dict:
         return self.playergen
 
+    def get_item_index(self) -> ItemSearchIndex:
+        return self.item_index
+
+    def get_starting_gear(self, career: str) -> Tuple[GearSpec, ...]:
+        return self.starting_gear.get(career, ())
+
 data_manager = DataManager()
 
 creation_sessions: Dict[str, Character] = {}
 
+# ==============================
+# Background generation jobs
+# ==============================
+
+class QuotaExceeded(Exception):
+    """Raised when a user already has the maximum number of jobs in flight."""
+
+@dataclass
+class GenerationJob:
+    id: int
+    user_id: str
+    key: tuple                         # Result cache key, e.g. ("system", seed, detail)
+    title: str
+    interaction: discord.Interaction   # Original response is edited with progress
+    chunks: List[tuple]                # (function, args) calls to run in the process pool
+    cancelled: bool = False
+    cancel_event: Optional[object] = None  # Manager Event the chunk functions poll, made when the job starts
+
+class GenerationQueue:
+    """
+    Runs heavy generation in a process pool so it never blocks the event loop.
+    Jobs are fed through an asyncio queue to a fixed set of consumer tasks;
+    each job may be split into chunks so progress can be reported. A
+    cancelled job frees its slot in the user's limit right away and stops
+    inside its running chunk at the next orbital body. Finished results are
+    cached by key.
+    """
+
+    def __init__(self, workers: int = 2, per_user_limit: int = 2, cache_size: int = 256):
+        self.workers = workers
+        self.per_user_limit = per_user_limit
+        self.cache_size = cache_size
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.manager = None  # multiprocessing.Manager, for cancel events the pool processes can see
+        self.pending: Dict[str, List[GenerationJob]] = {}
+        self.results: "OrderedDict[tuple, List[str]]" = OrderedDict()
+        self._consumers: List[asyncio.Task] = []
+        self._next_id = 1
+
+    async def start(self):
+        """Start the pool and consumers. Safe to call on every on_ready."""
+        if self._consumers:
+            return
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self._consumers = [asyncio.create_task(self._consume()) for _ in range(self.workers)]
+        # Spawning the manager process takes a while; keep it off the loop
+        self.manager = await asyncio.to_thread(multiprocessing.Manager)
+
+    async def stop(self):
+        for task in self._consumers:
+            task.cancel()
+        self._consumers = []
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+        if self.manager:
+            manager, self.manager = self.manager, None
+            await asyncio.to_thread(manager.shutdown)
+
+    def cached(self, key: tuple) -> Optional[List[str]]:
+        pages = self.results.get(key)
+        if pages is not None:
+            self.results.move_to_end(key)
+        return pages
+
+    def submit(self, interaction: discord.Interaction, key: tuple, title: str, chunks: List[tuple]) -> GenerationJob:
+        user_id = str(interaction.user.id)
+        jobs = self.pending.setdefault(user_id, [])
+        if len(jobs) >= self.per_user_limit:
+            raise QuotaExceeded(f"You already have {len(jobs)} generation jobs running. Use /canceljobs or wait.")
+        job = GenerationJob(self._next_id, user_id, key, title, interaction, chunks)
+        self._next_id += 1
+        jobs.append(job)
+        self.queue.put_nowait(job)
+        return job
+
+    def cancel(self, user_id: str) -> int:
+        """
+        Cancel every queued or running job for a user. Returns how many.
+        They stop counting against the user's limit at once.
+        """
+        jobs = self.pending.pop(user_id, [])
+        for job in jobs:
+            job.cancelled = True
+            if job.cancel_event is not None:
+                job.cancel_event.set()
+        return len(jobs)
+
+    async def _progress(self, job: GenerationJob, text: str):
+        try:
+            await job.interaction.edit_original_response(content=f"```text\n{text}\n```")
+        except discord.HTTPException:
+            pass
+
+    async def _consume(self):
+        while True:
+            job = await self.queue.get()
+            try:
+                await self._run(job)
+            except Exception as e:
+                log_event(f"Generation job {job.id} failed: {e}")
+                await self._progress(job, f"[ERROR] {job.title} failed: {e}")
+            finally:
+                jobs = self.pending.get(job.user_id, [])
+                if job in jobs:
+                    jobs.remove(job)
+                if not jobs:
+                    self.pending.pop(job.user_id, None)
+                self.queue.task_done()
+
+    async def _run(self, job: GenerationJob):
+        loop = asyncio.get_running_loop()
+        if self.manager and not job.cancelled:
+            # Each Event is a round trip to the manager process
+            job.cancel_event = await asyncio.to_thread(self.manager.Event)
+        lines: List[str] = []
+        for step, (func, args) in enumerate(job.chunks, 1):
+            if job.cancelled:
+                await self._progress(job, f"[CANCEL] {job.title} cancelled.")
+                return
+            await self._progress(job, f"[RUNNING] {job.title}\nStep {step}/{len(job.chunks)}")
+            call = functools.partial(func, *args, cancel=job.cancel_event)
+            try:
+                lines.extend(await loop.run_in_executor(self.executor, call))
+            except generation_jobs.GenerationCancelled:
+                break
+        if job.cancelled:
+            await self._progress(job, f"[CANCEL] {job.title} cancelled.")
+            return
+        pages = paginate(lines)
+        self.results[job.key] = pages
+        while len(self.results) > self.cache_size:
+            self.results.popitem(last=False)
+        await send_pages(job.interaction, pages)
+
+async def send_pages(interaction: discord.Interaction, pages: List[str]):
+    """Replace the original response with the first page and follow up with the rest."""
+    await interaction.edit_original_response(content=pages[0])
+    for page in pages[1:]:
+        await interaction.followup.send(page, ephemeral=True)
+
+generation_queue = GenerationQueue()
+
 intents = discord.Intents.all()
 bot = commands.Bot(command_prefix="!", intents=intents)
 
 @bot.event
 async def on_ready():
     print("[OK] SYSTEM ONLINE")
+    await generation_queue.start()
+    data_manager.persistence.start()
+    if data_manager.SCHEMA_SWEEP:
+        data_manager.schema_sweeper.start()
     try:
         synced = await bot.tree.sync()
         print(f"Synced {len(synced)} commands")
@@ -755,35 +1021,22 @@ async def select_agenda(user_id):
         await select_gear(user_id)
         return
 
-def handle_dice_roll_item(item_name: str) -> tuple[str, int]:
-    import re
-    from models.dice import DiceRoll
-    
-    dice_pattern = r'(\d+d\d+)\s+(?:doses of|rounds of|)\s*(.+)'
-    match = re.match(dice_pattern, item_name)
-    
-    if match:
-        dice_expr, item_name = match.groups()
-        quantity = DiceRoll.roll(dice_expr)
-        return item_name.strip(), quantity
-    return item_name, 1
-
 async def select_gear(user_id):
     user = await bot.fetch_user(int(user_id))
-    careers = data_manager.get_playergen()["Careers"]
     
     if user_id not in creation_sessions:
         await send_dm(user, "```text\n[ERROR] No career found in session. Please start over with /createcharacter.\n```")
         return
         
     char = creation_sessions[user_id]
-    gear_list = careers[char.career]["starting_gear"]
+    # Parsed once when playerGenData loads; see models/gear_spec.py
+    gear_list = data_manager.get_starting_gear(char.career)
     
     menu = ["```text", ">> GEAR SELECTION <<"]
     menu.append(f"Select your first piece of gear for your {char.career}.")
     menu.append("\nAvailable gear:")
-    for i, item in enumerate(gear_list, 1):
-        menu.append(f"[{i}] {item}")
+    for i, spec in enumerate(gear_list, 1):
+        menu.append(f"[{i}] {spec.text}")
     menu.append("\nEnter the number of your chosen gear:```")
     
     while True:
@@ -800,33 +1053,22 @@ async def select_gear(user_id):
             continue            
             
         first_item = gear_list[choice - 1]
-        item_name, quantity = handle_dice_roll_item(first_item)
+        char.inventory.add_item(first_item.make())
         
-        if 'doses' in first_item.lower() or 'rounds' in first_item.lower():
-            char.inventory.add_item(ConsumableItem(
-                name=item_name,
-                quantity=quantity
-            ))
-        else:
-            char.inventory.add_item(Item(name=item_name))
-        
-        remaining_gear = []
-        for item in gear_list:
-            if item == first_item:
-                continue
-            if any(cat in item.lower() for cat in ["weapon", "gun", "rifle", "pistol"]) and \
-               any(cat in first_item.lower() for cat in ["weapon", "gun", "rifle", "pistol"]):
-                continue
-            remaining_gear.append(item)
+        # Only one weapon among the two picks
+        remaining_gear = [
+            spec for spec in gear_list
+            if spec is not first_item and not (spec.counts_as_weapon and first_item.counts_as_weapon)
+        ]
         
         menu = ["```text", ">> GEAR SELECTION <<"]
         menu.append(f"Select your second piece of gear for your {char.career}.")
-        menu.append(f"\nNOTE: You have selected {first_item}.")
-        if any(cat in first_item.lower() for cat in ["weapon", "gun", "rifle", "pistol"]):
+        menu.append(f"\nNOTE: You have selected {first_item.text}.")
+        if first_item.counts_as_weapon:
             menu.append("You cannot select another weapon.")
         menu.append("\nAvailable gear:")
-        for i, item in enumerate(remaining_gear, 1):
-            menu.append(f"[{i}] {item}")
+        for i, spec in enumerate(remaining_gear, 1):
+            menu.append(f"[{i}] {spec.text}")
         menu.append("\nEnter the number of your chosen gear:```")
         
         while True:
@@ -840,18 +1082,11 @@ async def select_gear(user_id):
                 await send_dm(user, f"[ERROR] Please enter a number between 1 and {len(remaining_gear)}")
                 continue
             second_item = remaining_gear[choice - 1]
-            item_name, quantity = handle_dice_roll_item(second_item)
-            if 'doses' in second_item.lower() or 'rounds' in second_item.lower():
-                char.inventory.add_item(ConsumableItem(
-                    name=item_name,
-                    quantity=quantity
-                ))
-            else:
-                char.inventory.add_item(Item(name=item_name))
+            char.inventory.add_item(second_item.make())
             await send_dm(user, f"""```text
 >> SELECTED GEAR <<
-1. {first_item}
-2. {second_item}
+1. {first_item.text}
+2. {second_item.text}
 
 Confirm these selections? (Y/N)```""")
             
@@ -931,7 +1166,7 @@ async def finalize_character(user_id, finalstep=False):
             value = getattr(char.attributes, attr.lower())
             summary.append(f"  {attr}: {value}")
         summary.append("\n[F] Skills:")
-        for skill_name, value in char.skills.__dict__.items():
+        for skill_name, value in iter_fields(char.skills):
             if value > 0:
                 summary.append(f"  {skill_name.replace('_', ' ').title()}: {value}")
         summary.append(f"\n[G] Gear:")
@@ -954,7 +1189,7 @@ async def finalize_character(user_id, finalstep=False):
         msg = await wait_for_user_message(user)
         choice = msg.content.strip().upper()
         if choice == "1":
-            data_manager.characters[user_id] = char
+            data_manager.set_character(user_id, char)
             data_manager.save_characters()
             del creation_sessions[user_id]
             await send_dm(user, """```text\n[OK] Character creation complete!\nYour character has been saved and is ready for use.\n```""")
@@ -1018,7 +1253,7 @@ async def cmd_sheet(interaction: discord.Interaction):
         value = getattr(char.attributes, attr.lower())
         sheet.append(f"  {attr}: {value} {format_attribute_bar(value)}")
     sheet.append("\nSkills:")
-    for skill_name, value in char.skills.__dict__.items():
+    for skill_name, value in iter_fields(char.skills):
         if value > 0:
             name = skill_name.replace('_', ' ').title()
             sheet.append(f"  {name}: {value} {format_skill_bar(value)}")
@@ -1048,7 +1283,7 @@ async def cmd_delete(interaction: discord.Interaction, *, options: str = ""):
         return
         
     if force:
-        del chars[str(user.id)]
+        data_manager.delete_character(str(user.id))
         data_manager.save_characters()
         await interaction.response.send_message("[OK] Character deleted.", ephemeral=True)
         log_event(f"Character deleted: {str(user.id)} (User: {user.id})")
@@ -1083,7 +1318,7 @@ async def cmd_delete(interaction: discord.Interaction, *, options: str = ""):
     await view.wait()
     
     if view.value:
-        del chars[str(user.id)]
+        data_manager.delete_character(str(user.id))
         data_manager.save_characters()
         await interaction.edit_original_response(
             content="[OK] Character deleted.",
@@ -1099,11 +1334,104 @@ async def cmd_delete(interaction: discord.Interaction, *, options: str = ""):
 @bot.tree.command(name="reloaddata", description="Reload all game data from files.")
 @app_commands.checks.has_permissions(administrator=True)
 async def cmd_reload(interaction: discord.Interaction):
+    await interaction.response.defer(ephemeral=True)
     try:
-        data_manager.reload_all()
-        await interaction.response.send_message("[OK] All game data reloaded.", ephemeral=True)
+        reparsed, playergen_changed = await data_manager.reload_changed()
+        await interaction.followup.send(
+            f"[OK] Game data reloaded: {reparsed} character sheet(s) changed, "
+            f"player generation data {'changed' if playergen_changed else 'unchanged'}.",
+            ephemeral=True
+        )
     except Exception as e:
-        await interaction.response.send_message(f"[ERROR] Failed to reload data: {str(e)}", ephemeral=True)
+        await interaction.followup.send(f"[ERROR] Failed to reload data: {str(e)}", ephemeral=True)
+
+async def queue_generation(interaction: discord.Interaction, key: tuple, title: str, chunks: List[tuple]):
+    cached = generation_queue.cached(key)
+    if cached is not None:
+        await interaction.response.send_message(cached[0], ephemeral=True)
+        for page in cached[1:]:
+            await interaction.followup.send(page, ephemeral=True)
+        return
+    try:
+        generation_queue.submit(interaction, key, title, chunks)
+    except QuotaExceeded as e:
+        await interaction.response.send_message(f"[ERROR] {e}", ephemeral=True)
+        return
+    await interaction.response.send_message(
+        f"```text\n[QUEUED] {title}\nJobs ahead of you: {generation_queue.queue.qsize() - 1}\n```",
+        ephemeral=True
+    )
+
+@bot.tree.command(name="generatesystem", description="Generate a star system.")
+@app_commands.describe(seed="Seed to generate from (random if omitted)", detail="summary or full")
+async def cmd_generate_system(interaction: discord.Interaction, seed: Optional[int] = None, detail: str = "full"):
+    detail = detail.lower()
+    if detail not in ("summary", "full"):
+        await interaction.response.send_message("[ERROR] Detail must be 'summary' or 'full'.", ephemeral=True)
+        return
+    if seed is None:
+        seed = random.randint(0, 2**31 - 1)
+    await queue_generation(
+        interaction, ("system", seed, detail), f"System generation (seed {seed})",
+        [(generation_jobs.system_lines, (seed, detail))]
+    )
+
+SECTOR_CHUNK_SIZE = 25
+SECTOR_MAX_SYSTEMS = 500
+
+@bot.tree.command(name="generatesector", description="Generate a sector of star systems.")
+@app_commands.describe(seed="Seed to generate from (random if omitted)", x="Sector X", y="Sector Y",
+                       count=f"Number of systems (1-{SECTOR_MAX_SYSTEMS})")
+async def cmd_generate_sector(interaction: discord.Interaction, seed: Optional[int] = None,
+                              x: int = 0, y: int = 0, count: int = 50):
+    if not 1 <= count <= SECTOR_MAX_SYSTEMS:
+        await interaction.response.send_message(f"[ERROR] Count must be between 1 and {SECTOR_MAX_SYSTEMS}.", ephemeral=True)
+        return
+    if seed is None:
+        seed = random.randint(0, 2**31 - 1)
+    chunks = [
+        (generation_jobs.sector_lines, (seed, x, y, start, min(SECTOR_CHUNK_SIZE, count - start)))
+        for start in range(0, count, SECTOR_CHUNK_SIZE)
+    ]
+    await queue_generation(
+        interaction, ("sector", seed, x, y, count), f"Sector {x}:{y} generation (seed {seed}, {count} systems)", chunks
+    )
+
+@bot.tree.command(name="canceljobs", description="Cancel your running generation jobs.")
+async def cmd_cancel_jobs(interaction: discord.Interaction):
+    cancelled = generation_queue.cancel(str(interaction.user.id))
+    if cancelled:
+        await interaction.response.send_message(f"[OK] Cancelling {cancelled} job(s).", ephemeral=True)
+    else:
+        await interaction.response.send_message("[ERROR] You have no running jobs.", ephemeral=True)
+
+async def item_name_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+    """Ranked item names for any command option that takes one."""
+    index = data_manager.get_item_index()
+    names = [name for name, _ in index.search(current)] if current.strip() else index.names()
+    # Discord caps choice names and values at 100 characters
+    return [app_commands.Choice(name=name[:100], value=name[:100]) for name in names]
+
+@bot.tree.command(name="iteminfo", description="Look up an item's catalog entry.")
+@app_commands.describe(item="Item name")
+@app_commands.autocomplete(item=item_name_autocomplete)
+async def cmd_item_info(interaction: discord.Interaction, item: str):
+    definition = item_registry.resolve(item)
+    if definition is None:
+        suggestions = [name for name, _ in data_manager.get_item_index().search(item, limit=3, catalog_only=True)]
+        hint = f" Did you mean: {', '.join(suggestions)}?" if suggestions else ""
+        await interaction.response.send_message(f"```text\n[ERROR] No catalog entry for {item}.{hint}\n```", ephemeral=True)
+        return
+    lines = [f">> {definition.name.upper()} <<"]
+    for field_name, value in iter_fields(definition):
+        if field_name in ("name", "description", "lore", "quantity", "stackable", "condition") or value in (None, "", [], False):
+            continue
+        lines.append(f"{field_name.replace('_', ' ').title()}: {', '.join(map(str, value)) if isinstance(value, list) else value}")
+    text = getattr(definition, "lore", None) or definition.description
+    if text:
+        lines.append(f"\n{text}")
+    await interaction.response.defer(ephemeral=True)
+    await send_pages(interaction, paginate(lines))
 
 @bot.tree.command(name="charactercommands", description="List commands.")
 async def cmd_help(interaction: discord.Interaction):
@@ -1113,9 +1441,28 @@ async def cmd_help(interaction: discord.Interaction):
 /sheet            - View your character sheet
 /deletecharacter  - Delete your character (use --force to skip confirmation)
 /reloaddata       - [Admin] Reload game data files
+/generatesystem   - Generate a star system (optional seed)
+/generatesector   - Generate a sector of star systems
+/canceljobs       - Cancel your running generation jobs
+/iteminfo         - Look up an item's catalog entry
 /charactercommands - Show this help message
 ```"""
     await interaction.response.send_message(text, ephemeral=True)
 
-# Start the bot
-bot.run(os.getenv('DISCORD_TOKEN'))
+async def run_bot():
+    async with bot:
+        try:
+            await bot.start(os.getenv('DISCORD_TOKEN'))
+        finally:
+            # Pending character writes must land before the process exits
+            await data_manager.shutdown()
+            await generation_queue.stop()
+
+# Start the bot. Guarded so process pool workers that re-import this
+# module (spawn start method) never start a second bot.
+if __name__ == "__main__":
+    discord.utils.setup_logging()  # bot.run() used to do this for us
+    try:
+        asyncio.run(run_bot())
+    except KeyboardInterrupt:
+        pass
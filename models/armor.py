@@ -1,4 +1,4 @@
-from armor_item import ArmorItem
+from .armor_item import ArmorItem
 
 m3_personnel_armor = ArmorItem(
     name="M3 Personnel Armor",
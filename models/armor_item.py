@@ -2,7 +2,7 @@ from dataclasses import dataclass, field
 from typing import Optional, List, Dict
 from .items import Item
 
-@dataclass
+@dataclass(slots=True)
 class ArmorItem(Item):
     """Armor and clothing that provide protection, insulation, or utility effects."""
 
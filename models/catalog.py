@@ -0,0 +1,175 @@
+import importlib
+import re
+from typing import Dict, Iterator, List, Optional
+from . import items
+from .schema import QUANTITY_SUFFIX
+
+# Category -> module (under models/) that defines its items at module level.
+CATEGORIES = {
+    "weapons": "weapons",
+    "armor": "armor",
+    "equipment": "equipment",
+    "medicals": "medicals",
+    "pharmaceuticals": "pharmaceuticals",
+    "consumables": "consumables",
+}
+
+# Which categories can have entries in each secondary index, so a query
+# only imports the catalogs that could answer it.
+_INDEX_CATEGORIES = {
+    "weapon_class": ("weapons",),
+    "damage_type": ("weapons",),
+    "tag": ("equipment", "medicals", "pharmaceuticals", "consumables"),
+    "slot": ("armor", "equipment", "medicals", "pharmaceuticals", "consumables"),
+}
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+# ---------------------------------------------------------------------------
+# Armor coverage bitmasks
+# ---------------------------------------------------------------------------
+# One bit per body slot, repeated once per layer: bit (layer * SLOT_BITS_PER_LAYER
+# + slot). Two pieces conflict exactly when their masks share a bit, i.e. they
+# cover the same slot on the same layer.
+BODY_SLOTS = ("head", "eyes", "neck", "shoulders", "torso", "abdomen", "crotch",
+              "arms", "wrist", "legs", "feet", "front")
+SLOT_ALIASES = {"limbs": ("arms", "legs"), "arm": ("arms",), "leg": ("legs",)}
+SLOT_BITS_PER_LAYER = 32
+# Sealed suits with no coverage listed are whole-body suits
+SEALED_SUIT_SLOTS = ("torso", "limbs", "head")
+
+_SLOT_BIT = {slot: 1 << i for i, slot in enumerate(BODY_SLOTS)}
+
+def slot_bits(slot: str) -> int:
+    """Bits for one coverage_slots entry; names not in BODY_SLOTS get a bit of their own on first sight."""
+    slot = slot.lower()
+    aliased = SLOT_ALIASES.get(slot)
+    if aliased is not None:
+        return sum(slot_bits(name) for name in aliased)
+    bit = _SLOT_BIT.get(slot)
+    if bit is None:
+        if len(_SLOT_BIT) == SLOT_BITS_PER_LAYER:
+            raise ValueError(f"More than {SLOT_BITS_PER_LAYER} distinct coverage slots; cannot add {slot!r}")
+        bit = _SLOT_BIT[slot] = 1 << len(_SLOT_BIT)
+    return bit
+
+def compile_slot_mask(coverage_slots, layer: int = 1, sealed: bool = False) -> int:
+    """Coverage of one armor piece as a bitmask on its layer (0 for non-armor)"""
+    if not coverage_slots:
+        coverage_slots = SEALED_SUIT_SLOTS if sealed else ()
+    bits = 0
+    for slot in coverage_slots:
+        bits |= slot_bits(slot)
+    return bits << (max(0, layer) * SLOT_BITS_PER_LAYER)
+
+def normalize_name(name: str) -> str:
+    """Case, punctuation and spacing folded away: '.357 Magnum  Revolver' -> '357 magnum revolver'"""
+    return _NON_ALNUM.sub(" ", name.lower()).strip()
+
+class ItemRegistry:
+    """
+    Catalog item definitions, imported one category at a time on first use.
+
+    Definitions are indexed by normalized name and by weapon_class,
+    damage_type, usage_tags and slot (armor coverage slots included).
+    Definitions are shared by every ItemInstance that refers to them and
+    must be treated as read-only.
+    """
+
+    def __init__(self, categories: Optional[Dict[str, str]] = None):
+        self.categories = dict(CATEGORIES if categories is None else categories)
+        self._items: Dict[str, List['items.Item']] = {}  # Loaded categories only
+        self._by_name: Dict[str, 'items.Item'] = {}
+        self._indexes: Dict[str, Dict[str, List['items.Item']]] = {key: {} for key in _INDEX_CATEGORIES}
+        self._slot_masks: Dict[str, int] = {}  # Normalized name -> coverage bitmask, armor only
+
+    @property
+    def loaded_categories(self) -> List[str]:
+        return list(self._items)
+
+    def category(self, category: str) -> List['items.Item']:
+        """Every definition in one category, importing its module if needed."""
+        loaded = self._items.get(category)
+        if loaded is None:
+            loaded = self._load(category)
+        return loaded
+
+    def _load(self, category: str) -> List['items.Item']:
+        module = importlib.import_module(f"{__package__}.{self.categories[category]}")
+        loaded = [value for value in vars(module).values() if isinstance(value, items.Item)]
+        for item in loaded:
+            # First definition wins when two share a name
+            self._by_name.setdefault(normalize_name(item.name), item)
+            self._index("weapon_class", getattr(item, "weapon_class", None), item)
+            self._index("damage_type", getattr(item, "damage_type", None), item)
+            for tag in getattr(item, "usage_tags", None) or ():
+                self._index("tag", tag, item)
+            self._index("slot", getattr(item, "slot", None), item)
+            for slot in getattr(item, "coverage_slots", None) or ():
+                self._index("slot", slot, item)
+            if hasattr(item, "coverage_slots"):
+                self._slot_masks.setdefault(normalize_name(item.name), compile_slot_mask(
+                    item.coverage_slots, item.layer, getattr(item, "sealed", False)))
+        self._items[category] = loaded
+        return loaded
+
+    def _index(self, index: str, key, item: 'items.Item') -> None:
+        if isinstance(key, str) and key:
+            self._indexes[index].setdefault(key.lower(), []).append(item)
+
+    def load_all(self) -> None:
+        for category in self.categories:
+            self.category(category)
+
+    def _lookup(self, index: str, key: str) -> List['items.Item']:
+        for category in _INDEX_CATEGORIES[index]:
+            if category in self.categories:
+                self.category(category)
+        return list(self._indexes[index].get(key.lower(), ()))
+
+    def get(self, name: str) -> Optional['items.Item']:
+        """The definition called `name`, ignoring case, punctuation and spacing."""
+        if len(self._items) < len(self.categories):
+            self.load_all()
+        return self._by_name.get(normalize_name(name))
+
+    def resolve(self, gear: str) -> Optional['items.Item']:
+        """Definition for a stored gear string such as 'M4A3 Service Pistol (x2)'."""
+        match = QUANTITY_SUFFIX.search(gear)
+        return self.get(gear[:match.start()] if match else gear)
+
+    def slot_mask(self, name: str) -> int:
+        """Precompiled coverage bitmask of the armor called `name`; 0 for anything else."""
+        self.category("armor")
+        return self._slot_masks.get(normalize_name(name), 0)
+
+    def by_weapon_class(self, weapon_class: str) -> List['items.Item']:
+        return self._lookup("weapon_class", weapon_class)
+
+    def by_damage_type(self, damage_type: str) -> List['items.Item']:
+        return self._lookup("damage_type", damage_type)
+
+    def by_tag(self, tag: str) -> List['items.Item']:
+        return self._lookup("tag", tag)
+
+    def by_slot(self, slot: str) -> List['items.Item']:
+        return self._lookup("slot", slot)
+
+    def __iter__(self) -> Iterator['items.Item']:
+        self.load_all()
+        for loaded in self._items.values():
+            yield from loaded
+
+    def __len__(self) -> int:
+        self.load_all()
+        return sum(len(loaded) for loaded in self._items.values())
+
+registry = ItemRegistry()
+
+def definitions() -> Dict[str, 'items.Item']:
+    """Every catalog definition keyed by normalized name."""
+    registry.load_all()
+    return registry._by_name
+
+def lookup(name: str) -> Optional['items.Item']:
+    return registry.get(name)
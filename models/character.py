@@ -1,16 +1,21 @@
-from typing import Dict, List, Optional
-from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, field, fields
 from .items import Inventory, Item, ConsumableItem
 from .dice import DiceRoll
+from . import codec
+from . import schema
+from . import derived_stats
+from . import loadout
+from .derived_stats import DerivedStats
 
-@dataclass
+@dataclass(slots=True)
 class Attributes:
     strength: int = 2
     agility: int = 2
     wits: int = 2
     empathy: int = 2
 
-@dataclass
+@dataclass(slots=True)
 class Skills:
     heavy_machinery: int = 0
     stamina: int = 0
@@ -25,7 +30,7 @@ class Skills:
     command: int = 0
     medical_aid: int = 0
 
-@dataclass
+@dataclass(slots=True)
 class Character:
     """Represents a player character in the game"""
     id: str
@@ -40,6 +45,10 @@ class Character:
     inventory: Inventory = field(default_factory=Inventory)
     signature_item: str = ""
     cash: int = 0
+    equipped: List[str] = field(default_factory=list)  # Names of worn/readied inventory items
+    conditions: Dict[str, Dict[str, int]] = field(default_factory=dict)  # Condition -> {STAT: modifier}
+    # (fingerprint, DerivedStats) from the last stats lookup; see models/derived_stats.py
+    _stats: Optional[Tuple[tuple, DerivedStats]] = field(default=None, init=False, repr=False, compare=False)
     
     @classmethod
     def create_new(cls, char_id: str, name: str) -> 'Character':
@@ -58,72 +67,82 @@ class Character:
     @classmethod
     def from_json(cls, char_id: str, data: Dict) -> 'Character':
         """Create a character from JSON data. Handles both complete and partial data."""
-        # Start with default values
-        char = cls(
+        data = schema.migrate(data)  # Older sheets are upgraded here; see models/schema.py
+        attributes = data.get('Attributes')
+        skills = data.get('Skills')
+        gear = data.get('Gear')
+        equipped = data.get('Equipped')
+        conditions = data.get('Conditions')
+        supplies = data.get('Supplies')
+        cash = _decode_cash(data.get('Cash', 0))  # Rolled before any gear dice, as before
+        return cls(
             id=char_id,
             name=data.get('Name', char_id),  # Use ID as name if not provided
             career=data.get('Career', ""),
             gender=data.get('Gender', ""),
             age=data.get('Age', 0),
-            attributes=Attributes(),
-            skills=Skills(),
-            inventory=Inventory()
+            # Attribute and skill keys are matched case-insensitively; unknown ones are dropped
+            attributes=_decode_attributes(attributes) if isinstance(attributes, dict) else Attributes(),
+            skills=_decode_skills(skills) if isinstance(skills, dict) else Skills(),
+            talent=data.get('Talent', ""),
+            agenda=data.get('Agenda', ""),
+            inventory=Inventory.from_json(gear, supplies if isinstance(supplies, dict) else None)
+                if isinstance(gear, list) else Inventory(),
+            signature_item=data.get('Signature Item', ""),
+            cash=cash,
+            equipped=[str(name) for name in equipped] if isinstance(equipped, list) else [],
+            conditions={
+                str(name): {str(k): int(v) for k, v in (modifiers or {}).items()}
+                for name, modifiers in conditions.items()
+            } if isinstance(conditions, dict) else {},
         )
-        
-        # Update attributes if provided
-        if 'Attributes' in data and isinstance(data['Attributes'], dict):
-            attr_data = {k.lower(): v for k, v in data['Attributes'].items()}
-            # Only update valid attributes
-            valid_attrs = {'strength', 'agility', 'wits', 'empathy'}
-            attr_data = {k: v for k, v in attr_data.items() if k in valid_attrs}
-            for attr, value in attr_data.items():
-                setattr(char.attributes, attr, value)
-            
-        # Update skills if provided
-        if 'Skills' in data and isinstance(data['Skills'], dict):
-            skill_data = {k.lower(): v for k, v in data['Skills'].items()}
-            # Only update valid skills
-            valid_skills = {
-                'heavy_machinery', 'stamina', 'close_combat', 'mobility',
-                'piloting', 'ranged_combat', 'observation', 'comtech',
-                'survival', 'manipulation', 'command', 'medical_aid'
-            }
-            skill_data = {k: v for k, v in skill_data.items() if k in valid_skills}
-            for skill, value in skill_data.items():
-                setattr(char.skills, skill, value)
-            
-        # Update other fields if provided
-        char.talent = data.get('Talent', char.talent)
-        char.agenda = data.get('Agenda', char.agenda)
-        char.signature_item = data.get('Signature Item', char.signature_item)
-            
-        # Handle cash with dice roll if needed
-        cash_value = data.get('Cash', char.cash)
-        if isinstance(cash_value, str) and 'd' in cash_value:
-            char.cash = DiceRoll.roll(cash_value)
-        elif isinstance(cash_value, (int, str)):
-            char.cash = int(cash_value)
-            
-        # Handle gear if provided
-        if 'Gear' in data and isinstance(data['Gear'], list):
-            for item in data['Gear']:
-                if isinstance(item, str):
-                    if 'doses' in item.lower():
-                        # Handle items with random quantities
-                        name = item.split('doses')[-1].strip()
-                        dice_expr = item.split('doses')[0].strip()
-                        char.inventory.add_item(ConsumableItem(
-                            name=name,
-                            dice_expression=dice_expr
-                        ))
-                    else:
-                        char.inventory.add_item(Item(name=item))
-                elif isinstance(item, dict):
-                    for name in item:
-                        char.inventory.add_item(Item(name=name))
-                        
-        return char
     
+    @property
+    def carrying_capacity(self) -> float:
+        """Regular items a character can carry: twice their Strength"""
+        return self.attributes.strength * 2
+
+    def is_over_encumbered(self) -> bool:
+        return self.inventory.is_over_encumbered(self.carrying_capacity)
+
+    @property
+    def stats(self) -> DerivedStats:
+        """
+        Effective attributes, skills and dice pools. Cached on the character
+        and rebuilt only after attributes, skills, equipment or conditions
+        change, so resolving a roll never walks the inventory.
+        """
+        key = derived_stats.fingerprint(self)
+        if self._stats is None or self._stats[0] != key:
+            self._stats = (key, derived_stats.compute(self))
+        return self._stats[1]
+
+    def equip(self, item_name: str) -> bool:
+        """
+        Equip a carried item. False if it isn't carried, is already equipped,
+        or is armor covering a slot already covered on the same layer
+        (see loadout.conflicts for which pieces are in the way).
+        """
+        if item_name not in self.inventory or item_name in self.equipped:
+            return False
+        if loadout.conflicts(self, item_name):
+            return False
+        self.equipped.append(item_name)
+        return True
+
+    def unequip(self, item_name: str) -> bool:
+        if item_name not in self.equipped:
+            return False
+        self.equipped.remove(item_name)
+        return True
+
+    def add_condition(self, name: str, modifiers: Optional[Dict[str, int]] = None) -> None:
+        """Apply a condition, e.g. add_condition("Drunk", {"WITS": -1}). Re-adding replaces its modifiers."""
+        self.conditions[name] = dict(modifiers or {})
+
+    def remove_condition(self, name: str) -> bool:
+        return self.conditions.pop(name, None) is not None
+
     def to_json(self) -> Dict:
         """Convert character to JSON format"""
         return {
@@ -131,18 +150,39 @@ class Character:
             'Career': self.career,
             'Gender': self.gender,
             'Age': self.age,
-            'Attributes': {
-                'Strength': self.attributes.strength,
-                'Agility': self.attributes.agility,
-                'Wits': self.attributes.wits,
-                'Empathy': self.attributes.empathy
-            },
-            'Skills': {
-                k.title(): v for k, v in self.skills.__dict__.items()
-            },
+            'Attributes': _encode_attributes(self.attributes),
+            'Skills': _encode_skills(self.skills),
             'Talent': self.talent,
             'Agenda': self.agenda,
-            'Gear': [str(item) for item in self.inventory.items],
+            'Gear': self.inventory.to_json(),
             'Signature Item': self.signature_item,
-            'Cash': self.cash
-        }
\ No newline at end of file
+            'Cash': self.cash,
+            'Equipped': list(self.equipped),
+            'Conditions': {name: dict(modifiers) for name, modifiers in self.conditions.items()},
+            'Supplies': self.inventory.supplies_to_json(),  # Live air/power/ammo by Gear position
+            'Version': schema.SCHEMA_VERSION,
+        }
+
+def iter_fields(obj) -> Iterator[Tuple[str, Any]]:
+    """(field name, value) pairs of a dataclass, in declaration order. Slotted classes have no __dict__ to walk."""
+    names = _FIELD_NAMES.get(type(obj))
+    if names is None:
+        names = _FIELD_NAMES[type(obj)] = tuple(f.name for f in fields(obj))
+    for name in names:
+        yield name, getattr(obj, name)
+
+_FIELD_NAMES: Dict[type, Tuple[str, ...]] = {}
+
+# Generated once from the dataclass fields; JSON keys are the title-cased names
+_encode_attributes = codec.compile_encoder(Attributes, str.title)
+_decode_attributes = codec.compile_decoder(Attributes, str.title)
+_encode_skills = codec.compile_encoder(Skills, str.title)
+_decode_skills = codec.compile_decoder(Skills, str.title)
+
+def _decode_cash(value) -> int:
+    # Starting cash may still be a dice expression such as "1d6 x 100"
+    if isinstance(value, str) and 'd' in value:
+        return DiceRoll.roll(value)
+    if isinstance(value, (int, str)):
+        return int(value)
+    return 0
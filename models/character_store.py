@@ -0,0 +1,439 @@
+import hashlib
+import json
+import os
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from .character import Character
+from . import codec
+from . import schema
+from .codec import write_json_atomic
+from .journal import Journal, CHECKPOINT_FILE, fsync_dir
+
+DEFAULT_PLAYERS_DIR = "players"
+INDEX_FILE = "index.json"
+LEGACY_CHARACTER_FILE = "characters.json"
+# Journal records allowed to pile up before they are folded into the player files.
+DEFAULT_CHECKPOINT_EVERY = 256
+
+# (mtime_ns, size, sha1 of contents) of a player file as last read or written
+FileStamp = Tuple[int, int, str]
+
+class CharacterStore:
+    """
+    Stores each character in its own `players/{player_id}.json` file.
+
+    Only characters marked dirty (or created/removed since the last save) are
+    written, so the cost of a save no longer grows with the roster, and a bad
+    write can only ever damage one sheet. A small `players/index.json` keeps
+    the name and career of every character for fast listing at startup.
+
+    With the journal enabled, background saves (write_pending) only append
+    the changed sheets to `players/journal.jsonl` with one fsync per batch.
+    Every `checkpoint_every` records the journaled sheets are written out to
+    their player files and the journal is reset; loading replays whatever
+    tail of the journal was not checkpointed before a crash.
+    """
+
+    def __init__(self, players_dir: str = DEFAULT_PLAYERS_DIR,
+                 legacy_file: Optional[str] = LEGACY_CHARACTER_FILE,
+                 use_journal: bool = True, checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY):
+        self.players_dir = players_dir
+        self.legacy_file = legacy_file
+        self.checkpoint_every = checkpoint_every
+        self.journal: Optional[Journal] = Journal(players_dir) if use_journal else None
+        self.index: Dict[str, Dict[str, str]] = {}
+        self._dirty: Set[str] = set()
+        # Journaled changes not yet written to the player files (None = deleted)
+        self._unflushed: Dict[str, Optional[Dict]] = {}
+        # Writer-side copy of the index, owned by whichever thread is saving
+        self._disk_index: Dict[str, Dict[str, str]] = {}
+        self._stamps: Dict[str, FileStamp] = {}
+        self._in_flight: Set[str] = set()  # Taken by take_pending, not yet written
+        self._migrated: Set[str] = set()  # Upgraded to the current schema on read; written back on the next save
+        # Called when a read upgrades a sheet, to schedule that save (e.g. PersistenceWorker.mark_dirty)
+        self.on_migrated: Optional[Callable[[], None]] = None
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.players_dir, INDEX_FILE)
+
+    def path_for(self, char_id: str) -> str:
+        return os.path.join(self.players_dir, f"{char_id}.json")
+
+    @staticmethod
+    def _index_entry(data: Dict) -> Dict[str, str]:
+        return {"Name": data.get("Name", ""), "Career": data.get("Career", "")}
+
+    # -----------------------------------------------------------------------
+    # Loading
+    # -----------------------------------------------------------------------
+
+    def load_index(self) -> Dict[str, Dict[str, str]]:
+        """Read the index, rebuilding it from the player files if it is missing or unreadable."""
+        try:
+            with open(self.index_path, "rb") as f:
+                self.index = codec.loads(f.read())
+        except (OSError, ValueError):
+            self.rebuild_index()
+        return self.index
+
+    def rebuild_index(self) -> Dict[str, Dict[str, str]]:
+        """Re-read every player file to regenerate index.json."""
+        index = {}
+        if not os.path.isdir(self.players_dir):
+            self.index = index
+            return index
+        for file_name in sorted(os.listdir(self.players_dir)):
+            if not file_name.endswith(".json") or file_name in (INDEX_FILE, CHECKPOINT_FILE):
+                continue
+            char_id = file_name[:-len(".json")]
+            try:
+                with open(self.path_for(char_id), "rb") as f:
+                    index[char_id] = self._index_entry(codec.loads(f.read()))
+            except (OSError, ValueError) as e:
+                print(f"Error indexing character {char_id}: {e}")
+        write_json_atomic(self.index_path, index)
+        self.index = index
+        self._disk_index = dict(index)
+        return index
+
+    def load_data(self, char_id: str) -> Dict:
+        if char_id in self._unflushed:
+            data = self._unflushed[char_id]
+            if data is None:
+                raise KeyError(f"Character {char_id} was deleted")
+            return data
+        path = self.path_for(char_id)
+        with open(path, "rb") as f:
+            raw = f.read()
+            st = os.fstat(f.fileno())
+        # Stamp it so a later load_changed can tell whether it was edited
+        self._stamps[char_id] = (st.st_mtime_ns, st.st_size, hashlib.sha1(raw).hexdigest())
+        return codec.loads(raw)
+
+    def load(self, char_id: str) -> Character:
+        return self._parse(char_id, self.load_data(char_id))
+
+    def load_roster(self) -> Dict[str, Dict[str, str]]:
+        """
+        Get ready to load characters one at a time: migrate the legacy file,
+        fold in any journal tail left by a crash and return the index,
+        without parsing a single sheet up front.
+        """
+        if not os.path.isdir(self.players_dir):
+            self.migrate_legacy()
+        self.load_index()
+        self._dirty = set()
+        self._disk_index = dict(self.index)
+        if self.journal is not None:
+            self._recover({})
+        return self.index
+
+    def iter_data(self) -> Iterator[Tuple[str, Dict]]:
+        """
+        Yield (id, sheet data) for every player file, one file at a time.
+        Call after load_roster() so no change is left only in the journal.
+        """
+        if not os.path.isdir(self.players_dir):
+            return
+        with os.scandir(self.players_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".json") or entry.name in (INDEX_FILE, CHECKPOINT_FILE):
+                    continue
+                try:
+                    with open(entry.path, "rb") as f:
+                        yield entry.name[:-len(".json")], codec.loads(f.read())
+                except (OSError, ValueError) as e:
+                    print(f"Error reading {entry.path}: {e}")
+
+    def load_all(self) -> Dict[str, Character]:
+        """Load every indexed character, migrating the legacy single file on first run."""
+        if not os.path.isdir(self.players_dir):
+            self.migrate_legacy()
+        characters, _ = self._load_files({})
+        self._dirty.clear()
+        self._disk_index = dict(self.index)
+        if self.journal is not None:
+            self._recover(characters)
+        return characters
+
+    def load_changed(self, current: Dict[str, Character],
+                     hydrate: bool = True) -> Tuple[Dict[str, Character], int]:
+        """
+        Reload only the sheets whose files changed since they were last read
+        or written; unchanged characters are carried over from `current` as
+        the same objects. Journaled changes are checkpointed first so the
+        files are up to date. With `hydrate` off, only sheets already in
+        `current` are considered and the rest are left to load on demand
+        (see load_roster). Returns the new roster and how many sheets were
+        re-parsed. Meant to run off the event loop.
+        """
+        if not self.checkpoint():
+            print("Journal checkpoint failed; reloading over the journaled changes")
+        characters, reparsed = self._load_files(current, hydrate)
+        for char_id, data in self._unflushed.items():
+            if data is None:
+                characters.pop(char_id, None)
+            elif hydrate or char_id in current:
+                characters[char_id] = self._parse(char_id, data)
+        return characters, reparsed
+
+    def _load_files(self, current: Dict[str, Character],
+                    hydrate: bool = True) -> Tuple[Dict[str, Character], int]:
+        characters = {}
+        stamps: Dict[str, FileStamp] = {}
+        reparsed = 0
+        for char_id in self.load_index():
+            path = self.path_for(char_id)
+            old = current.get(char_id)
+            stamp = self._stamps.get(char_id)
+            if old is None and not hydrate:
+                continue  # Read fresh whenever it is first asked for
+            try:
+                st = os.stat(path)
+                if old is not None and stamp is not None and stamp[:2] == (st.st_mtime_ns, st.st_size):
+                    # Cheap check first: file untouched since we last saw it
+                    characters[char_id] = old
+                    stamps[char_id] = stamp
+                    continue
+                with open(path, "rb") as f:
+                    raw = f.read()
+                digest = hashlib.sha1(raw).hexdigest()
+                stamps[char_id] = (st.st_mtime_ns, st.st_size, digest)
+                if old is not None and stamp is not None and stamp[2] == digest:
+                    # Touched but not changed
+                    characters[char_id] = old
+                    continue
+                characters[char_id] = self._parse(char_id, codec.loads(raw))
+                reparsed += 1
+            except Exception as e:
+                print(f"Error loading character {char_id}: {e}")
+        self._stamps = stamps
+        return characters, reparsed
+
+    def _recover(self, characters: Dict[str, Character]) -> None:
+        """Apply journal records newer than the last checkpoint, then fold them in."""
+        replayed = 0
+        for record in self.journal.replay():
+            char_id, data = record["id"], record.get("data")
+            if record["op"] == "delete":
+                characters.pop(char_id, None)
+                self.index.pop(char_id, None)
+                self._unflushed[char_id] = None
+            else:
+                try:
+                    characters[char_id] = self._parse(char_id, data)
+                except Exception as e:
+                    print(f"Error replaying character {char_id}: {e}")
+                    continue
+                self.index[char_id] = self._index_entry(data)
+                self._unflushed[char_id] = data
+            replayed += 1
+        if replayed:
+            print(f"Recovered {replayed} journaled character change(s)")
+            self._disk_index = dict(self.index)
+            self.checkpoint()
+
+    def migrate_legacy(self) -> int:
+        """Split the old all-in-one characters.json into per-player files. Returns the number moved."""
+        os.makedirs(self.players_dir, exist_ok=True)
+        if not self.legacy_file or not os.path.exists(self.legacy_file):
+            write_json_atomic(self.index_path, {})
+            return 0
+        try:
+            with open(self.legacy_file, "r") as f:
+                legacy = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error reading legacy characters file: {e}")
+            legacy = {}
+        index = {}
+        for char_id, data in legacy.items():
+            write_json_atomic(self.path_for(char_id), data)
+            index[char_id] = self._index_entry(data)
+        write_json_atomic(self.index_path, index)
+        self.index = index
+        return len(index)
+
+    # -----------------------------------------------------------------------
+    # Saving
+    # -----------------------------------------------------------------------
+
+    def mark_dirty(self, char_id: str) -> None:
+        """Flag a character as changed (or deleted) so the next save writes it."""
+        self._dirty.add(char_id)
+
+    def mark_all_dirty(self, char_ids: Iterable[str]) -> None:
+        self._dirty.update(char_ids)
+
+    @property
+    def dirty(self) -> Set[str]:
+        return set(self._dirty)
+
+    def is_pending(self, char_id: str) -> bool:
+        """True while a change to the character has not reached disk yet."""
+        return char_id in self._dirty or char_id in self._in_flight or char_id in self._migrated
+
+    def _parse(self, char_id: str, data: Dict) -> Character:
+        char = Character.from_json(char_id, data)
+        if schema.is_outdated(data):
+            # Pending until written, so it stays cached; have it written soon rather than at some unrelated save
+            self._migrated.add(char_id)
+            if self.on_migrated is not None:
+                self.on_migrated()
+        return char
+
+    def upgrade_stored(self, char_ids: Iterable[str]) -> int:
+        """
+        Rewrite any of these stored sheets that are on an older schema,
+        without keeping them loaded. Used by schema.SchemaSweeper; meant to
+        run off the event loop. Returns the number upgraded.
+        """
+        batch = {}
+        for char_id in char_ids:
+            try:
+                data = self.load_data(char_id)
+                if schema.is_outdated(data):
+                    batch[char_id] = Character.from_json(char_id, data).to_json()
+            except Exception as e:
+                print(f"Error upgrading character {char_id}: {e}")
+        if not batch:
+            return 0
+        return len(batch) - len(self.write_pending(batch))
+
+    def take_pending(self, characters: Dict[str, Character]) -> Optional[Dict[str, Optional[Dict]]]:
+        """
+        Serialize everything that needs writing and clear its dirty flag.
+        A lone character added to or removed from `characters` without being
+        marked is picked up by comparing against the index. Returns the batch
+        (id -> data, or None for a deletion), or None when there is nothing
+        to write.
+
+        This only builds plain dicts, so it is safe to call on the event loop
+        and hand the result to write_pending() in a worker thread.
+        """
+        # Swap in a fresh set: a set emptied by discards keeps its old capacity
+        pending, self._dirty = self._dirty, set()
+        if self._migrated:
+            # Upgraded on read; anything no longer in the roster was deleted and is already marked
+            pending |= {char_id for char_id in self._migrated if char_id in characters}
+            self._migrated = set()
+        if len(characters) != len(self.index):
+            # Added or removed without being marked; only scan when the sizes disagree
+            pending |= characters.keys() ^ self.index.keys()
+        if not pending:
+            return None
+        batch: Dict[str, Optional[Dict]] = {}
+        for char_id in sorted(pending):
+            char = characters.get(char_id)
+            if char is None:
+                batch[char_id] = None
+                self.index.pop(char_id, None)
+            else:
+                try:
+                    data = char.to_json()
+                except Exception as e:
+                    print(f"Error serializing character {char_id}: {e}")
+                    self._dirty.add(char_id)
+                    continue
+                batch[char_id] = data
+                self.index[char_id] = self._index_entry(data)
+        self._in_flight = set(batch)
+        return batch
+
+    def write_pending(self, batch: Dict[str, Optional[Dict]]) -> List[str]:
+        """
+        Write a batch from take_pending(). With the journal this is a single
+        append and fsync; otherwise every sheet is rewritten. Returns the ids
+        that failed to write.
+        """
+        if self.journal is not None:
+            try:
+                for char_id, data in batch.items():
+                    self.journal.append("delete" if data is None else "put", char_id, data)
+                self.journal.commit()
+            except Exception as e:
+                print(f"Error journaling characters: {e}")
+                return list(batch)
+            self._unflushed.update(batch)
+            self._update_disk_index(batch)
+            self._in_flight = set()
+            if self.journal.records_since_checkpoint >= self.checkpoint_every:
+                self.checkpoint()
+            return []
+        failed = self._write_files(batch)
+        # Failures stay pending until the caller marks them dirty again
+        self._in_flight = set(failed)
+        return failed
+
+    def _update_disk_index(self, batch: Dict[str, Optional[Dict]]) -> None:
+        for char_id, data in batch.items():
+            if data is None:
+                self._disk_index.pop(char_id, None)
+            else:
+                self._disk_index[char_id] = self._index_entry(data)
+
+    def import_batch(self, batch: Dict[str, Optional[Dict]]) -> List[str]:
+        """
+        Bulk-load path: write sheets straight to their files, skipping the
+        journal and leaving index.json until finish_import(). Returns the
+        ids that failed.
+        """
+        return self._write_files(batch, write_index=False)
+
+    def finish_import(self) -> None:
+        write_json_atomic(self.index_path, self._disk_index)
+        fsync_dir(self.players_dir)
+        self.index = dict(self._disk_index)
+
+    def _write_files(self, batch: Dict[str, Optional[Dict]], write_index: bool = True) -> List[str]:
+        os.makedirs(self.players_dir, exist_ok=True)
+        failed = []
+        for char_id, data in batch.items():
+            try:
+                if data is None:
+                    if os.path.exists(self.path_for(char_id)):
+                        os.remove(self.path_for(char_id))
+                    self._stamps.pop(char_id, None)
+                else:
+                    path = self.path_for(char_id)
+                    raw = write_json_atomic(path, data)
+                    st = os.stat(path)
+                    self._stamps[char_id] = (st.st_mtime_ns, st.st_size, hashlib.sha1(raw).hexdigest())
+            except Exception as e:
+                print(f"Error saving character {char_id}: {e}")
+                failed.append(char_id)
+        self._update_disk_index({k: v for k, v in batch.items() if k not in failed})
+        if batch and write_index:
+            write_json_atomic(self.index_path, self._disk_index)
+        return failed
+
+    def checkpoint(self) -> bool:
+        """
+        Write every journaled change to the player files and reset the
+        journal. If any file fails, the journal is kept so nothing is lost.
+        """
+        if self.journal is None:
+            return True
+        if self._unflushed:
+            failed = self._write_files(self._unflushed)
+            if failed:
+                return False
+            fsync_dir(self.players_dir)
+        self.journal.checkpoint()
+        self._unflushed = {}
+        return True
+
+    def save(self, characters: Dict[str, Character]) -> int:
+        """
+        Write dirty characters straight to their files and drop files for
+        deleted ones, checkpointing the journal. Returns the number of sheets saved.
+        """
+        pending = self.take_pending(characters)
+        if pending is None:
+            self.checkpoint()
+            return 0
+        failed = self.write_pending(pending)
+        if not failed and not self.checkpoint():
+            failed = list(pending)
+        # Leave failures dirty so the next save retries them
+        self.mark_all_dirty(failed)
+        return len(pending) - len(failed)
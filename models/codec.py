@@ -0,0 +1,89 @@
+import json
+import os
+from dataclasses import fields
+from typing import Any, Callable, Dict, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder is used instead
+    orjson = None
+
+# Indent written JSON for debugging or exports. Compact otherwise, since
+# indentation roughly doubles encode time and file size.
+PRETTY_JSON = os.getenv("JSON_PRETTY", "").lower() in ("1", "true", "yes")
+
+def dumps(data: Any, pretty: Optional[bool] = None) -> bytes:
+    """Encode to UTF-8 JSON bytes, with orjson when it is installed."""
+    if pretty is None:
+        pretty = PRETTY_JSON
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(data, indent=2).encode()
+    return json.dumps(data, separators=(",", ":")).encode()
+
+def loads(raw: Union[bytes, str]) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def write_json_atomic(path: str, data, pretty: Optional[bool] = None) -> bytes:
+    """
+    Write JSON to a temp file and rename it over `path`, so a crash never
+    leaves half a file. Returns the bytes written. Compact unless `pretty`
+    (or JSON_PRETTY) asks for indentation.
+    """
+    raw = dumps(data, pretty)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(raw)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return raw
+
+# ---------------------------------------------------------------------------
+# Schema-compiled dataclass codecs
+# ---------------------------------------------------------------------------
+# Encoders and decoders are generated once per dataclass from its fields, so
+# a call is a single dict literal or constructor call instead of walking
+# __dict__, building key sets and remapping case on every sheet.
+
+def _compile(source: str, name: str, namespace: Dict) -> Callable:
+    exec(compile(source, f"<codec {name}>", "exec"), namespace)
+    return namespace[name]
+
+def compile_encoder(cls, key: Callable[[str], str] = str) -> Callable[[Any], Dict]:
+    """
+    Build `encode(obj) -> dict` for a flat dataclass. `key` maps a field
+    name to its JSON key (e.g. str.title for 'Heavy_Machinery').
+    """
+    name = f"encode_{cls.__name__}"
+    items = ", ".join(f"{key(f.name)!r}: obj.{f.name}" for f in fields(cls))
+    return _compile(f"def {name}(obj):\n    return {{{items}}}\n", name, {})
+
+def compile_decoder(cls, key: Callable[[str], str] = str) -> Callable[[Dict], Any]:
+    """
+    Build `decode(data) -> cls` for a flat dataclass whose fields all have
+    defaults. Data with exactly the expected keys goes straight to the
+    constructor; anything else falls back to a case-insensitive match that
+    ignores unknown keys and leaves missing fields at their defaults.
+    """
+    name = f"decode_{cls.__name__}"
+    names = [f.name for f in fields(cls)]
+    args = ", ".join(f"{n}=data[{key(n)!r}]" for n in names)
+    source = (
+        f"def {name}(data):\n"
+        f"    if len(data) == {len(names)}:\n"
+        f"        try:\n"
+        f"            return cls({args})\n"
+        f"        except KeyError:\n"
+        f"            pass\n"
+        f"    obj = cls()\n"
+        f"    for k, v in data.items():\n"
+        f"        field_name = lookup(k.lower())\n"
+        f"        if field_name is not None:\n"
+        f"            setattr(obj, field_name, v)\n"
+        f"    return obj\n"
+    )
+    return _compile(source, name, {"cls": cls, "lookup": {n.lower(): n for n in names}.get})
@@ -0,0 +1,227 @@
+import gzip
+import os
+import re
+import shutil
+from typing import Any, Dict, List, Optional
+from . import codec
+from .codec import write_json_atomic
+
+DEFAULT_COMBAT_DIR = "combat"
+ARCHIVE_DIR = "archive"
+# A full snapshot is written at least this often; turns in between are deltas.
+DEFAULT_KEYFRAME_EVERY = 10
+
+_TURN_FILE = re.compile(r"^(snapshot|delta)_turn_(\d+)\.json$")
+
+# ---------------------------------------------------------------------------
+# JSON-patch style deltas
+# ---------------------------------------------------------------------------
+# Ops follow RFC 6902 ({"op": "add" | "remove" | "replace", "path": "/a/0/b",
+# "value": ...}), limited to what diff() produces.
+
+def _escape(key: str) -> str:
+    return key.replace("~", "~0").replace("/", "~1")
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+def diff(old: Any, new: Any, path: str = "") -> List[Dict]:
+    """Ops that turn `old` into `new`. Unchanged subtrees cost one C-level comparison."""
+    if old == new and type(old) is type(new):
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key, value in old.items():
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+            else:
+                ops.extend(diff(value, new[key], f"{path}/{_escape(key)}"))
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": f"{path}/{_escape(key)}", "value": value})
+        return ops
+    if isinstance(old, list) and isinstance(new, list):
+        common = min(len(old), len(new))
+        changed = sum(1 for i in range(common) if old[i] != new[i])
+        if changed * 2 > common + 1:
+            # Mostly rewritten (e.g. an insert at the front): one replace is smaller
+            return [{"op": "replace", "path": path, "value": new}]
+        ops = []
+        for i in range(common):
+            ops.extend(diff(old[i], new[i], f"{path}/{i}"))
+        for i in range(common, len(new)):
+            ops.append({"op": "add", "path": f"{path}/{i}", "value": new[i]})
+        # Remove from the end so earlier indexes stay valid
+        for i in range(len(old) - 1, common - 1, -1):
+            ops.append({"op": "remove", "path": f"{path}/{i}"})
+        return ops
+    return [{"op": "replace", "path": path, "value": new}]
+
+def apply_patch(doc: Any, ops: List[Dict]) -> Any:
+    """Apply ops from diff() to `doc` in place. Returns the (possibly replaced) document."""
+    for op in ops:
+        tokens = [_unescape(t) for t in op["path"].split("/")[1:]]
+        if not tokens:
+            doc = op["value"]  # Root replace
+            continue
+        parent = doc
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        last = tokens[-1]
+        if isinstance(parent, list):
+            index = len(parent) if last == "-" else int(last)
+            if op["op"] == "add":
+                parent.insert(index, op["value"])
+            elif op["op"] == "remove":
+                del parent[index]
+            else:
+                parent[index] = op["value"]
+        elif op["op"] == "remove":
+            del parent[last]
+        else:
+            parent[last] = op["value"]
+    return doc
+
+# ---------------------------------------------------------------------------
+# Snapshot store
+# ---------------------------------------------------------------------------
+
+class CombatSnapshotStore:
+    """
+    Per-turn combat state for one encounter, under `combat/{encounter_id}/`.
+
+    Every `keyframe_every` turns a full `snapshot_turn_N.json` is written;
+    the turns in between are `delta_turn_N.json` files holding only the ops
+    since the previous saved turn, so disk use and write time follow how
+    much changed rather than how big the state is. Any turn can be loaded
+    by replaying deltas from the nearest keyframe at or before it.
+
+    end_encounter() (or leaving a `with` block cleanly) bundles every turn
+    into one gzip-compressed `combat/archive/{encounter_id}.json.gz` and
+    removes the per-turn files; turns stay loadable from the bundle.
+    """
+
+    def __init__(self, encounter_id: str, root: str = DEFAULT_COMBAT_DIR,
+                 keyframe_every: int = DEFAULT_KEYFRAME_EVERY):
+        if keyframe_every < 1:
+            raise ValueError("keyframe_every must be at least 1")
+        self.encounter_id = encounter_id
+        self.directory = os.path.join(root, encounter_id)
+        self.archive_path = os.path.join(root, ARCHIVE_DIR, f"{encounter_id}.json.gz")
+        self.keyframe_every = keyframe_every
+        self._kinds: Dict[int, str] = {}  # Saved turn -> "snapshot" or "delta"
+        self._bundle: Optional[Dict[int, Dict]] = None
+        self._last_turn: Optional[int] = None
+        self._last_keyframe: Optional[int] = None
+        self._last_state: Any = None
+        if os.path.isdir(self.directory):
+            self._scan()
+
+    @property
+    def archived(self) -> bool:
+        return os.path.exists(self.archive_path) and not os.path.isdir(self.directory)
+
+    def _path(self, kind: str, turn: int) -> str:
+        return os.path.join(self.directory, f"{kind}_turn_{turn}.json")
+
+    def _scan(self) -> None:
+        """Pick up an encounter in progress, e.g. after a restart."""
+        for file_name in os.listdir(self.directory):
+            match = _TURN_FILE.match(file_name)
+            if match:
+                self._kinds[int(match.group(2))] = match.group(1)
+        keyframes = [t for t, kind in self._kinds.items() if kind == "snapshot"]
+        first_keyframe = min(keyframes) if keyframes else None
+        # Deltas with no keyframe before them can't be replayed (e.g. the
+        # snapshot was lost); set them aside so they don't shadow new turns
+        for turn in [t for t in self._kinds if first_keyframe is None or t < first_keyframe]:
+            del self._kinds[turn]
+            path = self._path("delta", turn)
+            print(f"Warning: {path} has no keyframe before it; renamed to orphan_delta_turn_{turn}.json")
+            os.replace(path, os.path.join(self.directory, f"orphan_delta_turn_{turn}.json"))
+        if self._kinds:
+            self._last_turn = max(self._kinds)
+            self._last_keyframe = max(keyframes)
+            self._last_state = self.load_turn(self._last_turn)
+
+    def turns(self) -> List[int]:
+        if self.archived:
+            return sorted(self._load_bundle())
+        return sorted(self._kinds)
+
+    def save_turn(self, turn: int, state: Dict) -> int:
+        """Persist the state at the end of a turn. Returns the bytes written."""
+        if self.archived:
+            raise ValueError(f"Encounter {self.encounter_id} has already been archived")
+        if self._last_turn is not None and turn <= self._last_turn:
+            raise ValueError(f"Turn {turn} is not after the last saved turn {self._last_turn}")
+        os.makedirs(self.directory, exist_ok=True)
+        # Private copy to diff the next turn against; the caller keeps mutating theirs
+        copy = codec.loads(codec.dumps(state, pretty=False))
+        if self._last_keyframe is None or turn - self._last_keyframe >= self.keyframe_every:
+            raw = write_json_atomic(self._path("snapshot", turn), copy)
+            self._kinds[turn] = "snapshot"
+            self._last_keyframe = turn
+        else:
+            delta = {"base": self._last_turn, "ops": diff(self._last_state, copy)}
+            raw = write_json_atomic(self._path("delta", turn), delta)
+            self._kinds[turn] = "delta"
+        self._last_turn = turn
+        self._last_state = copy
+        return len(raw)
+
+    def _read(self, kind: str, turn: int) -> Dict:
+        if self._bundle is not None:
+            return self._bundle[turn][kind]
+        with open(self._path(kind, turn), "rb") as f:
+            return codec.loads(f.read())
+
+    def load_turn(self, turn: int) -> Dict:
+        """State at the end of `turn`, rebuilt from the nearest keyframe."""
+        kinds = self._kinds
+        if self.archived:
+            kinds = {t: next(iter(entry)) for t, entry in self._load_bundle().items()}
+        if turn not in kinds:
+            raise KeyError(f"Turn {turn} was not saved for encounter {self.encounter_id}")
+        keyframe = max(t for t, kind in kinds.items() if kind == "snapshot" and t <= turn)
+        state = self._read("snapshot", keyframe)
+        for t in sorted(t for t in kinds if keyframe < t <= turn):
+            state = apply_patch(state, self._read("delta", t)["ops"])
+        return state
+
+    def _load_bundle(self) -> Dict[int, Dict]:
+        if self._bundle is None:
+            with gzip.open(self.archive_path, "rb") as f:
+                bundle = codec.loads(f.read())
+            self._bundle = {int(t): entry for t, entry in bundle["turns"].items()}
+        return self._bundle
+
+    def end_encounter(self) -> Optional[str]:
+        """Bundle every turn into the compressed archive and remove the turn files."""
+        if self.archived:
+            return self.archive_path
+        if not self._kinds:
+            return None
+        turns = {str(t): {kind: self._read(kind, t)} for t, kind in sorted(self._kinds.items())}
+        bundle = {"encounter_id": self.encounter_id, "keyframe_every": self.keyframe_every, "turns": turns}
+        os.makedirs(os.path.dirname(self.archive_path), exist_ok=True)
+        tmp_path = f"{self.archive_path}.tmp"
+        with open(tmp_path, "wb") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb") as f:
+                f.write(codec.dumps(bundle, pretty=False))
+            raw.flush()
+            os.fsync(raw.fileno())
+        # The bundle must be durable before the turn files go
+        os.replace(tmp_path, self.archive_path)
+        shutil.rmtree(self.directory)
+        self._kinds = {}
+        self._last_state = None
+        return self.archive_path
+
+    def __enter__(self) -> 'CombatSnapshotStore':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # A crash mid-fight leaves the turn files in place for recovery
+        if exc_type is None:
+            self.end_encounter()
@@ -1,4 +1,4 @@
-from equipment_item import ConsumableItem
+from .equipment_item import ConsumableItem
 
 # --- FOOD AND DRINK CONSUMABLES ---
 
@@ -0,0 +1,96 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+# Each skill is rolled together with its governing attribute.
+SKILL_ATTRIBUTES = {
+    "heavy_machinery": "strength",
+    "stamina": "strength",
+    "close_combat": "strength",
+    "mobility": "agility",
+    "piloting": "agility",
+    "ranged_combat": "agility",
+    "observation": "wits",
+    "comtech": "wits",
+    "survival": "wits",
+    "manipulation": "empathy",
+    "command": "empathy",
+    "medical_aid": "empathy",
+}
+ATTRIBUTES = ("strength", "agility", "wits", "empathy")
+
+def stat_key(name: str) -> str:
+    """Catalog modifier keys ('MEDICAL AID', 'Heavy Machinery') as field names ('medical_aid')"""
+    return "_".join(str(name).lower().split())
+
+@dataclass(slots=True, frozen=True)
+class DerivedStats:
+    """
+    Effective numbers for one character: base attributes and skills with
+    equipped gear and current conditions applied.
+
+    `situational` holds bonuses that only apply in some circumstances
+    (ghillie suit in matching terrain, a winch while climbing) as
+    (modifier, circumstance, source) per skill; they are never folded into
+    `pools`, the GM adds them when they apply. `other` collects modifiers to
+    things that are neither skills nor attributes, such as SICKNESS.
+    """
+    attributes: Dict[str, int]
+    skills: Dict[str, int]
+    pools: Dict[str, int]
+    situational: Dict[str, List[Tuple[int, str, str]]]
+    other: Dict[str, int]
+
+    def pool(self, skill: str) -> int:
+        """Base dice for a roll with `skill` (attribute + skill)"""
+        return self.pools[stat_key(skill)]
+
+def compute(char) -> DerivedStats:
+    """Walk a character's equipped gear and conditions once and total everything up."""
+    attr_mods: Dict[str, int] = {}
+    skill_mods: Dict[str, int] = {}
+    other: Dict[str, int] = {}
+    situational: Dict[str, List[Tuple[int, str, str]]] = {}
+
+    def apply(modifiers: Optional[Dict]) -> None:
+        for key, value in (modifiers or {}).items():
+            key = stat_key(key)
+            target = attr_mods if key in ATTRIBUTES else skill_mods if key in SKILL_ATTRIBUTES else other
+            target[key] = target.get(key, 0) + int(value)
+
+    for name in char.equipped:
+        item = char.inventory.get_item(name)
+        if item is None:
+            continue  # Equipped but since dropped or used up
+        apply(getattr(item, "skill_modifiers", None))
+        apply(getattr(item, "attribute_modifiers", None))
+        for entry in getattr(item, "conditional_modifiers", None) or ():
+            situational.setdefault(stat_key(entry.get("skill", "")), []).append(
+                (int(entry.get("modifier", 0)), entry.get("condition", ""), item.name))
+        bonus = getattr(item, "mobility_bonus", None)
+        if bonus:
+            situational.setdefault("mobility", []).append((bonus, f"when using the {item.name}", item.name))
+    for modifiers in char.conditions.values():
+        apply(modifiers)
+
+    attributes = {
+        name: max(0, getattr(char.attributes, name) + attr_mods.get(name, 0)) for name in ATTRIBUTES
+    }
+    skills = {
+        name: max(0, getattr(char.skills, name) + skill_mods.get(name, 0)) for name in SKILL_ATTRIBUTES
+    }
+    pools = {name: attributes[attr] + skills[name] for name, attr in SKILL_ATTRIBUTES.items()}
+    return DerivedStats(attributes, skills, pools, situational, other)
+
+def fingerprint(char) -> tuple:
+    """
+    Everything compute() reads that can change: attribute and skill
+    values, which equipped items are still carried, and the active
+    conditions. Catalog definitions are read-only, so they need no part in it.
+    """
+    attrs, skills = char.attributes, char.skills
+    return (
+        tuple(getattr(attrs, name) for name in ATTRIBUTES),
+        tuple(getattr(skills, name) for name in SKILL_ATTRIBUTES),
+        tuple(name for name in char.equipped if name in char.inventory),
+        tuple((name, tuple(modifiers.items())) for name, modifiers in char.conditions.items()),
+    )
@@ -2,10 +2,10 @@ from dataclasses import dataclass, field
 from typing import Optional, List, Dict
 from .items import Item
 
-@dataclass
+@dataclass(slots=True)
 class EquipmentItem(Item):
     name: str  # Name of the item, used for identification and display
-    cost: int  # Market or requisition cost in UA dollars
+    cost: int = 0  # Market or requisition cost in UA dollars
     weight: Optional[float] = 0  # How much inventory space the item takes (0 = negligible)
     description: Optional[str] = None  # Short lore-based or mechanical summary of the item
     skill_modifiers: Optional[Dict[str, int]] = None  # Dict mapping skill names to bonus values (e.g., {"COMTECH": +1})
@@ -23,19 +23,19 @@ class EquipmentItem(Item):
     mobility_bonus: Optional[int] = None  # Bonus to MOBILITY rolls in specific scenarios (e.g., winch climbing aid)
     detection_modifier: Optional[Dict[str, int]] = None  # Bonuses or penalties to being seen or targeted (e.g., -1 OBSERVATION)
 
-@dataclass
+@dataclass(slots=True)
 class MedicalItem(EquipmentItem):
     medical_aid_level: Optional[int] = None  # Skill level the item performs medical actions with, if automated
     programmable: bool = False  # Whether the item requires a COMTECH roll to configure or initiate
     limited_uses: Optional[int] = None  # Number of uses available before the item is expended (if not power-based)
 
-@dataclass
+@dataclass(slots=True)
 class PharmaceuticalItem(EquipmentItem):
     effects: List[str] = field(default_factory=list)  # Text descriptions of mechanical effects (e.g., "+1 STRESS")
     addictive: bool = False  # Whether repeated use has in-world addiction consequences
     black_market: bool = False  # Whether the substance is illegal, controlled, or black-market restricted
 
-@dataclass
+@dataclass(slots=True)
 class ConsumableItem(EquipmentItem):
     supply_type: Optional[str] = None  # Type of consumable it increases: "food", "water", or both
     stress_effect: Optional[int] = None  # STRESS LEVEL increase or decrease (e.g., +1 for coffee, -1 for alcohol)
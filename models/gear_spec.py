@@ -0,0 +1,127 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+from . import catalog
+from . import items
+from .dice import DiceRoll
+
+# "1d6 doses of Neversleep pills", "D6 doses X-Drugs", "1d6 flares"
+_DICE_PREFIX = re.compile(r"^(\d*)d(\d+)\s+(?:(doses?|rounds?)\s+(?:of\s+)?)?(.+)$", re.IGNORECASE)
+# "2 G2 Electroshock Grenades"
+_COUNT_PREFIX = re.compile(r"^(\d+)\s+(.+)$")
+# Words select_gear has always used for the one-weapon rule. Menus keep that
+# rule as it was; the catalog category (is_weapon) is broader and also counts
+# grenades, stun batons, the cutting torch, the revolver and the shotgun.
+WEAPON_KEYWORDS = ("weapon", "gun", "rifle", "pistol")
+
+@dataclass(slots=True, frozen=True)
+class GearSpec:
+    """
+    One starting-gear entry from playerGenData, parsed once: what item it
+    makes, how many, and what kind of gear it is.
+    """
+    text: str                      # As written in playerGenData, for menus
+    name: str                      # Name of the item to create (the catalog's, when known)
+    definition: Optional['items.Item']
+    quantity: int = 1              # Fixed count, unless quantity_dice is set
+    quantity_dice: Optional[str] = None
+    category: str = "gear"         # weapon, armor, medical, consumable, equipment or gear
+    consumable: bool = False
+
+    @property
+    def is_weapon(self) -> bool:
+        return self.category == "weapon"
+
+    @property
+    def counts_as_weapon(self) -> bool:
+        """For the starting-gear one-weapon rule: at most one pick may be this"""
+        return any(word in self.text.lower() for word in WEAPON_KEYWORDS)
+
+    def roll_quantity(self) -> int:
+        return DiceRoll.roll(self.quantity_dice) if self.quantity_dice else self.quantity
+
+    def make(self, quantity: Optional[int] = None) -> 'items.Item':
+        """A fresh item for this entry, with any quantity dice rolled now unless `quantity` is given."""
+        if quantity is None:
+            quantity = self.roll_quantity()
+        if self.definition is not None:
+            return items.ItemInstance(self.definition, quantity)
+        if self.consumable:
+            return items.ConsumableItem(name=self.name, quantity=quantity)
+        return items.Item(name=self.name, quantity=quantity)
+
+def _category(definition: Optional['items.Item'], text: str, consumable: bool) -> str:
+    if definition is None:
+        if consumable:
+            return "consumable"
+        return "weapon" if any(word in text.lower() for word in WEAPON_KEYWORDS) else "gear"
+    kind = type(definition).__name__
+    if kind == "WeaponItem":
+        return "weapon"
+    if kind == "ArmorItem":
+        return "armor"
+    if kind == "MedicalItem":
+        return "medical"
+    if kind in ("PharmaceuticalItem", "ConsumableItem"):
+        return "consumable"
+    return "equipment"
+
+def _resolve(name: str, index=None) -> Optional['items.Item']:
+    registry = catalog.registry
+    definition = registry.resolve(name)
+    if definition is None and name.lower().endswith("s"):
+        definition = registry.resolve(name[:-1])  # "Grenades"
+    if definition is None and index is not None:
+        from .item_search import catalog_name
+        matched = catalog_name(index, name, registry)
+        definition = registry.get(matched) if matched else None
+    return definition
+
+def parse_gear(text: str, index=None) -> GearSpec:
+    """
+    Parse one gear string. With an item search `index`, shortened names
+    ('M41A Pulse Rifle') are matched to their catalog entry too.
+    """
+    text = text.strip()
+    name, quantity, dice, consumable = text, 1, None, False
+    match = _DICE_PREFIX.match(text)
+    if match:
+        count, sides, unit, name = match.groups()
+        dice = f"{count or 1}d{sides}"
+        consumable = unit is not None
+    else:
+        match = _COUNT_PREFIX.match(text)
+        if match:
+            quantity, name = int(match.group(1)), match.group(2)
+    name = name.strip()
+    definition = _resolve(name, index)
+    category = _category(definition, text, consumable)
+    return GearSpec(
+        text=text,
+        name=definition.name if definition is not None else name,
+        definition=definition,
+        quantity=quantity,
+        quantity_dice=dice,
+        category=category,
+        consumable=consumable or category == "consumable",
+    )
+
+def is_doses(text: str) -> bool:
+    """True for an unrolled 'XdY doses NAME' entry, the one dice form older saved sheets can hold"""
+    match = _DICE_PREFIX.match(text.strip())
+    return match is not None and (match.group(3) or "").lower().startswith("dose")
+
+@lru_cache(maxsize=1024)
+def spec_for(text: str) -> GearSpec:
+    """parse_gear without fuzzy matching, cached; for saved 'doses' entries"""
+    return parse_gear(text)
+
+def compile_starting_gear(playergen: Dict, index=None) -> Dict[str, Tuple[GearSpec, ...]]:
+    """Career -> parsed starting gear, in menu order"""
+    table = {}
+    for career, details in (playergen.get("Careers") or {}).items():
+        table[career] = tuple(
+            parse_gear(text, index) for text in details.get("starting_gear") or () if isinstance(text, str)
+        )
+    return table
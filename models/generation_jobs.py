@@ -0,0 +1,28 @@
+from typing import List
+from .worldbuilding import generate_seeded_system, generate_sector, GenerationCancelled
+from .system_renderer import DetailLevel, render_lines
+
+# Entry points run inside the bot's process pool. They must stay top-level,
+# picklable and free of Discord objects, and only return plain data.
+#
+# `cancel` is an Event shared with the bot (a multiprocessing.Manager proxy);
+# it is checked before every orbital body, so a cancelled job stops mid-chunk
+# with GenerationCancelled instead of running its chunk to the end.
+
+def _should_stop(cancel):
+    return cancel.is_set if cancel is not None else None
+
+def system_lines(seed: int, detail: str = DetailLevel.FULL.value, cancel=None) -> List[str]:
+    """Render the star system generated from a seed."""
+    system = generate_seeded_system(seed, f"SYS-{seed}", should_stop=_should_stop(cancel))
+    return render_lines(system, DetailLevel(detail))
+
+def sector_lines(seed: int, sector_x: int, sector_y: int, start: int, count: int, cancel=None) -> List[str]:
+    """Render one chunk of a sector as one summary line per system."""
+    lines = []
+    for system in generate_sector(sector_x, sector_y, count, seed, start=start, should_stop=_should_stop(cancel)):
+        lines.append(
+            f"{system.id:<12} {system.star.name:<14} ({system.x:>7.2f}, {system.y:>7.2f}) "
+            f"{len(system.bodies)} bodies  {system.exploration_status.value}"
+        )
+    return lines
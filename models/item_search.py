@@ -0,0 +1,129 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from .catalog import ItemRegistry, normalize_name, registry as default_registry
+
+# Nicknames players type for catalog items -> catalog name.
+ALIASES = {
+    "medkit": "Personal Medkit",
+    "med kit": "Personal Medkit",
+    "pulse rifle": "Armat M41A Pulse Rifle",
+    "smartgun": "M56A2 Smart Gun",
+    "flamethrower": "M240 Incinerator Unit",
+    "flamer": "M240 Incinerator Unit",
+    "shotgun": "Armat Model 37A2 12 Gauge Pump Action",
+    "flashlight": "Hi-beam Flashlight",
+    "tracker": "M314 Motion Tracker",
+}
+
+# Discord shows at most 25 autocomplete choices
+MAX_RESULTS = 25
+
+def trigrams(text: str) -> Set[str]:
+    """Trigrams of each word, padded so word starts weigh more: 'm41a' -> '  m', ' m4', 'm41', '41a', '1a '"""
+    grams = set()
+    for word in normalize_name(text).split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+class ItemSearchIndex:
+    """
+    Fuzzy item-name search for autocomplete. Every searchable term (catalog
+    names, aliases, playerGen gear strings) is split into trigrams once, up
+    front; a query only touches the posting lists of its own trigrams, so
+    lookups stay well under a millisecond however many items there are.
+
+    Results are the names to offer, best first. An alias resolves to the
+    name it stands for and each name is offered once.
+    """
+
+    def __init__(self):
+        self._values: List[str] = []        # Entry id -> name offered
+        self._terms: List[str] = []         # Entry id -> normalized term matched
+        self._sizes: List[int] = []         # Entry id -> trigram count
+        self._postings: Dict[str, List[int]] = {}
+        self._seen: Set[Tuple[str, str]] = set()
+        self.catalog_names: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def add(self, term: str, value: Optional[str] = None) -> None:
+        """Make `value` (default: `term` itself) findable by typing `term`."""
+        value = term if value is None else value
+        key = (normalize_name(term), value)
+        if not key[0] or key in self._seen:
+            return
+        self._seen.add(key)
+        entry = len(self._values)
+        grams = trigrams(term)
+        self._values.append(value)
+        self._terms.append(key[0])
+        self._sizes.append(len(grams))
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(entry)
+
+    def search(self, query: str, limit: int = MAX_RESULTS, catalog_only: bool = False) -> List[Tuple[str, float]]:
+        """(name, score) pairs ranked best first; scores run 0..~1.5."""
+        grams = trigrams(query)
+        if not grams:
+            return []
+        shared: Dict[int, int] = {}
+        for gram in grams:
+            for entry in self._postings.get(gram, ()):
+                shared[entry] = shared.get(entry, 0) + 1
+        needle = normalize_name(query)
+        best: Dict[str, float] = {}
+        for entry, hits in shared.items():
+            value = self._values[entry]
+            if catalog_only and value not in self.catalog_names:
+                continue
+            # Mostly "how much of the query is in the name", a little
+            # overall similarity so shorter names win ties
+            score = 0.7 * hits / len(grams) + 0.3 * 2 * hits / (len(grams) + self._sizes[entry])
+            term = self._terms[entry]
+            if term.startswith(needle):
+                score += 0.5
+            elif needle in term:
+                score += 0.25
+            if score > best.get(value, 0.0):
+                best[value] = score
+        ranked = sorted(best.items(), key=lambda pair: (-pair[1], pair[0]))
+        return ranked[:limit]
+
+    def names(self, limit: int = MAX_RESULTS) -> List[str]:
+        """What to offer before anything is typed: catalog names A-Z."""
+        return sorted(self.catalog_names)[:limit]
+
+def build_item_index(playergen: Optional[Dict] = None,
+                     registry: Optional[ItemRegistry] = None,
+                     aliases: Optional[Dict[str, str]] = None) -> ItemSearchIndex:
+    """Index every catalog item, its aliases, and the starting gear listed in playerGenData."""
+    registry = default_registry if registry is None else registry
+    index = ItemSearchIndex()
+    for item in registry:
+        index.add(item.name)
+        index.catalog_names.add(item.name)
+    for alias, name in (ALIASES if aliases is None else aliases).items():
+        definition = registry.get(name)
+        if definition is not None:
+            index.add(alias, definition.name)
+    for name in _starting_gear(playergen or {}):
+        index.add(name, catalog_name(index, name, registry) or name)
+    return index
+
+def catalog_name(index: ItemSearchIndex, name: str, registry: Optional[ItemRegistry] = None) -> Optional[str]:
+    """The catalog item a playerGen gear string means, if any: an exact name or a shortened one ('M41A Pulse Rifle')"""
+    definition = (default_registry if registry is None else registry).resolve(name)
+    if definition is not None:
+        return definition.name
+    grams = trigrams(name)
+    for candidate, _ in index.search(name, limit=1, catalog_only=True):
+        if grams <= trigrams(candidate):
+            return candidate
+    return None
+
+def _starting_gear(playergen: Dict) -> Iterable[str]:
+    for career in (playergen.get("Careers") or {}).values():
+        for name in career.get("starting_gear") or ():
+            if isinstance(name, str):
+                yield name
@@ -1,8 +1,11 @@
-from typing import Dict, List, Optional, Union
-from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+from dataclasses import dataclass
 from .dice import DiceRoll
+from .schema import QUANTITY_SUFFIX
+from . import catalog
+from . import gear_spec
 
-@dataclass
+@dataclass(slots=True)
 class Item:
     """Base class for all items in the game"""
     name: str
@@ -23,7 +26,115 @@ class Item:
         """Get the current value of the item based on condition"""
         return round(self.condition * self.price)
 
-@dataclass
+    def to_json(self) -> str:
+        """Items are saved as their display string, e.g. 'Flashlight (x1)'"""
+        return str(self)
+
+    @staticmethod
+    def from_json(entry: Union[str, Dict]) -> List['Item']:
+        """Items for one Gear entry: a plain name, 'XdY doses NAME', or a {name: ...} dict"""
+        if isinstance(entry, str):
+            # Saved stacks read back as 'Name (xN)'
+            match = QUANTITY_SUFFIX.search(entry)
+            if match is not None:
+                return [make_item(entry[:match.start()], int(match.group(1)))]
+            # Older sheets may hold unrolled doses; see models/gear_spec.py. Other
+            # names are exact: 'D20 Dice Set' is an item, not a dice roll
+            if gear_spec.is_doses(entry):
+                # One item whose uses are the rolled doses, as these entries always loaded
+                spec = gear_spec.spec_for(entry)
+                if spec.definition is not None:
+                    return [ItemInstance(spec.definition, uses=spec.roll_quantity())]
+                return [ConsumableItem(name=spec.name, uses=spec.roll_quantity())]
+            return [make_item(entry)]
+        if isinstance(entry, dict):
+            return [make_item(name) for name in entry]
+        return []
+
+# Reloads a weapon that uses ammo is carried with: the loaded magazine and
+# one spare. The catalog has no per-weapon figure.
+STARTING_RELOADS = 2
+
+class ItemInstance:
+    """
+    One carried copy of a catalog item (see models/catalog.py).
+
+    The definition, with its dozens of stat fields and lore text, is shared
+    by every instance; an instance only holds what differs per copy. Stat
+    lookups such as `instance.damage` fall through to the definition, and
+    assigning to them raises AttributeError, so a definition is never
+    changed through one of its instances.
+    """
+    __slots__ = ("definition", "quantity", "condition", "ammo", "power", "uses", "air")
+
+    def __init__(self, definition: Item, quantity: int = 1, condition: int = 1,
+                 ammo: Optional[int] = None, power: Optional[int] = None, uses: Optional[int] = None,
+                 air: Optional[int] = None):
+        self.definition = definition
+        self.quantity = quantity
+        self.condition = condition
+        # Reloads left, for weapons that use ammo; None for anything else
+        self.ammo = ammo if ammo is not None else (STARTING_RELOADS if getattr(definition, "uses_ammo", False) else None)
+        # Power and uses start full
+        self.power = power if power is not None else (
+            getattr(definition, "power_supply", None) or getattr(definition, "power_supply_rating", None))
+        self.uses = uses if uses is not None else getattr(definition, "limited_uses", None)
+        self.air = air if air is not None else getattr(definition, "air_supply_rating", None)
+
+    @property
+    def name(self) -> str:
+        return self.definition.name
+
+    @property
+    def stackable(self) -> bool:
+        return self.definition.stackable
+
+    def __getattr__(self, attr: str):
+        if attr == "definition":  # Not set yet, e.g. while copying
+            raise AttributeError(attr)
+        return getattr(self.definition, attr)
+
+    def __str__(self) -> str:
+        return Item.__str__(self)
+
+    def __repr__(self) -> str:
+        return f"ItemInstance({self.name!r}, quantity={self.quantity}, condition={self.condition})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ItemInstance):
+            return NotImplemented
+        return self.definition is other.definition and all(
+            getattr(self, slot) == getattr(other, slot) for slot in self.__slots__[1:])
+
+    def get_value(self) -> int:
+        """Current value based on condition; catalog items are priced by `cost`"""
+        return round(self.condition * (self.definition.price or getattr(self.definition, "cost", 0)))
+
+    def to_json(self) -> str:
+        return str(self)
+
+    def copy(self, quantity: int) -> 'ItemInstance':
+        """Another instance of the same definition with this one's live state"""
+        return ItemInstance(self.definition, quantity, self.condition, self.ammo, self.power, self.uses, self.air)
+
+# Live ratings that change in play and are saved per carried copy (the
+# sheet's 'Supplies'); see models/supplies.py
+SUPPLY_FIELDS = ("air", "power", "ammo")
+
+def supply_state(item) -> Dict[str, int]:
+    """The live supply ratings an item carries, e.g. {'air': 1}; empty for anything else"""
+    if not isinstance(item, ItemInstance):
+        return {}
+    return {field: getattr(item, field) for field in SUPPLY_FIELDS if getattr(item, field) is not None}
+
+def make_item(name: str, quantity: int = 1) -> Union[Item, ItemInstance]:
+    """An instance of the catalog item called `name`, or a plain Item for anything not in the catalog"""
+    definition = catalog.lookup(name)
+    if definition is None:
+        return Item(name=name, quantity=quantity)
+    return ItemInstance(definition, quantity)
+
+@dataclass(slots=True)
 class ConsumableItem(Item):
     """Items that can be used/consumed like medical supplies"""
     uses: int = 1
@@ -40,34 +151,139 @@ class ConsumableItem(Item):
         self.uses -= 1
         return True
 
-@dataclass 
+def unit_weight(item) -> float:
+    """
+    Encumbrance of one unit: WeaponItem.weight, ArmorItem.encumbrance or
+    EquipmentItem.weight (catalog instances use their definition's). Plain
+    items and uncarryable ones (None) count as 0.
+    """
+    weight = getattr(item, "weight", None)
+    if weight is None:
+        weight = getattr(item, "encumbrance", None)
+    return weight or 0
+
 class Inventory:
-    """Manages a collection of items"""
-    items: List[Item] = field(default_factory=list)
-    
+    """
+    Manages a collection of items, indexed by name.
+
+    Items live in an insertion-ordered dict of name -> items with that name
+    (one stack for stackable items, one entry per copy otherwise), so add,
+    remove and lookup by name never scan the whole inventory. Encumbrance,
+    value and item count are kept as running totals and updated on every
+    add and remove; change a held item's quantity through this class (or
+    call recompute() afterwards) to keep them right.
+    """
+    __slots__ = ("_by_name", "encumbrance", "value", "count")
+
+    def __init__(self, items: Optional[Iterable[Item]] = None):
+        self._by_name: Dict[str, List[Item]] = {}
+        self.encumbrance: float = 0  # Sum of unit_weight x quantity
+        self.value: int = 0          # Sum of get_value() x quantity
+        self.count: int = 0          # Sum of quantities
+        for item in items or ():
+            self.add_item(item)
+
+    @property
+    def items(self) -> List[Item]:
+        """Every held item, in the order first added. A new list; changing it does not change the inventory."""
+        return [item for group in self._by_name.values() for item in group]
+
+    def __iter__(self) -> Iterator[Item]:
+        for group in self._by_name.values():
+            yield from group
+
+    def __len__(self) -> int:
+        return sum(len(group) for group in self._by_name.values())
+
+    def __contains__(self, item_name: str) -> bool:
+        return item_name in self._by_name
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Inventory):
+            return NotImplemented
+        return self.items == other.items
+
+    def __repr__(self) -> str:
+        return f"Inventory(items={self.items!r})"
+
+    def to_json(self) -> List[str]:
+        return [str(item) for item in self]
+
+    def supplies_to_json(self) -> Dict[str, Dict[str, int]]:
+        """Live supply ratings keyed by the item's position in to_json(), for items that have any"""
+        supplies = {}
+        for position, item in enumerate(self):
+            state = supply_state(item)
+            if state:
+                supplies[str(position)] = state
+        return supplies
+
+    @classmethod
+    def from_json(cls, gear: List, supplies: Optional[Dict[str, Dict[str, int]]] = None) -> 'Inventory':
+        """Inventory from a sheet's Gear list, with live ratings restored from its Supplies"""
+        inventory = cls()
+        for position, entry in enumerate(gear):
+            state = (supplies or {}).get(str(position)) or {}
+            for item in Item.from_json(entry):
+                if isinstance(item, ItemInstance):
+                    for field, value in state.items():
+                        if field in SUPPLY_FIELDS:
+                            setattr(item, field, int(value))
+                inventory.add_item(item)
+        return inventory
+
+    def _adjust(self, item: Item, quantity: int) -> None:
+        self.encumbrance += unit_weight(item) * quantity
+        self.value += item.get_value() * quantity
+        self.count += quantity
+
+    def is_over_encumbered(self, capacity: float) -> bool:
+        return self.encumbrance > capacity
+
     def add_item(self, item: Item) -> None:
-        """Add an item to inventory, stacking if possible"""
-        if item.stackable:
-            for existing_item in self.items:
-                if existing_item.name == item.name:
-                    existing_item.quantity += item.quantity
-                    return
-        self.items.append(item)
-        
+        """
+        Add an item to inventory, stacking if possible. Items with a supply
+        rating never stack: each copy keeps its own air, power and ammo.
+        """
+        if supply_state(item) and item.quantity > 1:
+            for _ in range(item.quantity):
+                self.add_item(item.copy(1))
+            return
+        group = self._by_name.get(item.name)
+        if group is None:
+            self._by_name[item.name] = [item]
+        elif item.stackable and group[0].stackable and not supply_state(item) and not supply_state(group[0]):
+            group[0].quantity += item.quantity
+        else:
+            group.append(item)
+        self._adjust(item, item.quantity)
+
     def remove_item(self, item_name: str, quantity: int = 1) -> Optional[Item]:
         """Remove an item from inventory. Returns the removed item or None if not found."""
-        for i, item in enumerate(self.items):
-            if item.name == item_name:
-                if item.quantity <= quantity:
-                    return self.items.pop(i)
-                item.quantity -= quantity
-                new_item = type(item)(name=item.name, quantity=quantity)
-                return new_item
-        return None
-        
+        group = self._by_name.get(item_name)
+        if group is None:
+            return None
+        item = group[0]
+        if item.quantity <= quantity:
+            group.pop(0)
+            if not group:
+                del self._by_name[item_name]
+            self._adjust(item, -item.quantity)
+            return item
+        item.quantity -= quantity
+        self._adjust(item, -quantity)
+        if isinstance(item, ItemInstance):
+            return item.copy(quantity)
+        new_item = type(item)(name=item.name, quantity=quantity)
+        return new_item
+
     def get_item(self, item_name: str) -> Optional[Item]:
         """Get an item without removing it"""
-        for item in self.items:
-            if item.name == item_name:
-                return item
-        return None 
\ No newline at end of file
+        group = self._by_name.get(item_name)
+        return group[0] if group else None
+
+    def recompute(self) -> None:
+        """Rebuild the running totals, e.g. after changing a held item directly."""
+        self.encumbrance = self.value = self.count = 0
+        for item in self:
+            self._adjust(item, item.quantity)
@@ -0,0 +1,118 @@
+import json
+import os
+from typing import Dict, Iterator, List, Optional
+from . import codec
+
+JOURNAL_FILE = "journal.jsonl"
+CHECKPOINT_FILE = "checkpoint.json"
+
+def fsync_dir(path: str) -> None:
+    """Make a rename inside `path` durable. A no-op where directories can't be opened."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+class Journal:
+    """
+    Append-only write-ahead log of state mutations.
+
+    Each record is one JSON line carrying an increasing sequence number.
+    Records are buffered by append() and made durable together by commit(),
+    which flushes and fsyncs once per batch (one turn, or one background
+    save). After the full state has been checkpointed elsewhere,
+    checkpoint() records the last folded-in sequence number and starts a
+    fresh, empty journal, so recovery only replays the tail written since.
+    """
+
+    def __init__(self, directory: str, name: str = JOURNAL_FILE):
+        self.directory = directory
+        self.path = os.path.join(directory, name)
+        self.checkpoint_path = os.path.join(directory, CHECKPOINT_FILE)
+        self.checkpoint_seq = self._read_checkpoint()
+        self.seq = self.checkpoint_seq
+        self.records_since_checkpoint = 0
+        self._buffer: List[bytes] = []
+        self._file = None
+        # Continue numbering after anything already on disk
+        for record in self.replay():
+            self.seq = record["seq"]
+            self.records_since_checkpoint += 1
+
+    def _read_checkpoint(self) -> int:
+        try:
+            with open(self.checkpoint_path, "r") as f:
+                return int(json.load(f).get("seq", 0))
+        except (OSError, ValueError, AttributeError):
+            return 0
+
+    def append(self, op: str, key: str, data: Optional[Dict] = None) -> int:
+        """Buffer one mutation. Nothing is durable until commit()."""
+        self.seq += 1
+        self._buffer.append(codec.dumps({"seq": self.seq, "op": op, "id": key, "data": data}, pretty=False))
+        return self.seq
+
+    def commit(self) -> None:
+        """Write buffered records and fsync them in one go."""
+        if not self._buffer:
+            return
+        if self._file is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._file = open(self.path, "ab")
+        self._file.write(b"\n".join(self._buffer) + b"\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.records_since_checkpoint += len(self._buffer)
+        self._buffer = []
+
+    def replay(self) -> Iterator[Dict]:
+        """
+        Yield committed records newer than the last checkpoint. A torn final
+        line (a crash mid-append) is ignored; it was never committed.
+        """
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            return
+        with f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = codec.loads(line)
+                except ValueError:
+                    break
+                if record.get("seq", 0) > self.checkpoint_seq:
+                    yield record
+
+    def checkpoint(self) -> None:
+        """
+        Mark everything committed so far as folded into a snapshot, then
+        start an empty journal. Call only once that snapshot is durable.
+        """
+        self.commit()
+        self.close()
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"seq": self.seq}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_path)
+        # The journal can only go once the checkpoint itself is on disk;
+        # if we crash in between, replay just skips the folded-in records
+        fsync_dir(self.directory)
+        with open(self.path, "w"):
+            pass
+        self.checkpoint_seq = self.seq
+        self.records_since_checkpoint = 0
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
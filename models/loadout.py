@@ -0,0 +1,102 @@
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+from .catalog import compile_slot_mask, registry
+from .items import Item, unit_weight
+
+# Weights are multiples of 0.25, so the search adds them up as integers
+_WEIGHT_SCALE = 4
+
+def slot_mask(item: Item) -> int:
+    """Coverage bitmask of an armor piece (see catalog.compile_slot_mask); 0 for anything else"""
+    if not hasattr(item, "coverage_slots"):
+        return 0
+    mask = registry.slot_mask(item.name)
+    return mask or compile_slot_mask(item.coverage_slots, item.layer, getattr(item, "sealed", False))
+
+def equipped_mask(char, skip: Optional[str] = None) -> int:
+    """Everything a character has on, OR-ed into one mask"""
+    mask = 0
+    for name in char.equipped:
+        item = char.inventory.get_item(name)
+        if item is not None and name != skip:
+            mask |= slot_mask(item)
+    return mask
+
+def conflicts(char, item_name: str) -> List[str]:
+    """Equipped items that cover a slot `item_name` needs on the same layer"""
+    item = char.inventory.get_item(item_name)
+    mask = slot_mask(item) if item is not None else 0
+    if not mask & equipped_mask(char, skip=item_name):
+        return []  # The common case costs one AND
+    return [
+        name for name in char.equipped
+        if name != item_name and char.inventory.get_item(name) is not None
+        and slot_mask(char.inventory.get_item(name)) & mask
+    ]
+
+@dataclass(slots=True, frozen=True)
+class Loadout:
+    items: Tuple[str, ...]
+    armor_rating: int
+    encumbrance: float
+
+def best_loadout(items: Iterable[Item], max_encumbrance: Optional[float] = None,
+                 blocked_mask: int = 0) -> Loadout:
+    """
+    The non-conflicting set of armor from `items` with the highest total
+    armor_rating whose encumbrance fits `max_encumbrance` (no limit if
+    None). Ties go to the lighter set. Slots in `blocked_mask` are taken
+    already. Exact branch and bound over the candidates, best rated first;
+    a party member carries a handful of armor pieces at most.
+    """
+    candidates = []
+    seen = set()
+    for item in items:
+        rating = getattr(item, "armor_rating", 0) or 0
+        if rating <= 0 or item.name in seen:
+            continue
+        seen.add(item.name)
+        mask = slot_mask(item)
+        if mask & blocked_mask:
+            continue
+        candidates.append((rating, round(unit_weight(item) * _WEIGHT_SCALE), mask, item.name))
+    candidates.sort(key=lambda c: (-c[0], c[1], c[3]))
+    limit = None if max_encumbrance is None else int(max_encumbrance * _WEIGHT_SCALE + 1e-9)
+
+    # Rating still available from candidate i onwards, for pruning
+    remaining = [0] * (len(candidates) + 1)
+    for i in range(len(candidates) - 1, -1, -1):
+        remaining[i] = remaining[i + 1] + candidates[i][0]
+
+    best = [0, 0, ()]  # rating, weight, chosen indexes
+    chosen: List[int] = []
+
+    def search(i: int, mask: int, weight: int, rating: int) -> None:
+        if rating > best[0] or (rating == best[0] and weight < best[1]):
+            best[:] = [rating, weight, tuple(chosen)]
+        if i == len(candidates):
+            return
+        bound = rating + remaining[i]
+        if bound < best[0] or (bound == best[0] and weight >= best[1]):
+            return
+        item_rating, item_weight, item_mask, _ = candidates[i]
+        if not mask & item_mask and (limit is None or weight + item_weight <= limit):
+            chosen.append(i)
+            search(i + 1, mask | item_mask, weight + item_weight, rating + item_rating)
+            chosen.pop()
+        search(i + 1, mask, weight, rating)
+
+    search(0, blocked_mask, 0, 0)
+    rating, weight, picked = best
+    return Loadout(tuple(candidates[i][3] for i in picked), rating, weight / _WEIGHT_SCALE)
+
+def best_loadout_for(char) -> Loadout:
+    """
+    Best armor for a character to wear out of what they carry, within
+    what their carrying capacity leaves after all their other gear.
+    """
+    armor_weight = sum(
+        unit_weight(item) * item.quantity for item in char.inventory if getattr(item, "armor_rating", 0)
+    )
+    budget = char.carrying_capacity - (char.inventory.encumbrance - armor_weight)
+    return best_loadout(char.inventory, max(0.0, budget))
@@ -1,4 +1,4 @@
-from equipment_item import MedicalItem
+from .equipment_item import MedicalItem
 
 # --- MEDICAL SUPPLIES ---
 
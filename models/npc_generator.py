@@ -0,0 +1,235 @@
+import random
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass
+from itertools import combinations, product
+from typing import Dict, Iterator, List, Optional, Tuple
+from .character import Character, Attributes, Skills
+from .dice import DiceRoll
+from .gear_spec import GearSpec, compile_starting_gear
+from .items import Inventory
+from .derived_stats import ATTRIBUTES, SKILL_ATTRIBUTES
+
+# Creation rules, as enforced by the interactive flow in main.py
+ATTRIBUTE_MIN = 2
+ATTRIBUTE_MAX = 4
+KEY_ATTRIBUTE_MAX = 5
+ATTRIBUTE_POINTS = 6
+SKILL_POINTS = 10
+KEY_SKILL_MAX = 3      # General skills take at most 1 point each
+GEAR_PICKS = 2         # At most one of them a weapon
+
+_SKILL_ORDER = tuple(SKILL_ATTRIBUTES)  # Same order as the Skills fields
+
+def _field(name: str) -> str:
+    return name.lower().replace(" ", "_")
+
+@dataclass(slots=True)
+class CareerTable:
+    """
+    Everything a career can legally roll, enumerated once. Generating an
+    NPC then only draws indexes into these tables.
+    """
+    name: str
+    attribute_rows: List[Tuple[int, ...]]
+    skill_rows: bytes               # len(SKILL_ORDER) bytes per valid allocation
+    talents: List[str]
+    agendas: List[str]
+    signature_items: List[str]
+    gear: Tuple[GearSpec, ...]
+    gear_pairs: List[Tuple[int, int]]
+    cash: Tuple[int, int, int]      # Dice, sides, multiplier
+
+    @property
+    def skill_row_count(self) -> int:
+        return len(self.skill_rows) // len(_SKILL_ORDER)
+
+    def skill_row(self, index: int) -> bytes:
+        width = len(_SKILL_ORDER)
+        return self.skill_rows[index * width:(index + 1) * width]
+
+def _attribute_rows(key_attribute: str) -> List[Tuple[int, ...]]:
+    key = _field(key_attribute)
+    ranges = [range(ATTRIBUTE_MIN, (KEY_ATTRIBUTE_MAX if attr == key else ATTRIBUTE_MAX) + 1) for attr in ATTRIBUTES]
+    total = ATTRIBUTE_MIN * len(ATTRIBUTES) + ATTRIBUTE_POINTS
+    return [row for row in product(*ranges) if sum(row) == total]
+
+def _skill_rows(key_skills: List[str]) -> bytes:
+    """Every way to spend all skill points: 0-3 in each key skill, 1 in some general ones."""
+    key = [_SKILL_ORDER.index(_field(name)) for name in key_skills]
+    general = [i for i in range(len(_SKILL_ORDER)) if i not in key]
+    rows = bytearray()
+    for key_points in product(range(KEY_SKILL_MAX + 1), repeat=len(key)):
+        left = SKILL_POINTS - sum(key_points)
+        if not 0 <= left <= len(general):
+            continue
+        for chosen in combinations(general, left):
+            row = [0] * len(_SKILL_ORDER)
+            for i, points in zip(key, key_points):
+                row[i] = points
+            for i in chosen:
+                row[i] = 1
+            rows.extend(row)
+    return bytes(rows)
+
+def _gear_pairs(gear: Tuple[GearSpec, ...]) -> List[Tuple[int, int]]:
+    return [
+        (a, b) for a in range(len(gear)) for b in range(len(gear))
+        if a != b and not (gear[a].counts_as_weapon and gear[b].counts_as_weapon)
+    ]
+
+def compile_careers(playergen: Dict, gear: Optional[Dict[str, Tuple[GearSpec, ...]]] = None) -> List[CareerTable]:
+    """Build the sampling tables for every career in playerGenData."""
+    gear = compile_starting_gear(playergen) if gear is None else gear
+    tables = []
+    for name, career in (playergen.get("Careers") or {}).items():
+        specs = gear.get(name, ())
+        tables.append(CareerTable(
+            name=name,
+            attribute_rows=_attribute_rows(career["key_attribute"]),
+            skill_rows=_skill_rows(career["key_skills"]),
+            talents=list(career.get("talents") or [""]),
+            agendas=list(career.get("personal_agendas") or [""]),
+            signature_items=list(career.get("signature_items") or [""]),
+            gear=specs,
+            gear_pairs=_gear_pairs(specs),
+            cash=DiceRoll.parse_expression(career.get("cash", "0d6")),
+        ))
+    return tables
+
+class NPCBatch(Sequence):
+    """
+    Generated NPCs in compact column form: one small integer per choice
+    (an index into the career's tables) and the rolled quantities and cash,
+    about 20 bytes an NPC. batch[i] builds the full Character on demand;
+    nothing is turned into a Character or a sheet dict until asked for.
+    """
+
+    def __init__(self, tables: List[CareerTable], id_prefix: str = "npc"):
+        self.tables = tables
+        self.id_prefix = id_prefix
+        self.career = array("B")
+        self.attributes = array("B")
+        self.skills = array("H")
+        self.talent = array("B")
+        self.agenda = array("B")
+        self.signature = array("B")
+        self.gear = array("B")
+        self.gear_quantity = array("H")  # GEAR_PICKS per NPC
+        self.cash = array("I")
+
+    def __len__(self) -> int:
+        return len(self.career)
+
+    def __getitem__(self, index: int) -> Character:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        table = self.tables[self.career[index]]
+        gear_a, gear_b = table.gear_pairs[self.gear[index]] if table.gear_pairs else (None, None)
+        inventory = Inventory()
+        for pick, spec_index in enumerate((gear_a, gear_b)):
+            if spec_index is not None:
+                inventory.add_item(table.gear[spec_index].make(self.gear_quantity[index * GEAR_PICKS + pick]))
+        return Character(
+            id=f"{self.id_prefix}-{index}",
+            name=f"{table.name} {index}",
+            career=table.name,
+            attributes=Attributes(*table.attribute_rows[self.attributes[index]]),
+            skills=Skills(*table.skill_row(self.skills[index])),
+            talent=table.talents[self.talent[index]],
+            agenda=table.agendas[self.agenda[index]],
+            inventory=inventory,
+            signature_item=table.signature_items[self.signature[index]],
+            cash=self.cash[index],
+        )
+
+    def to_json(self, index: int) -> Dict:
+        """One NPC in the saved sheet format, built now."""
+        return self[index].to_json()
+
+    def iter_json(self) -> Iterator[Tuple[str, Dict]]:
+        for index in range(len(self)):
+            char = self[index]
+            yield char.id, char.to_json()
+
+class NPCGenerator:
+    """
+    Batch NPC creation from playerGenData careers, under the same rules
+    as interactive character creation: 6 attribute points (key attribute
+    up to 5, the rest up to 4), all 10 skill points spent (key skills up
+    to 3, general skills 1), a career talent, agenda and signature item,
+    two starting-gear picks with at most one weapon, and career cash.
+
+    Every legal attribute and skill allocation is enumerated per career up
+    front, so each NPC is a handful of uniform index draws made a column
+    at a time across the whole batch.
+    """
+
+    def __init__(self, playergen: Dict, gear: Optional[Dict[str, Tuple[GearSpec, ...]]] = None,
+                 seed: Optional[int] = None):
+        self.tables = compile_careers(playergen, gear)
+        self.rng = random.Random(seed)
+
+    def generate(self, count: int, careers: Optional[Sequence[str]] = None,
+                 id_prefix: str = "npc") -> NPCBatch:
+        """`count` NPCs, careers drawn uniformly from `careers` (default: all)."""
+        names = [table.name for table in self.tables]
+        allowed = [names.index(name) for name in careers] if careers else list(range(len(names)))
+        rand = self.rng.random
+        batch = NPCBatch(self.tables, id_prefix)
+        career_column = [allowed[int(rand() * len(allowed))] for _ in range(count)]
+        batch.career = array("B", career_column)
+
+        def draw(field: str) -> List[int]:
+            # One uniform index per NPC into its career's table `field`
+            sizes = [len(getattr(table, field)) or 1 for table in self.tables]
+            return [int(rand() * sizes[c]) for c in career_column]
+
+        batch.attributes = array("B", draw("attribute_rows"))
+        skill_rows = [table.skill_row_count for table in self.tables]
+        batch.skills = array("H", [int(rand() * skill_rows[c]) for c in career_column])
+        batch.talent = array("B", draw("talents"))
+        batch.agenda = array("B", draw("agendas"))
+        batch.signature = array("B", draw("signature_items"))
+        gear_column = draw("gear_pairs")
+        batch.gear = array("B", gear_column)
+        batch.gear_quantity = array("H", self._gear_quantities(career_column, gear_column))
+        batch.cash = array("I", self._cash(career_column))
+        return batch
+
+    def _gear_quantities(self, career_column: List[int], gear_column: List[int]) -> List[int]:
+        rand = self.rng.random
+        # Per career and pick: fixed quantity, or (dice, sides) to roll
+        rolls = []
+        for table in self.tables:
+            per_pick = []
+            for spec in table.gear:
+                if spec.quantity_dice:
+                    dice, sides, _ = DiceRoll.parse_expression(spec.quantity_dice)
+                    per_pick.append((dice, sides))
+                else:
+                    per_pick.append(spec.quantity)
+            rolls.append(per_pick)
+        quantities = []
+        for career, pair in zip(career_column, gear_column):
+            table = self.tables[career]
+            for spec_index in (table.gear_pairs[pair] if table.gear_pairs else (None,) * GEAR_PICKS):
+                rule = rolls[career][spec_index] if spec_index is not None else 0
+                if isinstance(rule, tuple):
+                    dice, sides = rule
+                    rule = sum(int(rand() * sides) + 1 for _ in range(dice))
+                quantities.append(rule)
+        return quantities
+
+    def _cash(self, career_column: List[int]) -> List[int]:
+        rand = self.rng.random
+        cash = []
+        for career in career_column:
+            dice, sides, multiplier = self.tables[career].cash
+            total = dice
+            for _ in range(dice):
+                total += int(rand() * sides)
+            cash.append(total * multiplier)
+        return cash
@@ -0,0 +1,117 @@
+import asyncio
+from typing import Any, Callable, Iterable, Optional
+
+# Default quiet period after the first change before a write is started.
+DEFAULT_DEBOUNCE_SECONDS = 0.5
+
+class PersistenceWorker:
+    """
+    Coalesces bursts of changes into a single background write.
+
+    Mutations call mark_dirty(), which only sets a flag. A background task
+    waits a short debounce after the first change, then calls `take()` on the
+    event loop to snapshot what needs writing and runs `write(snapshot)` in a
+    thread, so JSON encoding and file I/O never block command handlers.
+    `write` returns the keys that failed, which are handed back to
+    `on_failure` so they are retried on the next pass.
+    """
+
+    def __init__(self, take: Callable[[], Optional[Any]], write: Callable[[Any], Iterable],
+                 on_failure: Optional[Callable[[Iterable], None]] = None,
+                 debounce: float = DEFAULT_DEBOUNCE_SECONDS):
+        self.take = take
+        self.write = write
+        self.on_failure = on_failure
+        self.debounce = debounce
+        self.writes = 0  # Completed write passes, for diagnostics
+        self._wakeup: Optional[asyncio.Event] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the background task. Safe to call on every on_ready."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task = asyncio.create_task(self._run())
+
+    def mark_dirty(self):
+        """
+        Schedule a write. Cheap enough to call on every mutation, and safe
+        to call from a worker thread (e.g. a sheet upgraded during a reload).
+        """
+        if self._wakeup is None:
+            return
+        try:
+            on_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            self._wakeup.set()
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def flush(self):
+        """Write everything pending right now, e.g. before shutdown."""
+        if self._lock is None:
+            await self._write_once()
+            return
+        async with self._lock:
+            await self._write_once()
+
+    async def run_exclusive(self, fn: Callable, *args):
+        """
+        Flush, then run fn(*args) in a thread while no background write can
+        start, e.g. to reload from disk. Returns fn's result.
+        """
+        if self._lock is None:
+            await self._write_once()
+            return await asyncio.to_thread(fn, *args)
+        async with self._lock:
+            await self._write_once()
+            return await asyncio.to_thread(fn, *args)
+
+    async def stop(self):
+        """Stop the background task after a final flush."""
+        if self._task is None:
+            await self.flush()
+            return
+        # Holding the lock means no write is half done in a thread
+        async with self._lock:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            await self._write_once()
+
+    async def _write_once(self):
+        snapshot = self.take()
+        if snapshot is None:
+            return
+        failed = list(await asyncio.to_thread(self.write, snapshot) or ())
+        self.writes += 1
+        if failed and self.on_failure is not None:
+            self.on_failure(failed)
+
+    async def _run(self):
+        while True:
+            await self._wakeup.wait()
+            # Let the rest of the burst land before writing
+            await asyncio.sleep(self.debounce)
+            self._wakeup.clear()
+            try:
+                async with self._lock:
+                    await self._write_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error in background save: {e}")
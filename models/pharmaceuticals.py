@@ -1,4 +1,4 @@
-from equipment_item import PharmaceuticalItem
+from .equipment_item import PharmaceuticalItem
 
 # --- PHARMACEUTICALS ---
 
@@ -0,0 +1,106 @@
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Dict, Iterator, Optional
+from .character import Character
+
+# Hydrated characters kept in memory; the rest are parsed again on access.
+DEFAULT_CACHE_SIZE = 256
+
+class LazyCharacterMap(MutableMapping):
+    """
+    The character roster as a dict of id -> Character that only parses a
+    sheet when it is first asked for.
+
+    Membership, len() and iteration come from the store's slim index (name
+    and career per id), so startup cost and resident memory no longer grow
+    with the number of stored characters. Hydrated characters sit in an LRU
+    of `capacity` entries; anything the store still has to write
+    (`store.is_pending`) is never evicted, so an unsaved change is never
+    dropped and re-read stale from disk.
+    """
+
+    def __init__(self, store, index: Dict[str, Dict[str, str]],
+                 capacity: int = DEFAULT_CACHE_SIZE,
+                 loaded: Optional[Dict[str, Character]] = None):
+        self.store = store
+        self.capacity = capacity
+        # Own copy: the store updates its index as writes are taken
+        self._index: Dict[str, Dict[str, str]] = dict(index)
+        self._cache: "OrderedDict[str, Character]" = OrderedDict()
+        for char_id, char in (loaded or {}).items():
+            if char_id in self._index:
+                self._cache[char_id] = char
+        self.loads = 0  # Sheets parsed on access, for diagnostics
+
+    @property
+    def index(self) -> Dict[str, Dict[str, str]]:
+        """Name and career of every character, without loading any of them."""
+        return self._index
+
+    def is_loaded(self, char_id: str) -> bool:
+        return char_id in self._cache
+
+    def cached(self) -> Dict[str, Character]:
+        """The characters currently hydrated."""
+        return dict(self._cache)
+
+    def __getitem__(self, char_id: str) -> Character:
+        char = self._cache.get(char_id)
+        if char is not None:
+            self._cache.move_to_end(char_id)
+            return char
+        if char_id not in self._index:
+            raise KeyError(char_id)
+        try:
+            char = self.store.load(char_id)
+        except Exception as e:
+            print(f"Error loading character {char_id}: {e}")
+            raise KeyError(char_id) from e
+        self.loads += 1
+        self._cache[char_id] = char
+        self._evict()
+        return char
+
+    def __setitem__(self, char_id: str, char: Character) -> None:
+        self._index[char_id] = {"Name": char.name, "Career": char.career}
+        self._cache[char_id] = char
+        self._cache.move_to_end(char_id)
+        self._evict(keep=char_id)
+
+    def __delitem__(self, char_id: str) -> None:
+        del self._index[char_id]
+        self._cache.pop(char_id, None)
+
+    def discard(self, char_id: str) -> bool:
+        """
+        Remove a character without loading its sheet (pop() would parse it
+        first, and swallow the KeyError of one that can't be parsed).
+        Returns whether it was there.
+        """
+        if char_id not in self._index:
+            return False
+        del self[char_id]
+        return True
+
+    def __contains__(self, char_id) -> bool:
+        return char_id in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        if len(self._cache) <= self.capacity:
+            return
+        # Oldest first; unsaved characters stay put even over capacity
+        excess = len(self._cache) - self.capacity
+        victims = []
+        for char_id in self._cache:
+            if char_id != keep and not self.store.is_pending(char_id):
+                victims.append(char_id)
+                if len(victims) == excess:
+                    break
+        for char_id in victims:
+            del self._cache[char_id]
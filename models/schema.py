@@ -0,0 +1,141 @@
+import asyncio
+import re
+from typing import Callable, Dict, List, Optional
+
+# Version written into every saved sheet as 'Version'. Sheets without one
+# predate versioning and are version 1.
+SCHEMA_VERSION = 2
+
+# Migrations keyed by the version they produce; each takes a sheet dict at
+# the previous version and returns it at this one.
+MIGRATIONS: Dict[int, Callable[[Dict], Dict]] = {}
+
+def migration(target: int):
+    """Register a migration to `target` from `target - 1`."""
+    def register(fn: Callable[[Dict], Dict]) -> Callable[[Dict], Dict]:
+        MIGRATIONS[target] = fn
+        return fn
+    return register
+
+def version_of(data: Dict) -> int:
+    return data.get('Version', 1)
+
+def is_outdated(data: Dict) -> bool:
+    return version_of(data) < SCHEMA_VERSION
+
+def migrate(data: Dict) -> Dict:
+    """
+    Bring a stored sheet up to SCHEMA_VERSION. Current sheets are returned
+    as-is; older ones are copied, so the caller's dict is never changed.
+    """
+    version = version_of(data)
+    if version == SCHEMA_VERSION:
+        return data
+    if version > SCHEMA_VERSION:
+        raise ValueError(f"Sheet is schema version {version}; this build only knows up to {SCHEMA_VERSION}")
+    data = dict(data)
+    for target in range(version + 1, SCHEMA_VERSION + 1):
+        data = MIGRATIONS[target](data)
+        data['Version'] = target
+    return data
+
+# ---------------------------------------------------------------------------
+# Migrations
+# ---------------------------------------------------------------------------
+
+QUANTITY_SUFFIX = re.compile(r"\s*\(x(\d+)\)$")
+
+@migration(2)
+def _normalize_gear(data: Dict) -> Dict:
+    """
+    v2: every Gear entry is a string with at most one '(xN)' suffix.
+    v1 names picked up an extra ' (x1)' on every load/save cycle; the
+    outermost suffix is the real quantity and the rest are dropped.
+    {name: ...} dict entries become plain names.
+    """
+    gear = []
+    for entry in data.get('Gear') or []:
+        if isinstance(entry, dict):
+            gear.extend(str(name) for name in entry)
+            continue
+        if not isinstance(entry, str):
+            continue
+        match = QUANTITY_SUFFIX.search(entry)
+        if match is None:
+            gear.append(entry)
+            continue
+        name = entry[:match.start()]
+        while True:
+            inner = QUANTITY_SUFFIX.search(name)
+            if inner is None:
+                break
+            name = name[:inner.start()]
+        gear.append(f"{name} (x{match.group(1)})")
+    data['Gear'] = gear
+    return data
+
+# ---------------------------------------------------------------------------
+# Background sweeper
+# ---------------------------------------------------------------------------
+
+# Sheets checked per pass, and the pause between passes.
+DEFAULT_SWEEP_BATCH = 20
+DEFAULT_SWEEP_INTERVAL = 1.0
+
+class SchemaSweeper:
+    """
+    Upgrades cold sheets on disk a few at a time, so records nobody opens
+    still reach the current schema without a big rewrite at deploy time.
+
+    Each pass runs `store.upgrade_stored` in a thread through the
+    persistence worker's run_exclusive, so it never overlaps a background
+    save. Characters that are loaded (`is_loaded`) or have unsaved changes
+    are left alone; they are upgraded on read and written back by the
+    normal save path.
+    """
+
+    def __init__(self, store, persistence, is_loaded: Callable[[str], bool],
+                 batch_size: int = DEFAULT_SWEEP_BATCH, interval: float = DEFAULT_SWEEP_INTERVAL):
+        self.store = store
+        self.persistence = persistence
+        self.is_loaded = is_loaded
+        self.batch_size = batch_size
+        self.interval = interval
+        self.upgraded = 0  # Sheets rewritten so far, for diagnostics
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        if not self.running:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def run(self):
+        """One sweep over every stored sheet."""
+        char_ids = list(self.store.index)
+        for start in range(0, len(char_ids), self.batch_size):
+            batch: List[str] = [
+                char_id for char_id in char_ids[start:start + self.batch_size]
+                if char_id in self.store.index
+                and not self.is_loaded(char_id) and not self.store.is_pending(char_id)
+            ]
+            if batch:
+                try:
+                    self.upgraded += await self.persistence.run_exclusive(self.store.upgrade_stored, batch)
+                except Exception as e:
+                    print(f"Error upgrading stored characters: {e}")
+            await asyncio.sleep(self.interval)
+        if self.upgraded:
+            print(f"Schema sweep upgraded {self.upgraded} stored character(s)")
@@ -0,0 +1,197 @@
+import glob
+import hashlib
+import math
+import os
+from enum import Enum
+from typing import Dict, Iterable, List, Optional, Tuple
+from .worldbuilding import StarSystem, ColonyAllegiance, ExplorationStatus, SECTOR_SIZE_LY
+
+try:
+    from PIL import Image, ImageDraw
+except ImportError:  # Pillow is only needed to rasterize tiles
+    Image = ImageDraw = None
+
+# Bump whenever drawing changes, so every cached tile is redrawn.
+RENDER_VERSION = 1
+TILE_SIZE_PX = 256
+MAX_STAR_RADIUS_PX = 6
+STAR_MARGIN_PX = MAX_STAR_RADIUS_PX + 1
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(__file__), "..", "cache", "map_tiles")
+
+class ColorMode(Enum):
+    """What the star colors on a map represent."""
+    ALLEGIANCE = "allegiance"
+    EXPLORATION = "exploration"
+
+BACKGROUND = (6, 10, 8)
+GRID_COLOR = (24, 48, 32)
+LABEL_COLOR = (120, 200, 140)
+
+EXPLORATION_COLORS: Dict[ExplorationStatus, Tuple[int, int, int]] = {
+    ExplorationStatus.UNDISCOVERED: (70, 70, 70),
+    ExplorationStatus.DETECTED: (140, 140, 160),
+    ExplorationStatus.SURVEYED: (90, 160, 230),
+    ExplorationStatus.EXPLORED: (110, 220, 130),
+    ExplorationStatus.COLONIZED: (250, 200, 60),
+}
+
+ALLEGIANCE_COLORS: Dict[Optional[ColonyAllegiance], Tuple[int, int, int]] = {
+    None: (90, 90, 90),  # No colony in the system
+    ColonyAllegiance.UPP: (200, 40, 40),
+    ColonyAllegiance.KELLAND: (180, 120, 60),
+    ColonyAllegiance.GEOFUND: (60, 180, 180),
+    ColonyAllegiance.GUSTAFSSON: (150, 100, 200),
+    ColonyAllegiance.SEEGSON: (230, 150, 40),
+    ColonyAllegiance.NONE: (200, 200, 200),
+    ColonyAllegiance.JINGTI: (220, 60, 120),
+    ColonyAllegiance.CHIGUSA: (100, 200, 80),
+    ColonyAllegiance.LASALLE: (60, 120, 230),
+    ColonyAllegiance.WEYLAND: (250, 220, 80),
+    ColonyAllegiance.LORENZ: (140, 220, 220),
+    ColonyAllegiance.GEMINI: (240, 120, 200),
+    ColonyAllegiance.FARSIDE: (160, 160, 60),
+}
+
+def tile_span_ly(zoom: int) -> float:
+    """Width of a tile in light years. Zoom 0 is one sector per tile."""
+    return SECTOR_SIZE_LY * 2.0 ** -zoom
+
+def star_color(system: StarSystem, mode: ColorMode) -> Tuple[int, int, int]:
+    if mode == ColorMode.ALLEGIANCE:
+        return ALLEGIANCE_COLORS.get(system.allegiance, ALLEGIANCE_COLORS[None])
+    return EXPLORATION_COLORS[system.exploration_status]
+
+class SectorMapRenderer:
+    """
+    Draws generated systems into fixed-size PNG tiles and caches them on disk.
+
+    A tile's file name carries a hash of everything drawn on it (the tile
+    position, color mode, and the id, position, revision and color of every
+    system inside), so an unchanged tile is served straight from disk and a
+    tile is only redrawn after one of its systems changes.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, tile_size: int = TILE_SIZE_PX):
+        self.cache_dir = cache_dir
+        self.tile_size = tile_size
+        self.systems: Dict[str, StarSystem] = {}
+        # Systems bucketed by zoom-0 tile (one sector), for fast tile queries
+        self._buckets: Dict[Tuple[int, int], List[str]] = {}
+        self._bucket_of: Dict[str, Tuple[int, int]] = {}  # System id -> its bucket key
+
+    def add_systems(self, systems: Iterable[StarSystem]) -> None:
+        """Add systems, or update ones already on the map (moved systems are re-bucketed)."""
+        for system in systems:
+            key = (math.floor(system.x / SECTOR_SIZE_LY), math.floor(system.y / SECTOR_SIZE_LY))
+            old_key = self._bucket_of.get(system.id)
+            if old_key != key:
+                if old_key is not None:
+                    self._buckets[old_key].remove(system.id)
+                    if not self._buckets[old_key]:
+                        del self._buckets[old_key]
+                self._buckets.setdefault(key, []).append(system.id)
+                self._bucket_of[system.id] = key
+            self.systems[system.id] = system
+
+    def systems_in_tile(self, zoom: int, tx: int, ty: int, margin_ly: float = 0.0) -> List[StarSystem]:
+        """Systems inside a tile, plus those within margin_ly of its edges."""
+        span = tile_span_ly(zoom)
+        x0, y0 = tx * span - margin_ly, ty * span - margin_ly
+        x1, y1 = x0 + span + 2 * margin_ly, y0 + span + 2 * margin_ly
+        found = []
+        for bx in range(math.floor(x0 / SECTOR_SIZE_LY), math.floor(x1 / SECTOR_SIZE_LY) + 1):
+            for by in range(math.floor(y0 / SECTOR_SIZE_LY), math.floor(y1 / SECTOR_SIZE_LY) + 1):
+                for system_id in self._buckets.get((bx, by), ()):
+                    system = self.systems[system_id]
+                    if x0 <= system.x < x1 and y0 <= system.y < y1:
+                        found.append(system)
+        return found
+
+    def _drawn_systems(self, zoom: int, tx: int, ty: int) -> List[StarSystem]:
+        # Stars just over the edge still overlap the tile with their radius
+        return self.systems_in_tile(zoom, tx, ty, margin_ly=STAR_MARGIN_PX * tile_span_ly(zoom) / self.tile_size)
+
+    def tile_hash(self, zoom: int, tx: int, ty: int, mode: ColorMode,
+                  systems: Optional[List[StarSystem]] = None) -> str:
+        """Content hash of a tile; changes only when something drawn on it does."""
+        if systems is None:
+            systems = self._drawn_systems(zoom, tx, ty)
+        digest = hashlib.sha1(f"{RENDER_VERSION}|{self.tile_size}|{zoom}|{tx}|{ty}|{mode.value}".encode())
+        for system in sorted(systems, key=lambda s: s.id):
+            digest.update(f"|{system.id}:{system.revision}:{system.x}:{system.y}:{star_color(system, mode)}".encode())
+        return digest.hexdigest()[:16]
+
+    def _tile_prefix(self, zoom: int, tx: int, ty: int, mode: ColorMode) -> str:
+        return os.path.join(self.cache_dir, mode.value, str(zoom), f"{tx}_{ty}_")
+
+    def render_tile(self, zoom: int, tx: int, ty: int, mode: ColorMode = ColorMode.EXPLORATION) -> str:
+        """Return the path of a tile's PNG, drawing it only if not cached."""
+        systems = self._drawn_systems(zoom, tx, ty)
+        prefix = self._tile_prefix(zoom, tx, ty, mode)
+        path = f"{prefix}{self.tile_hash(zoom, tx, ty, mode, systems)}.png"
+        if os.path.exists(path):
+            return path
+
+        if Image is None:
+            raise ImportError("Pillow is required to render map tiles (pip install Pillow)")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        image = self._draw_tile(zoom, tx, ty, mode, systems)
+        tmp_path = f"{path}.tmp"
+        image.save(tmp_path, format="PNG")
+        os.replace(tmp_path, path)
+        # Older versions of this tile are now stale
+        for stale in glob.glob(f"{glob.escape(prefix)}*.png"):
+            if stale != path:
+                os.remove(stale)
+        return path
+
+    def _draw_tile(self, zoom: int, tx: int, ty: int, mode: ColorMode, systems: List[StarSystem]):
+        size = self.tile_size
+        span = tile_span_ly(zoom)
+        scale = size / span
+        x0, y0 = tx * span, ty * span
+        image = Image.new("RGB", (size, size), BACKGROUND)
+        draw = ImageDraw.Draw(image)
+
+        # Sector grid lines, when there is room for them
+        if scale * SECTOR_SIZE_LY >= 16:
+            first = math.ceil(x0 / SECTOR_SIZE_LY) * SECTOR_SIZE_LY
+            for gx in range(int(first), int(x0 + span) + 1, int(SECTOR_SIZE_LY)):
+                px = (gx - x0) * scale
+                draw.line([(px, 0), (px, size)], fill=GRID_COLOR)
+            first = math.ceil(y0 / SECTOR_SIZE_LY) * SECTOR_SIZE_LY
+            for gy in range(int(first), int(y0 + span) + 1, int(SECTOR_SIZE_LY)):
+                py = (gy - y0) * scale
+                draw.line([(0, py), (size, py)], fill=GRID_COLOR)
+
+        radius = max(1, min(MAX_STAR_RADIUS_PX, int(scale)))
+        for system in systems:
+            px = (system.x - x0) * scale
+            py = (system.y - y0) * scale
+            draw.ellipse([px - radius, py - radius, px + radius, py + radius], fill=star_color(system, mode))
+            if zoom >= 1:
+                draw.text((px + radius + 2, py - radius), system.star.name, fill=LABEL_COLOR)
+        return image
+
+    def render_area(self, x0: float, y0: float, x1: float, y1: float, zoom: int,
+                    mode: ColorMode = ColorMode.EXPLORATION, out_path: Optional[str] = None) -> str:
+        """
+        Stitch the cached tiles covering a region (in light years) into one
+        PNG, e.g. to attach to a Discord message. Returns its path.
+        """
+        if Image is None:
+            raise ImportError("Pillow is required to render maps (pip install Pillow)")
+        span = tile_span_ly(zoom)
+        tx0, ty0 = math.floor(x0 / span), math.floor(y0 / span)
+        tx1, ty1 = math.ceil(x1 / span) - 1, math.ceil(y1 / span) - 1
+        size = self.tile_size
+        canvas = Image.new("RGB", ((tx1 - tx0 + 1) * size, (ty1 - ty0 + 1) * size), BACKGROUND)
+        for tx in range(tx0, tx1 + 1):
+            for ty in range(ty0, ty1 + 1):
+                with Image.open(self.render_tile(zoom, tx, ty, mode)) as tile:
+                    canvas.paste(tile, ((tx - tx0) * size, (ty - ty0) * size))
+        if out_path is None:
+            out_path = os.path.join(self.cache_dir, f"area_{mode.value}_{zoom}_{tx0}_{ty0}_{tx1}_{ty1}.png")
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        canvas.save(out_path, format="PNG")
+        return out_path
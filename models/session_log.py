@@ -0,0 +1,304 @@
+import os
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field, asdict
+from typing import ClassVar, Dict, Iterator, List, Optional, Type
+from . import codec
+from .codec import write_json_atomic
+
+DEFAULT_CAMPAIGN_DIR = "campaigns"
+EVENTS_FILE = "events.jsonl"
+SNAPSHOT_FILE = "snapshot.json"
+# Complete event lines that can't be decoded (unknown type, changed fields,
+# corrupt bytes) are copied here, keyed by byte offset, and skipped.
+REJECTED_FILE = "rejected.jsonl"
+# Events between materialized snapshots; bounds how much a restart replays.
+DEFAULT_SNAPSHOT_EVERY = 500
+# Recent event summaries kept in the state for session wakeup prompts.
+RECENT_EVENTS = 20
+
+# ---------------------------------------------------------------------------
+# Events
+# ---------------------------------------------------------------------------
+
+EVENT_TYPES: Dict[str, Type['GameEvent']] = {}
+
+@dataclass
+class GameEvent(ABC):
+    """A single game-state mutation. Subclasses register under their TYPE and must define apply()."""
+    TYPE: ClassVar[str] = ""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        EVENT_TYPES[cls.TYPE] = cls
+
+    @abstractmethod
+    def apply(self, state: 'SessionState') -> None:
+        ...
+
+    def summary(self) -> str:
+        return self.TYPE
+
+@dataclass
+class DamageTaken(GameEvent):
+    TYPE: ClassVar[str] = "damage"
+    character_id: str
+    amount: int
+    source: str = ""
+
+    def apply(self, state: 'SessionState') -> None:
+        state.character(self.character_id)["damage"] += self.amount
+
+    def summary(self) -> str:
+        source = f" from {self.source}" if self.source else ""
+        return f"{self.character_id} took {self.amount} damage{source}"
+
+@dataclass
+class StressChanged(GameEvent):
+    TYPE: ClassVar[str] = "stress"
+    character_id: str
+    amount: int  # Negative when stress is relieved
+
+    def apply(self, state: 'SessionState') -> None:
+        entry = state.character(self.character_id)
+        entry["stress"] = max(0, entry["stress"] + self.amount)
+
+    def summary(self) -> str:
+        return f"{self.character_id} stress {self.amount:+d}"
+
+@dataclass
+class ItemUsed(GameEvent):
+    TYPE: ClassVar[str] = "item_used"
+    character_id: str
+    item: str
+    quantity: int = 1
+
+    def apply(self, state: 'SessionState') -> None:
+        used = state.character(self.character_id)["items_used"]
+        used[self.item] = used.get(self.item, 0) + self.quantity
+
+    def summary(self) -> str:
+        return f"{self.character_id} used {self.item} (x{self.quantity})"
+
+@dataclass
+class SceneChanged(GameEvent):
+    TYPE: ClassVar[str] = "scene"
+    scene_id: str
+    description: str = ""
+
+    def apply(self, state: 'SessionState') -> None:
+        state.scene = self.scene_id
+        state.scene_description = self.description
+
+    def summary(self) -> str:
+        return f"Scene changed to {self.scene_id}"
+
+def campaign_ids(root: str = DEFAULT_CAMPAIGN_DIR) -> List[str]:
+    """Campaigns with a session log under `root`."""
+    if not os.path.isdir(root):
+        return []
+    return sorted(name for name in os.listdir(root) if os.path.exists(os.path.join(root, name, EVENTS_FILE)))
+
+def encode_event(event: GameEvent, seq: int, timestamp: float) -> Dict:
+    return {"seq": seq, "ts": timestamp, "type": event.TYPE, **asdict(event)}
+
+def decode_event(record: Dict) -> GameEvent:
+    payload = {k: v for k, v in record.items() if k not in ("seq", "ts", "type")}
+    return EVENT_TYPES[record["type"]](**payload)
+
+# ---------------------------------------------------------------------------
+# Materialized state
+# ---------------------------------------------------------------------------
+
+@dataclass
+class SessionState:
+    """Campaign state folded from the event log."""
+    seq: int = 0                     # Last event applied
+    scene: Optional[str] = None
+    scene_description: str = ""
+    characters: Dict[str, Dict] = field(default_factory=dict)
+    recent: List[str] = field(default_factory=list)  # Latest event summaries, oldest first
+
+    def character(self, character_id: str) -> Dict:
+        entry = self.characters.get(character_id)
+        if entry is None:
+            entry = self.characters[character_id] = {"damage": 0, "stress": 0, "items_used": {}}
+        return entry
+
+    def apply(self, event: GameEvent, seq: int) -> None:
+        event.apply(self)
+        self.seq = seq
+        self.recent.append(event.summary())
+        if len(self.recent) > RECENT_EVENTS:
+            del self.recent[0]
+
+    def to_json(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_json(cls, data: Dict) -> 'SessionState':
+        return cls(**data)
+
+# ---------------------------------------------------------------------------
+# Log
+# ---------------------------------------------------------------------------
+
+class SessionLog:
+    """
+    Append-only event log for one campaign, under `campaigns/{campaign_id}/`.
+
+    Every mutation is appended to `events.jsonl` as a typed event with a
+    sequence number and is applied to the in-memory SessionState. Every
+    `snapshot_every` events the state is written to `snapshot.json` along
+    with the byte offset of the log at that point, so opening the log
+    reads one snapshot and replays only the events after that offset, no
+    matter how long the campaign has run. The log itself is never
+    rewritten and keeps the full history.
+    """
+
+    def __init__(self, campaign_id: str, root: str = DEFAULT_CAMPAIGN_DIR,
+                 snapshot_every: int = DEFAULT_SNAPSHOT_EVERY):
+        self.campaign_id = campaign_id
+        self.directory = os.path.join(root, campaign_id)
+        self.events_path = os.path.join(self.directory, EVENTS_FILE)
+        self.snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+        self.rejected_path = os.path.join(self.directory, REJECTED_FILE)
+        self.snapshot_every = snapshot_every
+        self.state = SessionState()
+        self.replayed = 0  # Events replayed on open, for diagnostics
+        self.rejected = 0  # Undecodable lines skipped on open
+        self._offset = 0   # Byte offset of the end of the last good event
+        self._since_snapshot = 0
+        self._file = None
+        os.makedirs(self.directory, exist_ok=True)
+        self._recover()
+
+    def _recover(self) -> None:
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                snapshot = codec.loads(f.read())
+            self.state = SessionState.from_json(snapshot["state"])
+            self._offset = snapshot["offset"]
+        except (OSError, ValueError, KeyError, TypeError):
+            self.state, self._offset = SessionState(), 0
+        try:
+            f = open(self.events_path, "rb")
+        except OSError:
+            return
+        with f:
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Torn write from a crash mid-append
+                try:
+                    record = codec.loads(line)
+                    seq = int(record["seq"])
+                    event = decode_event(record)
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    # A complete line is never dropped from the log; set it aside and go on
+                    self._reject(self._offset, line, e)
+                    self._offset += len(line)
+                    continue
+                if seq > self.state.seq:
+                    self.state.apply(event, seq)
+                    self.replayed += 1
+                self._offset += len(line)
+        self._since_snapshot = self.replayed
+        # Drop only a torn final line, so new events start on a clean line
+        if os.path.getsize(self.events_path) > self._offset:
+            with open(self.events_path, "r+b") as f:
+                f.truncate(self._offset)
+
+    def _reject(self, offset: int, line: bytes, error: Exception) -> None:
+        self.rejected += 1
+        print(f"Campaign {self.campaign_id}: skipping undecodable event at byte {offset} ({type(error).__name__}: {error})")
+        seen = set()
+        try:
+            with open(self.rejected_path, "rb") as f:
+                seen = {codec.loads(entry)["offset"] for entry in f if entry.strip()}
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        if offset not in seen:
+            entry = {"offset": offset, "error": f"{type(error).__name__}: {error}",
+                     "line": line.decode("utf-8", "replace").rstrip("\n")}
+            with open(self.rejected_path, "ab") as f:
+                f.write(codec.dumps(entry, pretty=False) + b"\n")
+
+    def record(self, event: GameEvent) -> int:
+        """Append and apply an event. Returns its sequence number."""
+        seq = self.state.seq + 1
+        self._append(event, encode_event(event, seq, time.time()))
+        return seq
+
+    def restore(self, record: Dict) -> bool:
+        """
+        Append an event record exported from another log, keeping its seq
+        and timestamp. Records at or below the current seq are skipped, so
+        re-running an import is harmless. Returns whether it was appended.
+        """
+        if record["seq"] <= self.state.seq:
+            return False
+        self._append(decode_event(record), record)
+        return True
+
+    def _append(self, event: GameEvent, record: Dict) -> None:
+        seq = record["seq"]
+        line = codec.dumps(record, pretty=False) + b"\n"
+        if self._file is None:
+            self._file = open(self.events_path, "ab")
+        # Written through to the OS right away; commit() makes it durable
+        self._file.write(line)
+        self._file.flush()
+        self._offset += len(line)
+        self.state.apply(event, seq)
+        self._since_snapshot += 1
+        if self._since_snapshot >= self.snapshot_every:
+            self.snapshot()
+
+    def commit(self) -> None:
+        """fsync recorded events, e.g. once per turn."""
+        if self._file is not None:
+            os.fsync(self._file.fileno())
+
+    def snapshot(self) -> None:
+        """Materialize the current state so later opens skip everything before it."""
+        self.commit()
+        write_json_atomic(self.snapshot_path, {"offset": self._offset, "state": self.state.to_json()})
+        self._since_snapshot = 0
+
+    def records(self, after_seq: int = 0) -> Iterator[Dict]:
+        """
+        Iterate the raw event records, one line at a time. A torn final line
+        (a crash mid-append, not yet truncated by a reopen) and lines that
+        aren't valid JSON are skipped.
+        """
+        try:
+            f = open(self.events_path, "rb")
+        except OSError:
+            return
+        with f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = codec.loads(line)
+                    seq = int(record["seq"])
+                except (ValueError, KeyError, TypeError):
+                    continue
+                if seq > after_seq:
+                    yield record
+
+    def events(self, after_seq: int = 0):
+        """Iterate (seq, event) over the full history, e.g. for session recaps. Undecodable events are skipped."""
+        for record in self.records(after_seq):
+            try:
+                event = decode_event(record)
+            except (KeyError, TypeError):
+                continue
+            yield record["seq"], event
+
+    def close(self) -> None:
+        if self._file is not None:
+            self.commit()
+            self._file.close()
+            self._file = None
@@ -0,0 +1,492 @@
+import json
+import os
+import sqlite3
+import threading
+from itertools import groupby
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from .character import Character
+from . import codec
+from . import schema
+
+DEFAULT_DB_FILE = os.path.join("data", "alien_rpg.db")
+SCHEMA_VERSION = 6
+
+# ---------------------------------------------------------------------------
+# SQL
+# ---------------------------------------------------------------------------
+# Every statement is a constant with ? placeholders, so sqlite3 prepares it
+# once and reuses it from the connection's statement cache.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS characters (
+    id             TEXT PRIMARY KEY,
+    name           TEXT NOT NULL,
+    career         TEXT NOT NULL DEFAULT '',
+    gender         TEXT NOT NULL DEFAULT '',
+    age            INTEGER NOT NULL DEFAULT 0,
+    strength       INTEGER NOT NULL DEFAULT 2,
+    agility        INTEGER NOT NULL DEFAULT 2,
+    wits           INTEGER NOT NULL DEFAULT 2,
+    empathy        INTEGER NOT NULL DEFAULT 2,
+    talent         TEXT NOT NULL DEFAULT '',
+    agenda         TEXT NOT NULL DEFAULT '',
+    signature_item TEXT NOT NULL DEFAULT '',
+    cash           INTEGER NOT NULL DEFAULT 0,
+    version        INTEGER NOT NULL DEFAULT 1,  -- Character sheet schema version (models/schema.py)
+    equipped       TEXT NOT NULL DEFAULT '[]',  -- JSON list of equipped item names
+    conditions     TEXT NOT NULL DEFAULT '{}',  -- JSON {condition: {stat: modifier}}
+    supplies       TEXT NOT NULL DEFAULT '{}',  -- JSON {gear position: {air/power/ammo: rating}}
+    revision       INTEGER NOT NULL DEFAULT 0  -- Bumped by triggers on any change to the sheet
+);
+CREATE TABLE IF NOT EXISTS character_skills (
+    character_id TEXT NOT NULL REFERENCES characters(id) ON DELETE CASCADE,
+    skill        TEXT NOT NULL,
+    value        INTEGER NOT NULL,
+    PRIMARY KEY (character_id, skill)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS inventory_items (
+    character_id TEXT NOT NULL REFERENCES characters(id) ON DELETE CASCADE,
+    position     INTEGER NOT NULL,
+    item         TEXT NOT NULL,
+    PRIMARY KEY (character_id, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS session_state (
+    campaign_id TEXT NOT NULL,
+    key         TEXT NOT NULL,
+    value       TEXT NOT NULL,
+    PRIMARY KEY (campaign_id, key)
+) WITHOUT ROWID;
+"""
+
+# Any edit to a sheet, including one made by hand in the sqlite3 shell,
+# bumps characters.revision, so a reload can find changed sheets cheaply.
+_REVISION_TRIGGERS = """
+CREATE TRIGGER IF NOT EXISTS characters_revision AFTER UPDATE ON characters
+WHEN NEW.revision = OLD.revision
+BEGIN UPDATE characters SET revision = OLD.revision + 1 WHERE id = NEW.id; END;
+""" + "".join(f"""
+CREATE TRIGGER IF NOT EXISTS {table}_{event.lower()}_revision AFTER {event} ON {table}
+BEGIN UPDATE characters SET revision = revision + 1 WHERE id = {row}.character_id; END;
+""" for table in ("character_skills", "inventory_items")
+    for event, row in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")))
+
+_MIGRATIONS = {
+    # v1 -> v2: per-sheet revision counter
+    2: "ALTER TABLE characters ADD COLUMN revision INTEGER NOT NULL DEFAULT 0",
+    # v2 -> v3: sheet schema version, so older sheets are upgraded on read
+    3: "ALTER TABLE characters ADD COLUMN version INTEGER NOT NULL DEFAULT 1",
+    # v3 -> v4, v4 -> v5: equipped items and active conditions
+    4: "ALTER TABLE characters ADD COLUMN equipped TEXT NOT NULL DEFAULT '[]'",
+    5: "ALTER TABLE characters ADD COLUMN conditions TEXT NOT NULL DEFAULT '{}'",
+    # v5 -> v6: live supply ratings of carried items
+    6: "ALTER TABLE characters ADD COLUMN supplies TEXT NOT NULL DEFAULT '{}'",
+}
+
+_UPSERT_CHARACTER = """
+INSERT INTO characters (id, name, career, gender, age, strength, agility, wits, empathy,
+                        talent, agenda, signature_item, cash, version, equipped, conditions, supplies)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    name = excluded.name, career = excluded.career, gender = excluded.gender,
+    age = excluded.age, strength = excluded.strength, agility = excluded.agility,
+    wits = excluded.wits, empathy = excluded.empathy, talent = excluded.talent,
+    agenda = excluded.agenda, signature_item = excluded.signature_item, cash = excluded.cash,
+    version = excluded.version, equipped = excluded.equipped, conditions = excluded.conditions,
+    supplies = excluded.supplies
+"""
+_DELETE_CHARACTER = "DELETE FROM characters WHERE id = ?"
+_DELETE_SKILLS = "DELETE FROM character_skills WHERE character_id = ?"
+_INSERT_SKILL = "INSERT INTO character_skills (character_id, skill, value) VALUES (?, ?, ?)"
+_DELETE_ITEMS = "DELETE FROM inventory_items WHERE character_id = ?"
+_INSERT_ITEM = "INSERT INTO inventory_items (character_id, position, item) VALUES (?, ?, ?)"
+
+_SELECT_INDEX = "SELECT id, name, career FROM characters"
+_SELECT_REVISIONS = "SELECT id, name, career, revision FROM characters"
+_SELECT_REVISION = "SELECT revision FROM characters WHERE id = ?"
+_SELECT_CHARACTERS = """
+SELECT id, name, career, gender, age, strength, agility, wits, empathy,
+       talent, agenda, signature_item, cash, version, equipped, conditions, supplies FROM characters
+"""
+_SELECT_CHARACTER = _SELECT_CHARACTERS + " WHERE id = ?"
+_SELECT_SKILLS = "SELECT character_id, skill, value FROM character_skills"
+_SELECT_CHARACTER_SKILLS = _SELECT_SKILLS + " WHERE character_id = ?"
+_SELECT_ITEMS = "SELECT character_id, item FROM inventory_items ORDER BY character_id, position"
+_SELECT_SKILLS_ORDERED = _SELECT_SKILLS + " ORDER BY character_id"
+_SELECT_CHARACTERS_ORDERED = _SELECT_CHARACTERS + " ORDER BY id"
+_SELECT_CHARACTER_ITEMS = "SELECT character_id, item FROM inventory_items WHERE character_id = ? ORDER BY position"
+
+_UPSERT_SESSION = """
+INSERT INTO session_state (campaign_id, key, value) VALUES (?, ?, ?)
+ON CONFLICT(campaign_id, key) DO UPDATE SET value = excluded.value
+"""
+_SELECT_SESSION = "SELECT key, value FROM session_state WHERE campaign_id = ?"
+_SELECT_ALL_SESSIONS = "SELECT campaign_id, key, value FROM session_state ORDER BY campaign_id"
+_DELETE_SESSION = "DELETE FROM session_state WHERE campaign_id = ?"
+
+def _row_to_json(row: tuple) -> Dict:
+    """A characters row in the same shape as Character.to_json()."""
+    (_, name, career, gender, age, strength, agility, wits, empathy,
+     talent, agenda, signature_item, cash, version, equipped, conditions, supplies) = row
+    return {
+        'Name': name, 'Career': career, 'Gender': gender, 'Age': age,
+        'Attributes': {'Strength': strength, 'Agility': agility, 'Wits': wits, 'Empathy': empathy},
+        'Skills': {},
+        'Talent': talent, 'Agenda': agenda, 'Gear': [],
+        'Signature Item': signature_item, 'Cash': cash,
+        'Equipped': codec.loads(equipped), 'Conditions': codec.loads(conditions),
+        'Supplies': codec.loads(supplies), 'Version': version,
+    }
+
+class SqliteCharacterStore:
+    """
+    Character storage backed by a single SQLite database in WAL mode.
+
+    Drop-in replacement for CharacterStore: the same load/dirty/save methods,
+    but sheets live in normalized tables (characters, character_skills,
+    inventory_items) and every save of a batch is one transaction. A
+    session_state table holds per-campaign key/value state.
+
+    The connection is shared with the background save thread, so every use
+    of it is guarded by a lock.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_FILE, legacy_file: Optional[str] = None):
+        self.db_path = db_path
+        self.legacy_file = legacy_file
+        self.index: Dict[str, Dict[str, str]] = {}
+        self._dirty: Set[str] = set()
+        self._revisions: Dict[str, int] = {}  # Revision of each sheet as last read or written
+        self._in_flight: Set[str] = set()  # Taken by take_pending, not yet written
+        self._migrated: Set[str] = set()  # Upgraded to the current schema on read; written back on the next save
+        # Called when a read upgrades a sheet, to schedule that save (e.g. PersistenceWorker.mark_dirty)
+        self.on_migrated: Optional[Callable[[], None]] = None
+        self._lock = threading.Lock()
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=64)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # WAL makes NORMAL durable across application crashes; only power loss can drop the last commit
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self._migrate()
+
+    def _migrate(self) -> None:
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        fresh = not self.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'characters'").fetchone()
+        with self.conn:
+            if not fresh:
+                for target in range(version + 1, SCHEMA_VERSION + 1):
+                    self.conn.execute(_MIGRATIONS[target])
+            self.conn.executescript(_SCHEMA + _REVISION_TRIGGERS)
+            self.conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+    # -----------------------------------------------------------------------
+    # Loading
+    # -----------------------------------------------------------------------
+
+    def load_index(self) -> Dict[str, Dict[str, str]]:
+        with self._lock:
+            rows = self.conn.execute(_SELECT_INDEX).fetchall()
+        self.index = {char_id: {"Name": name, "Career": career} for char_id, name, career in rows}
+        return self.index
+
+    def load_data(self, char_id: str) -> Dict:
+        with self._lock:
+            row = self.conn.execute(_SELECT_CHARACTER, (char_id,)).fetchone()
+            if row is None:
+                raise KeyError(f"Unknown character: {char_id}")
+            skills = self.conn.execute(_SELECT_CHARACTER_SKILLS, (char_id,)).fetchall()
+            items = self.conn.execute(_SELECT_CHARACTER_ITEMS, (char_id,)).fetchall()
+            self._revisions[char_id] = self.conn.execute(_SELECT_REVISION, (char_id,)).fetchone()[0]
+        data = _row_to_json(row)
+        data['Skills'] = {skill: value for _, skill, value in skills}
+        data['Gear'] = [item for _, item in items]
+        return data
+
+    def load(self, char_id: str) -> Character:
+        return self._parse(char_id, self.load_data(char_id))
+
+    def load_all_data(self) -> Dict[str, Dict]:
+        """Every sheet as to_json()-shaped dicts, in three table scans."""
+        with self._lock:
+            rows = self.conn.execute(_SELECT_CHARACTERS).fetchall()
+            skills = self.conn.execute(_SELECT_SKILLS).fetchall()
+            items = self.conn.execute(_SELECT_ITEMS).fetchall()
+        sheets = {row[0]: _row_to_json(row) for row in rows}
+        for char_id, skill, value in skills:
+            sheets[char_id]['Skills'][skill] = value
+        for char_id, item in items:
+            sheets[char_id]['Gear'].append(item)
+        return sheets
+
+    def iter_data(self) -> Iterator[Tuple[str, Dict]]:
+        """
+        Yield (id, sheet data) for every character, streamed from one read
+        snapshot. Uses its own connection, so the bot's connection (and its
+        lock) is free while a long export runs.
+        """
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute("BEGIN")  # One consistent snapshot across the three scans
+            skills = groupby(conn.execute(_SELECT_SKILLS_ORDERED), key=lambda r: r[0])
+            items = groupby(conn.execute(_SELECT_ITEMS), key=lambda r: r[0])
+            next_skills, next_items = next(skills, None), next(items, None)
+            for row in conn.execute(_SELECT_CHARACTERS_ORDERED):
+                char_id = row[0]
+                data = _row_to_json(row)
+                # Rows are sorted by character id, so the child tables merge in one pass
+                if next_skills is not None and next_skills[0] == char_id:
+                    data['Skills'] = {skill: value for _, skill, value in next_skills[1]}
+                    next_skills = next(skills, None)
+                if next_items is not None and next_items[0] == char_id:
+                    data['Gear'] = [item for _, item in next_items[1]]
+                    next_items = next(items, None)
+                yield char_id, data
+        finally:
+            conn.close()
+
+    def iter_session_state(self) -> Iterator[Tuple[str, str, object]]:
+        """Yield (campaign_id, key, value) for every stored session value."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            for campaign_id, key, value in conn.execute(_SELECT_ALL_SESSIONS):
+                yield campaign_id, key, codec.loads(value)
+        finally:
+            conn.close()
+
+    def load_roster(self) -> Dict[str, Dict[str, str]]:
+        """Import the legacy file if needed and return the index, without loading any sheet."""
+        if self.legacy_file and not self.load_index() and os.path.exists(self.legacy_file):
+            self.migrate_legacy()
+        self._dirty = set()
+        return self.index
+
+    def load_all(self) -> Dict[str, Character]:
+        """Load every character, importing the legacy JSON file into an empty database."""
+        if self.legacy_file and not self.load_index() and os.path.exists(self.legacy_file):
+            self.migrate_legacy()
+        characters, _ = self.load_changed({})
+        self._dirty.clear()
+        return characters
+
+    def load_changed(self, current: Dict[str, Character],
+                     hydrate: bool = True) -> Tuple[Dict[str, Character], int]:
+        """
+        Reload only the sheets whose revision changed since they were last
+        read or written; unchanged characters are carried over from
+        `current` as the same objects. With `hydrate` off, only sheets
+        already in `current` are considered and the rest are left to load on
+        demand (see load_roster). Returns the new roster and how many sheets
+        were re-parsed. Meant to run off the event loop.
+        """
+        with self._lock:
+            rows = self.conn.execute(_SELECT_REVISIONS).fetchall()
+        revisions = {char_id: revision for char_id, _, _, revision in rows}
+        changed = {char_id for char_id, revision in revisions.items()
+                   if (char_id in current and self._revisions.get(char_id) != revision)
+                   or (char_id not in current and hydrate)}
+        if len(changed) > len(revisions) // 4:
+            # Mostly changed (or a first load): three table scans beat per-sheet queries
+            sheets = self.load_all_data()
+        else:
+            sheets = {char_id: self.load_data(char_id) for char_id in changed}
+
+        characters = {}
+        reparsed = 0
+        for char_id in revisions:
+            if char_id not in changed:
+                if char_id in current:
+                    characters[char_id] = current[char_id]
+                continue
+            try:
+                characters[char_id] = self._parse(char_id, sheets[char_id])
+                reparsed += 1
+            except Exception as e:
+                print(f"Error loading character {char_id}: {e}")
+        self._revisions = {char_id: revisions[char_id] for char_id in characters}
+        self.index = {char_id: {"Name": name, "Career": career} for char_id, name, career, _ in rows}
+        return characters, reparsed
+
+    def migrate_legacy(self, legacy_file: Optional[str] = None) -> int:
+        """Import an all-in-one characters.json. Returns the number of characters imported."""
+        legacy_file = legacy_file or self.legacy_file
+        try:
+            with open(legacy_file, "r") as f:
+                legacy = json.load(f)
+        except (OSError, ValueError, TypeError) as e:
+            print(f"Error reading legacy characters file: {e}")
+            return 0
+        self._write_rows(legacy)
+        self.load_index()
+        return len(legacy)
+
+    # -----------------------------------------------------------------------
+    # Saving
+    # -----------------------------------------------------------------------
+
+    def mark_dirty(self, char_id: str) -> None:
+        """Flag a character as changed (or deleted) so the next save writes it."""
+        self._dirty.add(char_id)
+
+    def mark_all_dirty(self, char_ids: Iterable[str]) -> None:
+        self._dirty.update(char_ids)
+
+    @property
+    def dirty(self) -> Set[str]:
+        return set(self._dirty)
+
+    def is_pending(self, char_id: str) -> bool:
+        """True while a change to the character has not reached disk yet."""
+        return char_id in self._dirty or char_id in self._in_flight or char_id in self._migrated
+
+    def _parse(self, char_id: str, data: Dict) -> Character:
+        char = Character.from_json(char_id, data)
+        if schema.is_outdated(data):
+            # Pending until written, so it stays cached; have it written soon rather than at some unrelated save
+            self._migrated.add(char_id)
+            if self.on_migrated is not None:
+                self.on_migrated()
+        return char
+
+    def upgrade_stored(self, char_ids: Iterable[str]) -> int:
+        """
+        Rewrite any of these stored sheets that are on an older schema,
+        without keeping them loaded. Used by schema.SchemaSweeper; meant to
+        run off the event loop. Returns the number upgraded.
+        """
+        batch = {}
+        for char_id in char_ids:
+            try:
+                data = self.load_data(char_id)
+                if schema.is_outdated(data):
+                    batch[char_id] = Character.from_json(char_id, data).to_json()
+            except Exception as e:
+                print(f"Error upgrading character {char_id}: {e}")
+        if not batch:
+            return 0
+        return len(batch) - len(self.write_pending(batch))
+
+    def take_pending(self, characters: Dict[str, Character]) -> Optional[Dict[str, Optional[Dict]]]:
+        """Serialize pending changes on the event loop; see CharacterStore.take_pending."""
+        # Swap in a fresh set: a set emptied by discards keeps its old capacity
+        pending, self._dirty = self._dirty, set()
+        if self._migrated:
+            # Upgraded on read; anything no longer in the roster was deleted and is already marked
+            pending |= {char_id for char_id in self._migrated if char_id in characters}
+            self._migrated = set()
+        if len(characters) != len(self.index):
+            # Added or removed without being marked; only scan when the sizes disagree
+            pending |= characters.keys() ^ self.index.keys()
+        if not pending:
+            return None
+        batch: Dict[str, Optional[Dict]] = {}
+        for char_id in sorted(pending):
+            char = characters.get(char_id)
+            if char is None:
+                batch[char_id] = None
+                self.index.pop(char_id, None)
+            else:
+                try:
+                    data = char.to_json()
+                except Exception as e:
+                    print(f"Error serializing character {char_id}: {e}")
+                    self._dirty.add(char_id)
+                    continue
+                batch[char_id] = data
+                self.index[char_id] = {"Name": data.get("Name", ""), "Career": data.get("Career", "")}
+        self._in_flight = set(batch)
+        return batch
+
+    def _write_rows(self, batch: Dict[str, Optional[Dict]]) -> None:
+        char_rows, skill_rows, item_rows, deleted = [], [], [], []
+        for char_id, data in batch.items():
+            if data is None:
+                deleted.append((char_id,))
+                continue
+            attrs = data.get('Attributes', {})
+            char_rows.append((
+                char_id, data.get('Name', char_id), data.get('Career', ""), data.get('Gender', ""),
+                data.get('Age', 0), attrs.get('Strength', 2), attrs.get('Agility', 2),
+                attrs.get('Wits', 2), attrs.get('Empathy', 2), data.get('Talent', ""),
+                data.get('Agenda', ""), data.get('Signature Item', ""), data.get('Cash', 0),
+                schema.version_of(data), codec.dumps(data.get('Equipped', []), pretty=False).decode(),
+                codec.dumps(data.get('Conditions', {}), pretty=False).decode(),
+                codec.dumps(data.get('Supplies', {}), pretty=False).decode(),
+            ))
+            skill_rows.extend((char_id, skill, value) for skill, value in data.get('Skills', {}).items())
+            item_rows.extend((char_id, i, str(item)) for i, item in enumerate(data.get('Gear', [])))
+        rewritten = [(char_id,) for char_id, data in batch.items() if data is not None]
+        with self._lock, self.conn:
+            self.conn.executemany(_DELETE_CHARACTER, deleted)
+            self.conn.executemany(_UPSERT_CHARACTER, char_rows)
+            self.conn.executemany(_DELETE_SKILLS, rewritten)
+            self.conn.executemany(_INSERT_SKILL, skill_rows)
+            self.conn.executemany(_DELETE_ITEMS, rewritten)
+            self.conn.executemany(_INSERT_ITEM, item_rows)
+
+    def write_pending(self, batch: Dict[str, Optional[Dict]]) -> List[str]:
+        """Write a batch from take_pending() in one transaction. Returns the ids that failed."""
+        try:
+            self._write_rows(batch)
+        except sqlite3.Error as e:
+            print(f"Error saving characters: {e}")
+            # Still in flight until the caller marks them dirty again
+            return list(batch)
+        # Our own write bumped the revisions; record them so a reload skips these sheets
+        with self._lock:
+            for char_id, data in batch.items():
+                row = None if data is None else self.conn.execute(_SELECT_REVISION, (char_id,)).fetchone()
+                if row is None:
+                    self._revisions.pop(char_id, None)
+                else:
+                    self._revisions[char_id] = row[0]
+        self._in_flight = set()
+        return []
+
+    def import_batch(self, batch: Dict[str, Optional[Dict]]) -> List[str]:
+        """Bulk-load path; one transaction per batch, like write_pending."""
+        return self.write_pending(batch)
+
+    def finish_import(self) -> None:
+        self.checkpoint()
+
+    def checkpoint(self) -> bool:
+        """Fold the WAL back into the main database file, e.g. at shutdown."""
+        try:
+            with self._lock:
+                self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.Error as e:
+            print(f"Error checkpointing database: {e}")
+            return False
+        return True
+
+    def save(self, characters: Dict[str, Character]) -> int:
+        """Write dirty characters synchronously. Returns the number of sheets saved."""
+        pending = self.take_pending(characters)
+        if pending is None:
+            return 0
+        failed = self.write_pending(pending)
+        self.mark_all_dirty(failed)
+        return len(pending) - len(failed)
+
+    # -----------------------------------------------------------------------
+    # Session state
+    # -----------------------------------------------------------------------
+
+    def set_session_state(self, campaign_id: str, state: Dict) -> None:
+        """Store top-level session values for a campaign, JSON-encoded per key."""
+        rows = [(campaign_id, key, codec.dumps(value, pretty=False).decode()) for key, value in state.items()]
+        with self._lock, self.conn:
+            self.conn.executemany(_UPSERT_SESSION, rows)
+
+    def get_session_state(self, campaign_id: str) -> Dict:
+        with self._lock:
+            rows = self.conn.execute(_SELECT_SESSION, (campaign_id,)).fetchall()
+        return {key: codec.loads(value) for key, value in rows}
+
+    def clear_session_state(self, campaign_id: str) -> None:
+        with self._lock, self.conn:
+            self.conn.execute(_DELETE_SESSION, (campaign_id,))
@@ -0,0 +1,154 @@
+import random
+from dataclasses import dataclass
+from functools import lru_cache
+from math import comb
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from .items import ItemInstance
+
+# Supply rolls: roll as many Stress Dice as the current rating and lose
+# one point per 1. The rating falls to zero in a random number of steps
+# (shifts for air and power), so depletion is an absorbing Markov chain
+# over ratings 0..R. Its distribution is computed exactly and cached per
+# starting rating; nothing is simulated when a player asks.
+#
+# Ammo works differently: a weapon runs dry when any of the shooter's
+# Stress Dice shows a 1, which spends one reload. With stress s that is a
+# fixed chance 1 - (5/6)^s per round, so the same chain applies with a
+# one-point step.
+
+ONE_IN = 1 / 6
+# Distributions are cut off once this little probability is left undepleted
+TAIL = 1e-6
+MAX_STEPS = 10_000
+
+# Live supply ratings kept on each ItemInstance (filled from the definition's
+# air_supply_rating / power_supply(_rating)), with their display names
+SUPPLY_LABELS = {"air": "O2", "power": "power"}
+
+@dataclass(slots=True, frozen=True)
+class Forecast:
+    """When a supply runs out: P(depleted by step t) for t = 0, 1, 2, ... and its summary numbers."""
+    cdf: Tuple[float, ...]
+    expected: float
+
+    def by(self, steps: int) -> float:
+        """Probability the supply is gone within `steps` steps"""
+        if steps < len(self.cdf):
+            return self.cdf[max(0, steps)]
+        return 1.0
+
+    def likely(self, confidence: float = 0.5) -> int:
+        """First step by which depletion is at least `confidence` likely"""
+        for step, p in enumerate(self.cdf):
+            if p >= confidence:
+                return step
+        return len(self.cdf)
+
+# ---------------------------------------------------------------------------
+# Exact chains
+# ---------------------------------------------------------------------------
+
+def _binomial_losses(rating: int) -> List[float]:
+    """P(losing k points) for k = 0..rating on one supply roll"""
+    return [comb(rating, k) * ONE_IN ** k * (1 - ONE_IN) ** (rating - k) for k in range(rating + 1)]
+
+def _solve(start: int, losses: Callable[[int], List[float]]) -> Forecast:
+    step_losses = [losses(r) for r in range(start + 1)]
+    # Expected steps to empty, by first-step analysis from the bottom up
+    expected = [0.0] * (start + 1)
+    for r in range(1, start + 1):
+        p = step_losses[r]
+        expected[r] = (1 + sum(p[k] * expected[r - k] for k in range(1, r + 1))) / (1 - p[0])
+    # Distribution over current rating, advanced one step at a time
+    dist = [0.0] * (start + 1)
+    dist[start] = 1.0
+    cdf = [dist[0]]
+    while 1 - cdf[-1] > TAIL and len(cdf) <= MAX_STEPS:
+        new = [dist[0]] + [0.0] * start
+        for r in range(1, start + 1):
+            if dist[r]:
+                for k, p in enumerate(step_losses[r]):
+                    new[r - k] += dist[r] * p
+        dist = new
+        cdf.append(min(1.0, dist[0]))
+    return Forecast(tuple(cdf), expected[start])
+
+@lru_cache(maxsize=None)
+def supply_forecast(rating: int) -> Forecast:
+    """Steps until an air or power supply at `rating` is used up"""
+    return _solve(max(0, rating), _binomial_losses)
+
+@lru_cache(maxsize=None)
+def ammo_forecast(reloads: int, stress: int) -> Forecast:
+    """Rounds of firing until `reloads` are spent at stress level `stress`"""
+    if stress <= 0:
+        # No Stress Dice, no 1s: the weapon never runs dry
+        return Forecast((0.0,) if reloads > 0 else (1.0,), float("inf") if reloads > 0 else 0.0)
+    empty = 1 - (1 - ONE_IN) ** stress
+    return _solve(max(0, reloads), lambda r: [1.0] if r == 0 else [1 - empty, empty] + [0.0] * (r - 1))
+
+def party_forecast(forecasts: Iterable[Forecast]) -> Forecast:
+    """When the first of several independent supplies runs out"""
+    forecasts = list(forecasts)
+    if not forecasts:
+        return Forecast((0.0,), float("inf"))
+    steps = max(len(f.cdf) for f in forecasts)
+    cdf = []
+    for t in range(steps):
+        remaining = 1.0
+        for f in forecasts:
+            remaining *= 1 - f.by(t)
+        cdf.append(1 - remaining)
+    # E[T] = sum over t of P(T > t)
+    return Forecast(tuple(cdf), sum(1 - p for p in cdf))
+
+# ---------------------------------------------------------------------------
+# Live supplies on carried items
+# ---------------------------------------------------------------------------
+
+def supplies(item) -> Dict[str, int]:
+    """Current rating of each supply an item has, e.g. {'air': 4, 'power': 3}"""
+    if not isinstance(item, ItemInstance):
+        return {}
+    return {kind: getattr(item, kind) for kind in SUPPLY_LABELS if getattr(item, kind) is not None}
+
+def roll_supply(item, kind: str, rng: Optional[random.Random] = None) -> int:
+    """Make one supply roll for `kind` on a carried item. Returns points lost."""
+    rng = rng or random
+    rating = getattr(item, kind)
+    lost = sum(1 for _ in range(rating) if rng.randint(1, 6) == 1)
+    setattr(item, kind, rating - lost)
+    return lost
+
+def roll_ammo(item, stress: int, rng: Optional[random.Random] = None) -> bool:
+    """
+    After a round of fire: True (and one reload spent) if any Stress Die
+    came up 1. Items that don't track ammo (ammo is None) never run dry.
+    """
+    if getattr(item, "ammo", None) is None:
+        return False
+    rng = rng or random
+    if not any(rng.randint(1, 6) == 1 for _ in range(stress)):
+        return False
+    item.ammo = max(0, item.ammo - 1)
+    return True
+
+def warnings(char, within: int = 5, unit: str = "shift") -> List[str]:
+    """
+    One line per equipped supply that will probably (better than even odds)
+    be empty within `within` steps, from the cached forecasts.
+    """
+    lines = []
+    for name in char.equipped:
+        item = char.inventory.get_item(name)
+        if item is None:
+            continue
+        for kind, rating in supplies(item).items():
+            if rating <= 0:
+                lines.append(f"Your {SUPPLY_LABELS[kind]} in the {item.name} is out.")
+                continue
+            steps = supply_forecast(rating).likely()
+            if steps <= within:
+                lines.append(f"Your {SUPPLY_LABELS[kind]} in the {item.name} will likely run out "
+                             f"in {steps} {unit}{'s' if steps != 1 else ''}.")
+    return lines
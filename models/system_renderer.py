@@ -0,0 +1,148 @@
+from collections import OrderedDict
+from enum import Enum
+from typing import List, Tuple
+from .worldbuilding import StarSystem, OrbitalBody, PlanetType, ExplorationStatus
+
+# Discord rejects messages longer than this many characters.
+DISCORD_MESSAGE_LIMIT = 2000
+
+class DetailLevel(Enum):
+    """How much of a system to show."""
+    SUMMARY = "summary"  # Star plus one line per orbital body
+    FULL = "full"        # Every survey readout, colony and satellite
+
+# ---------------------------------------------------------------------------
+# Templates
+# ---------------------------------------------------------------------------
+# Bound str.format methods, looked up once at import instead of per line.
+_SYSTEM_HEADER = ">> STAR SYSTEM: {id} <<\nStar: {name}\nType: {type} / {brightness} / {spectral}\nPosition: ({x:.1f}, {y:.1f}) ly\nSurvey Status: {status}".format
+_BODY_SUMMARY = "[{index}] {name} | {type} | {distance} AU | {status}".format
+_BODY_HEADER = "\n--- [{index}] {name} ({distance} AU) ---\nType: {type}\nExploration Status: {status}".format
+_SATELLITE_HEADER = "{indent}> {name}".format
+_READOUT = "{indent}{label}: {value}".format
+_PAGE_FOOTER = "\n[Page {page}/{pages}]".format
+
+_FENCE_OPEN = "```text\n"
+_FENCE_CLOSE = "\n```"
+# Room kept free on every page for the fences and the page footer.
+_PAGE_OVERHEAD = len(_FENCE_OPEN) + len(_FENCE_CLOSE) + len(_PAGE_FOOTER(page=999, pages=999))
+
+_TYPE_LABELS = {
+    PlanetType.TERRESTRIAL: "Terrestrial Planet",
+    PlanetType.ICE: "Ice Planet",
+}
+
+def _type_label(body: OrbitalBody) -> str:
+    return _TYPE_LABELS.get(body.type, body.type.value)
+
+def _body_lines(body: OrbitalBody, index: int) -> List[str]:
+    """Full readout for a single body, including colony and satellites."""
+    lines = [_BODY_HEADER(index=index, name=body.name, distance=body.distance_au,
+                          type=_type_label(body), status=body.exploration_status.value)]
+    lines.extend(_READOUT(indent="", label=label, value=value) for label, value in body.details.items())
+    if body.colony:
+        lines.append("Colony:")
+        lines.extend(_READOUT(indent="  ", label=label, value=value) for label, value in body.colony.items())
+    for satellite in body.satellites:
+        lines.append(_SATELLITE_HEADER(indent="  ", name=satellite.name))
+        lines.extend(_READOUT(indent="    ", label=label, value=value)
+                     for label, value in satellite.details.items())
+    return lines
+
+def render_lines(system: StarSystem, detail: DetailLevel = DetailLevel.SUMMARY) -> List[str]:
+    """Format a system as plain text lines, without any pagination."""
+    star = system.star
+    lines = [_SYSTEM_HEADER(
+        id=system.id, name=star.name, type=star.star_type.value,
+        brightness=star.brightness_class.value,
+        spectral=star.spectral_class.value if star.spectral_class else "Unknown",
+        x=system.x, y=system.y, status=system.exploration_status.value
+    )]
+    if detail == DetailLevel.SUMMARY:
+        lines.append(f"\nOrbital Bodies ({len(system.bodies)}):")
+        lines.extend(
+            _BODY_SUMMARY(index=i, name=body.name, type=_type_label(body),
+                          distance=body.distance_au, status=body.exploration_status.value)
+            for i, body in enumerate(system.bodies, 1)
+        )
+    else:
+        for i, body in enumerate(system.bodies, 1):
+            lines.extend(_body_lines(body, i))
+    return lines
+
+def paginate(lines: List[str], limit: int = DISCORD_MESSAGE_LIMIT) -> List[str]:
+    """
+    Pack lines into ```text code blocks no longer than `limit` characters.
+    Lines are never split unless a single line is longer than a page.
+    """
+    budget = limit - _PAGE_OVERHEAD
+    if budget <= 0:
+        raise ValueError(f"Page limit {limit} is too small to hold any text")
+
+    bodies: List[str] = []
+    current: List[str] = []
+    size = 0
+    for line in lines:
+        while len(line) > budget:
+            # Oversized line: flush what we have and hard-split it
+            if current:
+                bodies.append("\n".join(current))
+                current, size = [], 0
+            bodies.append(line[:budget])
+            line = line[budget:]
+        added = len(line) + (1 if current else 0)
+        if size + added > budget:
+            bodies.append("\n".join(current))
+            current, size = [], 0
+            added = len(line)
+        current.append(line)
+        size += added
+    if current or not bodies:
+        bodies.append("\n".join(current))
+
+    if len(bodies) == 1:
+        return [f"{_FENCE_OPEN}{bodies[0]}{_FENCE_CLOSE}"]
+    return [
+        f"{_FENCE_OPEN}{body}{_PAGE_FOOTER(page=i, pages=len(bodies))}{_FENCE_CLOSE}"
+        for i, body in enumerate(bodies, 1)
+    ]
+
+class SystemRenderer:
+    """
+    Renders StarSystems into Discord-sized pages and caches the result.
+
+    Pages are cached by (system id, detail level, exploration status) and
+    tagged with the system revision they were built from, so a cached entry
+    is only rebuilt after StarSystem.touch() has been called.
+    """
+
+    def __init__(self, page_limit: int = DISCORD_MESSAGE_LIMIT, max_entries: int = 1024):
+        self.page_limit = page_limit
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[Tuple[str, DetailLevel, ExplorationStatus], Tuple[int, List[str]]]" = OrderedDict()
+
+    def render(self, system: StarSystem, detail: DetailLevel = DetailLevel.SUMMARY) -> List[str]:
+        """Return the pages for a system, formatting them only on a cache miss."""
+        key = (system.id, detail, system.exploration_status)
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == system.revision:
+            self._cache.move_to_end(key)
+            return cached[1]
+
+        pages = paginate(render_lines(system, detail), self.page_limit)
+        self._cache[key] = (system.revision, pages)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return pages
+
+    def invalidate(self, system_id: str) -> None:
+        """Drop every cached page for a system."""
+        for key in [k for k in self._cache if k[0] == system_id]:
+            del self._cache[key]
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
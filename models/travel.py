@@ -0,0 +1,295 @@
+import asyncio
+import heapq
+import math
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+from .worldbuilding import StarSystem
+
+# Default maximum distance a ship can cover in a single FTL jump.
+DEFAULT_JUMP_RANGE_LY = 20.0
+
+@dataclass
+class Route:
+    """A travel route between two systems."""
+    systems: List[str]   # System ids from origin to destination, inclusive
+    distance_ly: float   # Total distance travelled
+
+    @property
+    def jumps(self) -> int:
+        return max(len(self.systems) - 1, 0)
+
+class RoutePlanner:
+    """
+    Plans FTL routes over generated systems.
+
+    Systems are linked whenever they are within jump range of each other.
+    Positions are bucketed into a grid of jump-range sized cells, so adding
+    a system only checks the 3x3 cells around it and the graph grows
+    incrementally as sectors are generated.
+
+    Queries use A* with two admissible lower bounds: straight-line distance,
+    and landmark (ALT) bounds from shortest-path distances to a handful of
+    landmark systems. Landmark distances are repaired incrementally when new
+    systems are added, and recent routes are cached until the graph changes.
+
+    Queries never place landmarks themselves. Call refresh_landmarks() once
+    a batch of sectors has been generated; it rebuilds them in a worker
+    thread while queries keep using the previous set.
+    """
+
+    def __init__(self, jump_range_ly: float = DEFAULT_JUMP_RANGE_LY,
+                 num_landmarks: int = 8, route_cache_size: int = 1024):
+        self.jump_range = jump_range_ly
+        self.num_landmarks = num_landmarks
+        self.route_cache_size = route_cache_size
+        self.positions: Dict[str, Tuple[float, float]] = {}
+        self.edges: Dict[str, Dict[str, float]] = {}
+        self.revision = 0  # Bumped on every graph change
+        self._grid: Dict[Tuple[int, int], List[str]] = {}
+        self._landmarks: List[str] = []
+        self._landmark_dist: List[Dict[str, float]] = []
+        self._landmark_vectors: Dict[str, Tuple[float, ...]] = {}  # Per-system distances to every landmark
+        self._landmark_map_size = 0  # Number of systems when landmarks were placed
+        self._routes: "OrderedDict[Tuple[str, str], Optional[Route]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __contains__(self, system_id: str) -> bool:
+        return system_id in self.positions
+
+    # -----------------------------------------------------------------------
+    # Graph construction
+    # -----------------------------------------------------------------------
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return (math.floor(x / self.jump_range), math.floor(y / self.jump_range))
+
+    def add_system(self, system: StarSystem) -> None:
+        self.add_position(system.id, system.x, system.y)
+
+    def add_systems(self, systems: Iterable[StarSystem]) -> None:
+        """Add a batch of systems, e.g. a freshly generated sector."""
+        self.add_positions((s.id, s.x, s.y) for s in systems)
+
+    def add_position(self, system_id: str, x: float, y: float) -> None:
+        self.add_positions([(system_id, x, y)])
+
+    def add_positions(self, entries: Iterable[Tuple[str, float, float]]) -> None:
+        """Insert systems by raw coordinates and link them to their neighbours."""
+        new_edges: List[Tuple[str, str, float]] = []
+        new_ids: List[str] = []
+        jump_range_sq = self.jump_range * self.jump_range
+        for system_id, x, y in entries:
+            if system_id in self.positions:
+                raise ValueError(f"System {system_id} is already on the map")
+            cx, cy = self._cell(x, y)
+            links = self.edges[system_id] = {}
+            for gx in (cx - 1, cx, cx + 1):
+                for gy in (cy - 1, cy, cy + 1):
+                    for other in self._grid.get((gx, gy), ()):
+                        ox, oy = self.positions[other]
+                        d_sq = (x - ox) ** 2 + (y - oy) ** 2
+                        if d_sq <= jump_range_sq:
+                            d = math.sqrt(d_sq)
+                            links[other] = d
+                            self.edges[other][system_id] = d
+                            new_edges.append((system_id, other, d))
+            self.positions[system_id] = (x, y)
+            new_ids.append(system_id)
+            self._grid.setdefault((cx, cy), []).append(system_id)
+        self.revision += 1
+        self._routes.clear()
+        if self._landmarks:
+            self._repair_landmarks(new_ids, new_edges)
+
+    # -----------------------------------------------------------------------
+    # Landmarks
+    # -----------------------------------------------------------------------
+
+    def _dijkstra(self, source: str) -> Dict[str, float]:
+        dist = {source: 0.0}
+        heap = [(0.0, source)]
+        edges = self.edges
+        while heap:
+            d, node = heapq.heappop(heap)
+            if d > dist[node]:
+                continue
+            for other, w in edges[node].items():
+                nd = d + w
+                if nd < dist.get(other, math.inf):
+                    dist[other] = nd
+                    heapq.heappush(heap, (nd, other))
+        return dist
+
+    @property
+    def landmarks_stale(self) -> bool:
+        """True once the map has doubled since landmarks were last placed."""
+        return len(self.positions) > 1 and len(self.positions) >= 2 * self._landmark_map_size
+
+    def build_landmarks(self) -> None:
+        """
+        Pick landmarks spread across the map (farthest-point selection) and
+        compute shortest-path distances from each of them.
+
+        The new tables are published together at the end, so queries running
+        meanwhile keep the old ones. Systems must not be added during a build.
+        """
+        positions = self.positions
+        ids = list(positions)
+        landmarks: List[str] = []
+        landmark_dist: List[Dict[str, float]] = []
+        if ids:
+            mx = sum(x for x, _ in positions.values()) / len(ids)
+            my = sum(y for _, y in positions.values()) / len(ids)
+            nearest = {s: math.inf for s in ids}
+            for _ in range(min(self.num_landmarks, len(ids))):
+                if landmarks:
+                    # Next landmark is the system farthest from every landmark so far
+                    lx, ly = positions[landmarks[-1]]
+                    for s in ids:
+                        x, y = positions[s]
+                        d = (x - lx) ** 2 + (y - ly) ** 2
+                        if d < nearest[s]:
+                            nearest[s] = d
+                    pick = max(ids, key=nearest.__getitem__)
+                else:
+                    # First landmark is the system farthest from the centre of the map
+                    pick = max(ids, key=lambda s: (positions[s][0] - mx) ** 2 + (positions[s][1] - my) ** 2)
+                landmarks.append(pick)
+                landmark_dist.append(self._dijkstra(pick))
+        inf = math.inf
+        vectors = {s: tuple(dist.get(s, inf) for dist in landmark_dist) for s in ids}
+        self._landmarks, self._landmark_dist, self._landmark_vectors = landmarks, landmark_dist, vectors
+        self._landmark_map_size = len(ids)
+
+    async def refresh_landmarks(self) -> bool:
+        """Re-place stale landmarks off the event loop. Returns True if it did."""
+        if not self.landmarks_stale:
+            return False
+        await asyncio.to_thread(self.build_landmarks)
+        return True
+
+    def _update_vectors(self, system_ids: Iterable[str]) -> None:
+        tables = self._landmark_dist
+        inf = math.inf
+        for s in system_ids:
+            self._landmark_vectors[s] = tuple(dist.get(s, inf) for dist in tables)
+
+    def _repair_landmarks(self, new_ids: List[str], new_edges: List[Tuple[str, str, float]]) -> None:
+        """
+        Edge insertions can only shorten paths, so each landmark table is
+        fixed by relaxing the new edges and propagating only the improvements.
+        """
+        edges = self.edges
+        changed = set(new_ids)
+        for dist in self._landmark_dist:
+            heap = []
+            for u, v, w in new_edges:
+                du, dv = dist.get(u, math.inf), dist.get(v, math.inf)
+                if du + w < dv:
+                    dist[v] = du + w
+                    heapq.heappush(heap, (du + w, v))
+                elif dv + w < du:
+                    dist[u] = dv + w
+                    heapq.heappush(heap, (dv + w, u))
+            while heap:
+                d, node = heapq.heappop(heap)
+                if d > dist[node]:
+                    continue
+                changed.add(node)
+                for other, w in edges[node].items():
+                    nd = d + w
+                    if nd < dist.get(other, math.inf):
+                        dist[other] = nd
+                        heapq.heappush(heap, (nd, other))
+        self._update_vectors(changed)
+
+    # -----------------------------------------------------------------------
+    # Queries
+    # -----------------------------------------------------------------------
+
+    def _lower_bound(self, node: str, goal: str) -> float:
+        """
+        Best of the straight-line and landmark bounds. Unreachable goals give
+        inf: a landmark reachable from only one of the two systems yields an
+        infinite difference, and one reachable from neither yields nan, which
+        never wins the comparison.
+        """
+        x, y = self.positions[node]
+        gx, gy = self.positions[goal]
+        h = math.hypot(x - gx, y - gy)
+        goal_vec = self._landmark_vectors.get(goal, ())
+        for a, b in zip(self._landmark_vectors.get(node, ()), goal_vec):
+            d = abs(a - b)
+            if d > h:
+                h = d
+        return h
+
+    def distance_estimate(self, start: str, goal: str) -> float:
+        """A lower bound on the travel distance between two systems."""
+        return self._lower_bound(start, goal)
+
+    def route(self, start: str, goal: str) -> Optional[Route]:
+        """Shortest route between two systems, or None if out of reach."""
+        for system_id in (start, goal):
+            if system_id not in self.positions:
+                raise KeyError(f"Unknown system: {system_id}")
+        key = (start, goal)
+        if key in self._routes:
+            self._routes.move_to_end(key)
+            return self._routes[key]
+        result = self._astar(start, goal)
+        self._routes[key] = result
+        while len(self._routes) > self.route_cache_size:
+            self._routes.popitem(last=False)
+        return result
+
+    def _astar(self, start: str, goal: str) -> Optional[Route]:
+        edges = self.edges
+        positions = self.positions
+        vectors = self._landmark_vectors
+        gx, gy = positions[goal]
+        goal_vec = vectors.get(goal, ())
+        hypot = math.hypot
+        inf = math.inf
+
+        g_score = {start: 0.0}
+        came_from: Dict[str, str] = {}
+        h_score: Dict[str, float] = {}
+        closed = set()
+        heap = [(self._lower_bound(start, goal), 0.0, start)]
+        while heap:
+            _, g, node = heapq.heappop(heap)
+            if node == goal:
+                path = [node]
+                while node in came_from:
+                    node = came_from[node]
+                    path.append(node)
+                path.reverse()
+                return Route(path, g)
+            if node in closed:
+                continue
+            closed.add(node)
+            for other, w in edges[node].items():
+                if other in closed:
+                    continue
+                ng = g + w
+                if ng < g_score.get(other, inf):
+                    h = h_score.get(other)
+                    if h is None:
+                        # Inlined _lower_bound; this is the hot loop of every query
+                        x, y = positions[other]
+                        h = hypot(x - gx, y - gy)
+                        for a, b in zip(vectors.get(other, ()), goal_vec):
+                            d = abs(a - b)
+                            if d > h:
+                                h = d
+                        h_score[other] = h
+                    if h == inf:
+                        continue
+                    g_score[other] = ng
+                    came_from[other] = node
+                    heapq.heappush(heap, (ng + h, ng, other))
+        return None
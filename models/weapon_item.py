@@ -2,7 +2,7 @@ from dataclasses import dataclass, field
 from typing import Optional, List
 from .items import Item
 
-@dataclass
+@dataclass(slots=True)
 class WeaponItem(Item):
     """Weapons used in combat, with attributes matching core Alien RPG mechanics."""
 
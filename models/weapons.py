@@ -1,4 +1,4 @@
-from weapon_item import WeaponItem
+from .weapon_item import WeaponItem
 
 # === PISTOLS ===
 m4a3_service_pistol = WeaponItem(
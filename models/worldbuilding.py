@@ -1,10 +1,11 @@
 import random
 from enum import Enum
-from dataclasses import dataclass
-from typing import List, Optional, Tuple, Dict
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple, Dict
 import os
 import json
 import math
+from contextlib import contextmanager
 
 # Constants for gravity calculations
 G = 6.67430e-11  # Gravitational constant in m³/kg/s²
@@ -701,6 +702,10 @@ class OrbitalBody:
     exploration_status: ExplorationStatus
     distance_au: float
     parent_star: str  # Name of the parent star
+    details: Dict[str, str] = field(default_factory=dict)  # Survey readouts in display order (e.g. "Size", "Gravity")
+    colony: Dict[str, str] = field(default_factory=dict)  # Colony readouts; empty if the body has no colony
+    allegiance: Optional['ColonyAllegiance'] = None  # Colony allegiance, if colonized
+    satellites: List['OrbitalBody'] = field(default_factory=list)  # Moons or dwarf planets
 
 def generate_orbital_body_name(star_name: str, body_type: PlanetType, distance_au: float, 
                              exploration_status: ExplorationStatus) -> str:
@@ -829,3 +834,242 @@ def get_gas_giant_size() -> PlanetSizeCategory:
         gravity_g=gravity,
         examples=["Gas Giant"]
     )
+
+# ===========================================================================
+# STAR SYSTEMS: Structured generation of a full system
+# ===========================================================================
+
+def roll_2d6() -> int:
+    """Simulate a 2d6 roll."""
+    return random.randint(1, 6) + random.randint(1, 6)
+
+def roll_3d6() -> int:
+    """Simulate a 3d6 roll."""
+    return random.randint(1, 6) + random.randint(1, 6) + random.randint(1, 6)
+
+GAS_GIANT_COMPOSITIONS = [
+    "Hydrogen-Helium Dominant",
+    "Hydrogen, Helium, Methane",
+    "Hydrogen, Helium, Ammonia",
+    "Hydrogen, Helium, Water Vapor",
+    "Hydrogen, Helium, Trace Organics"
+]
+GAS_GIANT_STRUCTURES = [
+    "Layers of metallic hydrogen, molecular hydrogen, and ices",
+    "Thick gaseous envelope with a possible rocky/icy core",
+    "No solid surface; gradual transition from gas to liquid",
+    "Bands of clouds, storms, and high winds",
+    "Deep atmosphere with complex weather systems"
+]
+
+def get_gas_giant_composition() -> str:
+    return random.choice(GAS_GIANT_COMPOSITIONS)
+
+def get_gas_giant_structure() -> str:
+    return random.choice(GAS_GIANT_STRUCTURES)
+
+# Exploration statuses ordered from least to most known, used to rank bodies.
+EXPLORATION_ORDER: List[ExplorationStatus] = list(ExplorationStatus)
+
+@dataclass
+class StarSystem:
+    """
+    A generated star system: its star, orbital bodies and galactic position.
+    - x/y: position in light years, used for travel distances and sector maps
+    - revision: bumped by touch() whenever the system changes, so caches
+      keyed on the system know to rebuild
+    """
+    id: str
+    star: Star
+    bodies: List[OrbitalBody] = field(default_factory=list)
+    x: float = 0.0
+    y: float = 0.0
+    revision: int = 0
+
+    @property
+    def exploration_status(self) -> ExplorationStatus:
+        """The most advanced exploration status of any body in the system."""
+        if not self.bodies:
+            return ExplorationStatus.UNDISCOVERED
+        return max((b.exploration_status for b in self.bodies), key=EXPLORATION_ORDER.index)
+
+    @property
+    def allegiance(self) -> Optional[ColonyAllegiance]:
+        """Allegiance of the first colony found in the system, if any."""
+        for body in self.bodies:
+            if body.allegiance is not None:
+                return body.allegiance
+        return None
+
+    def touch(self) -> None:
+        """Mark the system as changed."""
+        self.revision += 1
+
+def generate_orbital_body(body_type: PlanetType, distance_au: float, star_name: str,
+                          parent_diameter_km: Optional[int] = None) -> OrbitalBody:
+    """
+    Generate any orbital body (planet or moon), rolling size, atmosphere,
+    terrain, satellites and colony as far as its exploration status allows.
+    """
+    exploration_status = determine_exploration_status(roll_2d6())
+    name = generate_orbital_body_name(star_name, body_type, distance_au, exploration_status)
+    body = OrbitalBody(name, body_type, exploration_status, distance_au, star_name)
+    details = body.details
+
+    if body_type == PlanetType.ASTEROID_BELT:
+        mining_roll = roll_2d6()
+        dwarf_planet_roll = roll_2d6()
+
+        # Mining operations and dwarf planets both on 10+ on 2d6
+        details["Mining Operations"] = "Yes" if mining_roll >= 10 else "No"
+        if dwarf_planet_roll >= 10:
+            num_dwarf_planets = random.randint(1, 3)
+            details["Dwarf Planets"] = str(num_dwarf_planets)
+            if exploration_status != ExplorationStatus.UNDISCOVERED:
+                for dp in range(num_dwarf_planets):
+                    dp_size = get_dwarf_planet_size()
+                    dwarf = OrbitalBody(f"Dwarf Planet {dp + 1}", PlanetType.TERRESTRIAL,
+                                        exploration_status, distance_au, star_name)
+                    dwarf.details["Size"] = f"{dp_size.diameter_km}km diameter"
+                    dwarf.details["Gravity"] = f"{dp_size.gravity_g}g"
+                    if exploration_status in (ExplorationStatus.SURVEYED, ExplorationStatus.EXPLORED):
+                        dp_atmosphere = get_atmosphere_type(roll_2d6(), dp_size.diameter_km)
+                        dwarf.details["Atmosphere"] = dp_atmosphere.value
+                        dwarf.details["Temperature"] = get_temperature_type(roll_2d6(), dp_atmosphere).value
+                    body.satellites.append(dwarf)
+
+        # Special features (12 on 2d6)
+        if mining_roll == 12:
+            details["Special Feature"] = "Major mining operation with permanent station"
+        elif dwarf_planet_roll == 12:
+            details["Special Feature"] = "Dwarf planet shows signs of ancient alien activity"
+        return body
+
+    # Physical characteristics are only known once the body has been detected
+    if exploration_status == ExplorationStatus.UNDISCOVERED:
+        return body
+
+    if body_type == PlanetType.GAS_GIANT:
+        size_cat = get_gas_giant_size()
+    elif parent_diameter_km:  # This is a moon
+        size_cat = get_moon_size_category(parent_diameter_km)
+    else:
+        size_cat = get_planet_size_category(roll_2d6())
+    details["Size"] = f"{size_cat.diameter_km}km diameter"
+    details["Gravity"] = f"{size_cat.gravity_g}g"
+
+    if body_type == PlanetType.GAS_GIANT:
+        details["Atmosphere Composition"] = get_gas_giant_composition()
+        details["Internal Structure"] = get_gas_giant_structure()
+        details["Note"] = "Gas giants cannot be landed on; no solid surface."
+        for moon_num in range(random.randint(1, 6)):
+            moon = generate_orbital_body(PlanetType.TERRESTRIAL, distance_au, star_name, size_cat.diameter_km)
+            body.satellites.append(moon)
+        return body
+
+    atmosphere = None
+    if exploration_status in (ExplorationStatus.SURVEYED, ExplorationStatus.EXPLORED):
+        atmosphere = get_atmosphere_type(roll_2d6(), size_cat.diameter_km)
+        temperature = get_temperature_type(roll_2d6(), atmosphere)
+        details["Atmosphere"] = atmosphere.value
+        details["Temperature"] = temperature.value
+        details["Geosphere"] = get_geosphere_type(roll_2d6(), atmosphere, temperature).value
+        if body_type == PlanetType.ICE:
+            details["Terrain"] = get_ice_planet_terrain(roll_2d6())
+        else:
+            details["Terrain"] = get_planetary_terrain(random.randint(11, 66)).value  # D66 roll
+
+    if body_type == PlanetType.ICE:
+        # Ice planets need a breathable atmosphere and near-Earth gravity,
+        # and even then only 20% of them are settled
+        can_have_colony = (atmosphere == AtmosphereType.BREATHABLE and
+                           0.8 <= size_cat.gravity_g <= 1.2 and
+                           random.random() < 0.2)
+    else:
+        can_have_colony = 0.6 <= size_cat.gravity_g <= 1.5
+
+    if can_have_colony and random.random() < 0.3:  # 30% chance of having a colony
+        colony_size = get_colony_size(roll_2d6(), atmosphere, size_cat.diameter_km)
+        mission = get_colony_mission(roll_2d6(), colony_size.size, atmosphere)
+        orbit = get_orbit_components(roll_2d6(), colony_size.size)
+        num_factions = get_num_factions(random.randint(1, 6))
+        factions = get_colony_factions(num_factions)
+        body.allegiance = get_colony_allegiance(roll_3d6())
+        body.colony = {
+            "Size": colony_size.size.value,
+            "Mission": mission.value,
+            "Orbit": orbit.value,
+            f"Factions ({num_factions})": ", ".join(f.value for f in factions),
+            "Allegiance": body.allegiance.value,
+        }
+    return body
+
+class GenerationCancelled(Exception):
+    """Raised from inside generation when its `should_stop` check says so."""
+
+def generate_star_system(system_id: Optional[str] = None, x: float = 0.0, y: float = 0.0,
+                         should_stop: Optional[Callable[[], bool]] = None) -> StarSystem:
+    """
+    Generate a complete star system with 3-8 orbital bodies at random
+    distances. If no system_id is given, the star name is used.
+    `should_stop` is checked before each body; GenerationCancelled is
+    raised once it returns True.
+    """
+    star = Star(
+        generate_star_name(),
+        random.choice(list(StarType)),
+        random.choice(list(BrightnessClass)),
+        random.choice(list(SpectralClass))
+    )
+    system = StarSystem(id=system_id or star.name, star=star, x=x, y=y)
+
+    num_bodies = random.randint(3, 8)
+    orbital_distances = sorted(round(random.uniform(0.4, 30.0), 2) for _ in range(num_bodies))
+    for distance in orbital_distances:
+        if should_stop is not None and should_stop():
+            raise GenerationCancelled(system.id)
+        planet_type = random.choice(list(PlanetType))
+        system.bodies.append(generate_orbital_body(planet_type, distance, star.name))
+    return system
+
+# ---------------------------------------------------------------------------
+# Seeded generation
+# ---------------------------------------------------------------------------
+# Width and height of a square galaxy sector in light years.
+SECTOR_SIZE_LY = 100.0
+
+@contextmanager
+def seeded_random(seed):
+    """
+    Seed the shared random module for reproducible generation, restoring the
+    previous state afterwards so callers' own rolls are unaffected.
+    """
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        yield
+    finally:
+        random.setstate(state)
+
+def generate_seeded_system(seed: int, system_id: Optional[str] = None,
+                           x: float = 0.0, y: float = 0.0,
+                           should_stop: Optional[Callable[[], bool]] = None) -> StarSystem:
+    """Generate a star system that is identical for the same seed."""
+    with seeded_random(f"system:{seed}"):
+        return generate_star_system(system_id, x, y, should_stop)
+
+def generate_sector(sector_x: int, sector_y: int, count: int, seed: int,
+                    start: int = 0, sector_size: float = SECTOR_SIZE_LY,
+                    should_stop: Optional[Callable[[], bool]] = None) -> List[StarSystem]:
+    """
+    Generate systems start..start+count-1 of a sector, scattered uniformly
+    across its square. Each system has its own seed, so a sector can be
+    generated in chunks (or in parallel) and still come out identical.
+    """
+    systems = []
+    for i in range(start, start + count):
+        with seeded_random(f"sector:{seed}:{sector_x}:{sector_y}:{i}"):
+            x = sector_x * sector_size + random.uniform(0, sector_size)
+            y = sector_y * sector_size + random.uniform(0, sector_size)
+            systems.append(generate_star_system(f"{sector_x}:{sector_y}-{i:04d}", round(x, 2), round(y, 2), should_stop))
+    return systems
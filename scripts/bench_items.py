@@ -0,0 +1,31 @@
+import os
+import sys
+import dataclasses
+import tracemalloc
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models import catalog
+from models.items import ItemInstance
+
+# Memory per carried catalog item: a full dataclass copy of the definition
+# versus an ItemInstance that references the shared definition.
+# Usage: python scripts/bench_items.py [count]   (default 100000)
+
+def measure(make, definitions, count: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    carried = [make(definitions[i % len(definitions)]) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    # The list of references costs the same either way
+    total -= sys.getsizeof(carried)
+    return total / count
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    definitions = list(catalog.definitions().values())
+    copy_bytes = measure(dataclasses.replace, definitions, count)
+    instance_bytes = measure(ItemInstance, definitions, count)
+    print(f"{count} carried items over {len(definitions)} catalog definitions")
+    print(f"  dataclass copy: {copy_bytes:8.0f} bytes/item")
+    print(f"  ItemInstance:   {instance_bytes:8.0f} bytes/item  ({copy_bytes / instance_bytes:.1f}x smaller)")
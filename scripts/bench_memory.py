@@ -0,0 +1,56 @@
+import os
+import sys
+import dataclasses
+import tracemalloc
+from types import FunctionType
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models.character import Character, Attributes, Skills
+from models.items import Item, Inventory
+
+# Resident bytes per NPC (character, attributes, skills and a six-item kit)
+# with the slotted model classes, against the same classes rebuilt with a
+# per-instance __dict__ as they were before.
+# Usage: python scripts/bench_memory.py [count]   (default 100000)
+
+KIT = ("M41A Pulse Rifle", "Motion Tracker", "Flashlight", "Compression Suit", "Cutting Torch", "Seegson P-DAT")
+
+def unslotted(cls):
+    """`cls` rebuilt as a plain dataclass with a per-instance __dict__."""
+    specs = [(f.name, f.type, dataclasses.field(default=f.default, default_factory=f.default_factory))
+             for f in dataclasses.fields(cls)]
+    # Keep hand-written methods; dataclass regenerates __init__, __repr__ and __eq__
+    generated = ("__init__", "__repr__", "__eq__", "__getstate__", "__setstate__")
+    methods = {name: value for name, value in vars(cls).items()
+               if isinstance(value, (FunctionType, property, staticmethod, classmethod)) and name not in generated}
+    return dataclasses.make_dataclass(cls.__name__, specs, namespace=methods)
+
+def make_npcs(count: int, character_cls, attributes_cls, skills_cls, item_cls):
+    npcs = []
+    for i in range(count):
+        npc = character_cls(id=str(i), name=f"Colonist {i}", career="Roughneck",
+                            attributes=attributes_cls(), skills=skills_cls(), inventory=Inventory())
+        npc.skills.stamina = i % 4
+        for name in KIT:
+            npc.inventory.add_item(item_cls(name=name))
+        npcs.append(npc)
+    return npcs
+
+def measure(count: int, *classes) -> float:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    npcs = make_npcs(count, *classes)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del npcs
+    return total / count
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    plain = (unslotted(Character), unslotted(Attributes), unslotted(Skills), unslotted(Item))
+    slotted = (Character, Attributes, Skills, Item)
+    before = measure(count, *plain)
+    after = measure(count, *slotted)
+    print(f"{count} NPCs with a {len(KIT)}-item kit")
+    print(f"  __dict__ classes: {before:8.0f} bytes/NPC")
+    print(f"  slotted classes:  {after:8.0f} bytes/NPC  ({(1 - after / before) * 100:.0f}% less)")
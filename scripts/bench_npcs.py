@@ -0,0 +1,36 @@
+import os
+import sys
+import json
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models.npc_generator import NPCGenerator
+
+# NPCs per second from NPCGenerator.generate (compact batch only), and the
+# cost of building full sheets from a sample of them on demand.
+# Usage: python scripts/bench_npcs.py [count]   (default 100000)
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with open(os.path.join(os.path.dirname(__file__), '..', 'data', 'playerGenData.json')) as f:
+        playergen = json.load(f)
+
+    start = time.perf_counter()
+    generator = NPCGenerator(playergen, seed=1)
+    setup = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = generator.generate(count)
+    elapsed = time.perf_counter() - start
+
+    sample = min(count, 1000)
+    start = time.perf_counter()
+    for i in range(sample):
+        batch.to_json(i)
+    sheets = time.perf_counter() - start
+
+    print(f"tables: {setup * 1000:.1f} ms")
+    print(f"generate {count}: {elapsed * 1000:.0f} ms ({count / elapsed:,.0f} NPCs/s)")
+    print(f"to_json: {sheets / sample * 1e6:.1f} us per sheet")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import asyncio
+import os
+import sys
+import random
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models.travel import RoutePlanner
+
+# Benchmark route queries on a synthetic galaxy with the density of
+# generated sectors (50 systems per 100x100 ly sector).
+
+def report(label: str, timings):
+    timings = sorted(timings)
+    print(f"{label}: median {timings[len(timings) // 2]:.2f} ms, "
+          f"p95 {timings[int(len(timings) * 0.95)]:.2f} ms, max {timings[-1]:.2f} ms")
+
+def main(num_systems: int = 100_000, queries: int = 200, local_radius: float = 500.0):
+    rng = random.Random(1)
+    side = (num_systems / 50) ** 0.5 * 100
+    planner = RoutePlanner()
+
+    t0 = time.perf_counter()
+    planner.add_positions((f"S{i}", rng.uniform(0, side), rng.uniform(0, side)) for i in range(num_systems))
+    t1 = time.perf_counter()
+    print(f"Graph: {num_systems} systems in {t1 - t0:.2f}s")
+
+    ids = list(planner.positions)
+
+    async def during_refresh():
+        # Generation has finished: landmarks build in a worker thread while
+        # the loop keeps answering queries with straight-line bounds
+        refresh = asyncio.create_task(planner.refresh_landmarks())
+        timings = []
+        while not refresh.done():
+            a, b = rng.sample(ids, 2)
+            start = time.perf_counter()
+            planner.route(a, b)
+            timings.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(0)
+        await refresh
+        return timings
+
+    t1 = time.perf_counter()
+    timings = asyncio.run(during_refresh())
+    print(f"Landmarks in background: {time.perf_counter() - t1:.2f}s")
+    report(f"Galaxy-wide routes during the build ({len(timings)})", timings)
+    tiles = {}
+    for s, (x, y) in planner.positions.items():
+        tiles.setdefault((int(x // local_radius), int(y // local_radius)), []).append(s)
+
+    local, galaxy = [], []
+    for _ in range(queries):
+        a, b = rng.sample(ids, 2)
+        start = time.perf_counter()
+        planner.route(a, b)
+        galaxy.append((time.perf_counter() - start) * 1000)
+
+        # Destination somewhere in the same local_radius tile
+        x, y = planner.positions[a]
+        b = rng.choice(tiles[(int(x // local_radius), int(y // local_radius))])
+        start = time.perf_counter()
+        planner.route(a, b)
+        local.append((time.perf_counter() - start) * 1000)
+    report(f"Local routes (same {local_radius:.0f} ly tile)", local)
+    report(f"Galaxy-wide routes (map is {side:.0f} ly across)", galaxy)
+
+    # Incremental update: one more sector next to the map
+    t0 = time.perf_counter()
+    planner.add_positions((f"N{i}", side + rng.uniform(0, 100), rng.uniform(0, 100)) for i in range(50))
+    print(f"Adding a 50-system sector: {(time.perf_counter() - t0) * 1000:.2f} ms")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
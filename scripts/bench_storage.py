@@ -0,0 +1,66 @@
+import os
+import sys
+import random
+import shutil
+import tempfile
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models.character import Character
+from models.character_store import CharacterStore
+from models.sqlite_store import SqliteCharacterStore
+from models.items import Item
+
+# Save/load latency of the JSON (per-player files) and SQLite backends.
+# Usage: python scripts/bench_storage.py [sizes...]   (default 10 1000 100000)
+
+def make_roster(count: int):
+    rng = random.Random(1)
+    roster = {}
+    for i in range(count):
+        char = Character.create_new(str(100000000000 + i), f"Colonist {i}")
+        char.career = rng.choice(["Colonial Marine", "Roughneck", "Medic", "Pilot"])
+        char.skills.ranged_combat = rng.randint(0, 3)
+        for name in ("M41A Pulse Rifle", "Motion Tracker", "Flashlight"):
+            char.inventory.add_item(Item(name=name))
+        roster[char.id] = char
+    return roster
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+def bench(label: str, make_store, roster):
+    store = make_store()
+    store.mark_all_dirty(roster)
+    full_ms, _ = timed(lambda: store.save(roster))
+
+    # One character changed: the common case after a command
+    samples = []
+    ids = list(roster)
+    for i in range(20):
+        char_id = ids[i % len(ids)]
+        roster[char_id].cash += 1
+        store.mark_dirty(char_id)
+        samples.append(timed(lambda: store.write_pending(store.take_pending(roster)))[0])
+    samples.sort()
+    store.checkpoint()
+
+    load_ms, loaded = timed(lambda: make_store().load_all())
+    assert len(loaded) == len(roster)
+    print(f"  {label:<7} initial save {full_ms:9.1f} ms | single save median {samples[len(samples) // 2]:6.2f} ms "
+          f"max {samples[-1]:6.2f} ms | load all {load_ms:9.1f} ms")
+
+def main(sizes):
+    for size in sizes:
+        roster = make_roster(size)
+        print(f"{size} characters:")
+        root = tempfile.mkdtemp(prefix="alien-rpg-bench-")
+        try:
+            bench("json", lambda: CharacterStore(os.path.join(root, "players"), None), roster)
+            bench("sqlite", lambda: SqliteCharacterStore(os.path.join(root, "bench.db")), roster)
+        finally:
+            shutil.rmtree(root)
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10, 1000, 100000])
@@ -0,0 +1,226 @@
+import os
+import sys
+import gzip
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models.character import Character
+from models.character_store import CharacterStore, DEFAULT_PLAYERS_DIR
+from models.sqlite_store import SqliteCharacterStore, DEFAULT_DB_FILE
+from models.session_log import SessionLog, DEFAULT_CAMPAIGN_DIR, campaign_ids
+from models import codec
+from models.codec import write_json_atomic
+
+# Streams characters and campaign state in and out as JSON Lines, one
+# record per line, optionally gzip-compressed (any path ending in .gz).
+# Nothing holds the whole dataset in memory, so a million-record export
+# or import runs in constant memory.
+#
+#   python scripts/bulk_io.py export backup.jsonl.gz
+#   python scripts/bulk_io.py import backup.jsonl.gz --backend sqlite
+#
+# Record shapes:
+#   {"kind": "character", "id": ..., "data": {...Character.to_json()...}}
+#   {"kind": "event", "campaign": ..., "seq": ..., "ts": ..., "type": ..., ...}
+#   {"kind": "session_state", "campaign": ..., "key": ..., "value": ...}
+#
+# Imports validate characters through Character.from_json in worker
+# processes and record their progress in `<input>.progress` after every
+# committed chunk. Re-running a failed import picks up after the last
+# committed line.
+
+CHUNK_SIZE = 500  # Lines per validation task and per store transaction
+PROGRESS_SUFFIX = ".progress"
+
+def open_store(args):
+    if args.backend == "sqlite":
+        return SqliteCharacterStore(args.db)
+    return CharacterStore(args.players_dir, legacy_file=None)
+
+def open_stream(path: str, mode: str, compressed: Optional[bool] = None):
+    if compressed is None:
+        compressed = path.endswith(".gz")
+    return gzip.open(path, mode) if compressed else open(path, mode)
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+def iter_records(store, campaigns_dir: str) -> Iterator[Dict]:
+    for char_id, data in store.iter_data():
+        yield {"kind": "character", "id": char_id, "data": data}
+    if isinstance(store, SqliteCharacterStore):
+        for campaign_id, key, value in store.iter_session_state():
+            yield {"kind": "session_state", "campaign": campaign_id, "key": key, "value": value}
+    for campaign_id in campaign_ids(campaigns_dir):
+        for record in SessionLog(campaign_id, root=campaigns_dir).records():
+            yield {"kind": "event", "campaign": campaign_id, **record}
+
+def export(args) -> int:
+    store = open_store(args)
+    store.load_roster()  # Folds any crash-left journal tail into the files first
+    counts: Dict[str, int] = {}
+    # Written under a temporary name so a failed export never looks complete
+    tmp_path = f"{args.output}.tmp"
+    with open_stream(tmp_path, "wb", compressed=args.output.endswith(".gz")) as out:
+        for record in iter_records(store, args.campaigns_dir):
+            out.write(codec.dumps(record, pretty=False) + b"\n")
+            counts[record["kind"]] = counts.get(record["kind"], 0) + 1
+    os.replace(tmp_path, args.output)
+    summary = ", ".join(f"{n} {kind}" for kind, n in counts.items()) or "nothing"
+    print(f"Exported {summary} to {args.output}")
+    return 0
+
+# ---------------------------------------------------------------------------
+# Import
+# ---------------------------------------------------------------------------
+
+def validate_chunk(lines: List[Tuple[int, bytes]]) -> List[Tuple[int, Optional[Dict], Optional[str]]]:
+    """
+    Worker-side parse and validation. Characters are rebuilt through
+    Character.from_json and stored in their normalized to_json() form.
+    Returns (line number, record or None, error or None) per line.
+    """
+    results = []
+    for line_no, line in lines:
+        try:
+            record = codec.loads(line)
+            if record.get("kind") == "character":
+                char = Character.from_json(record["id"], record["data"])
+                record["data"] = char.to_json()
+            elif record.get("kind") not in ("event", "session_state"):
+                raise ValueError(f"unknown record kind {record.get('kind')!r}")
+            results.append((line_no, record, None))
+        except Exception as e:
+            results.append((line_no, None, f"{type(e).__name__}: {e}"))
+    return results
+
+def read_chunks(path: str, skip: int) -> Iterator[List[Tuple[int, bytes]]]:
+    chunk = []
+    with open_stream(path, "rb") as f:
+        for line_no, line in enumerate(f, 1):
+            if line_no <= skip or not line.strip():
+                continue
+            chunk.append((line_no, line))
+            if len(chunk) == CHUNK_SIZE:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+def read_progress(path: str) -> int:
+    try:
+        with open(path, "rb") as f:
+            return int(codec.loads(f.read()).get("line", 0))
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+class Importer:
+    """Applies validated chunks in input order and records progress after each."""
+
+    def __init__(self, store, campaigns_dir: str, progress_path: str):
+        self.store = store
+        self.campaigns_dir = campaigns_dir
+        self.progress_path = progress_path
+        self.logs: Dict[str, SessionLog] = {}
+        self.counts: Dict[str, int] = {}
+        self.errors = 0
+        self.skipped_session_state = 0
+
+    def apply(self, results: List[Tuple[int, Optional[Dict], Optional[str]]]) -> None:
+        batch: Dict[str, Optional[Dict]] = {}
+        session_rows: Dict[str, Dict] = {}
+        for line_no, record, error in results:
+            if error is not None:
+                print(f"Line {line_no}: skipped ({error})")
+                self.errors += 1
+                continue
+            kind = record.pop("kind")
+            if kind == "character":
+                batch[record["id"]] = record["data"]
+            elif kind == "session_state":
+                session_rows.setdefault(record["campaign"], {})[record["key"]] = record["value"]
+                continue  # Counted once written
+            elif not self._log(record.pop("campaign")).restore(record):
+                continue  # Already in the log from an earlier run
+            self.counts[kind] = self.counts.get(kind, 0) + 1
+        failed = self.store.import_batch(batch) if batch else []
+        if failed:
+            raise RuntimeError(f"could not write {len(failed)} character(s), e.g. {failed[0]}")
+        if session_rows and not isinstance(self.store, SqliteCharacterStore):
+            # Only the sqlite backend has a session_state table
+            self.skipped_session_state += sum(len(values) for values in session_rows.values())
+            session_rows = {}
+        for campaign_id, values in session_rows.items():
+            self.store.set_session_state(campaign_id, values)
+            self.counts["session_state"] = self.counts.get("session_state", 0) + len(values)
+        for log in self.logs.values():
+            log.commit()
+        # Everything up to here is durable; a rerun starts after this line
+        write_json_atomic(self.progress_path, {"line": results[-1][0]})
+
+    def _log(self, campaign_id: str) -> SessionLog:
+        log = self.logs.get(campaign_id)
+        if log is None:
+            log = self.logs[campaign_id] = SessionLog(campaign_id, root=self.campaigns_dir)
+        return log
+
+    def finish(self) -> None:
+        self.store.finish_import()
+        for log in self.logs.values():
+            log.snapshot()
+            log.close()
+
+def import_(args) -> int:
+    progress_path = args.input + PROGRESS_SUFFIX
+    skip = 0 if args.restart else read_progress(progress_path)
+    if skip:
+        print(f"Resuming {args.input} after line {skip}")
+    store = open_store(args)
+    store.load_roster()
+    if skip and isinstance(store, CharacterStore):
+        # Files written before the failure are not in index.json yet
+        store.rebuild_index()
+    importer = Importer(store, args.campaigns_dir, progress_path)
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            # A bounded window of chunks in flight keeps memory flat on huge inputs
+            window = []
+            for chunk in read_chunks(args.input, skip):
+                window.append(pool.submit(validate_chunk, chunk))
+                if len(window) >= args.workers * 2:
+                    importer.apply(window.pop(0).result())
+            for future in window:
+                importer.apply(future.result())
+    except Exception as e:
+        print(f"Import stopped: {e}")
+        print(f"Progress is saved in {progress_path}; run the same command again to resume")
+        return 1
+    importer.finish()
+    if os.path.exists(progress_path):
+        os.remove(progress_path)
+    summary = ", ".join(f"{n} {kind}" for kind, n in importer.counts.items()) or "nothing"
+    print(f"Imported {summary} from {args.input} ({importer.errors} invalid line(s) skipped)")
+    if importer.skipped_session_state:
+        print(f"Skipped {importer.skipped_session_state} session state value(s); they need --backend sqlite")
+    return 1 if importer.errors else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream characters and campaign state to or from JSON Lines")
+    parser.add_argument("--backend", choices=("json", "sqlite"), default=os.getenv("STORAGE_BACKEND", "json").lower())
+    parser.add_argument("--players-dir", default=DEFAULT_PLAYERS_DIR, help="Player files for the json backend")
+    parser.add_argument("--db", default=os.getenv("DATABASE_FILE", DEFAULT_DB_FILE), help="Database for the sqlite backend")
+    parser.add_argument("--campaigns-dir", default=DEFAULT_CAMPAIGN_DIR, help="Campaign session logs")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser("export", help="Write every record to a .jsonl or .jsonl.gz file")
+    export_parser.add_argument("output")
+
+    import_parser = commands.add_parser("import", help="Load records from a .jsonl or .jsonl.gz file")
+    import_parser.add_argument("input")
+    import_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Validation processes")
+    import_parser.add_argument("--restart", action="store_true", help="Ignore saved progress and start from line 1")
+
+    args = parser.parse_args()
+    sys.exit(export(args) if args.command == "export" else import_(args))
@@ -0,0 +1,20 @@
+import os
+import sys
+import argparse
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models.sqlite_store import SqliteCharacterStore, DEFAULT_DB_FILE
+
+# One-shot import of characters.json into the SQLite backend.
+# Run from the repo root, then start the bot with STORAGE_BACKEND=sqlite.
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import characters.json into SQLite")
+    parser.add_argument("source", nargs="?", default="characters.json", help="Legacy characters file")
+    parser.add_argument("--db", default=DEFAULT_DB_FILE, help="SQLite database to create or update")
+    args = parser.parse_args()
+
+    store = SqliteCharacterStore(args.db)
+    count = store.migrate_legacy(args.source)
+    store.checkpoint()
+    store.close()
+    print(f"Imported {count} character(s) from {args.source} into {args.db}")
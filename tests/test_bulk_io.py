@@ -0,0 +1,77 @@
+import sys
+import os
+import gzip
+import argparse
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts')))
+import bulk_io
+from models.character import Character
+from models.character_store import CharacterStore
+from models.items import Item
+from models.session_log import SessionLog, DamageTaken, SceneChanged
+
+def make_args(root, **kwargs):
+    args = dict(backend="json", players_dir=str(root / "players"), db=str(root / "game.db"),
+                campaigns_dir=str(root / "campaigns"), workers=1, restart=False)
+    args.update(kwargs)
+    return argparse.Namespace(**args)
+
+def make_roster(root, count: int = 5):
+    chars = {str(i): Character.create_new(str(i), f"Marine {i}") for i in range(count)}
+    chars["0"].inventory.add_item(Item(name="Flamethrower"))
+    CharacterStore(str(root / "players"), legacy_file=None).save(chars)
+    log = SessionLog("sulaco", root=str(root / "campaigns"))
+    log.record(SceneChanged("hangar", "Dropship prep"))
+    log.record(DamageTaken("0", 2, source="acid"))
+    log.close()
+
+# Export writes gzip when asked, and an import into empty storage restores everything
+def test_export_import_round_trip(tmp_path):
+    source, target = tmp_path / "source", tmp_path / "target"
+    make_roster(source)
+    backup = str(tmp_path / "backup.jsonl.gz")
+    assert bulk_io.export(make_args(source, output=backup)) == 0
+    with gzip.open(backup, "rb") as f:
+        assert len(f.read().splitlines()) == 7  # 5 characters and 2 events
+    assert bulk_io.import_(make_args(target, input=backup, workers=2)) == 0
+    chars = CharacterStore(str(target / "players"), legacy_file=None).load_all()
+    assert sorted(chars) == ["0", "1", "2", "3", "4"]
+    assert chars["0"].inventory.to_json() == ["Flamethrower (x1)"]
+    state = SessionLog("sulaco", root=str(target / "campaigns")).state
+    assert state.scene == "hangar" and state.characters["0"]["damage"] == 2
+    assert not os.path.exists(backup + bulk_io.PROGRESS_SUFFIX)
+
+# A run that fails part-way saves its progress, and the rerun resumes after it
+def test_import_resumes_after_failure(tmp_path, monkeypatch, capsys):
+    source, target = tmp_path / "source", tmp_path / "target"
+    make_roster(source)
+    backup = str(tmp_path / "backup.jsonl")
+    bulk_io.export(make_args(source, output=backup))
+    monkeypatch.setattr(bulk_io, "CHUNK_SIZE", 2)
+    real_import_batch = CharacterStore.import_batch
+    calls = []
+
+    def failing_import_batch(store, batch):
+        calls.append(sorted(batch))
+        return list(batch) if len(calls) == 2 else real_import_batch(store, batch)
+
+    monkeypatch.setattr(CharacterStore, "import_batch", failing_import_batch)
+    assert bulk_io.import_(make_args(target, input=backup)) == 1
+    assert bulk_io.read_progress(backup + bulk_io.PROGRESS_SUFFIX) == 2
+
+    monkeypatch.setattr(CharacterStore, "import_batch", real_import_batch)
+    assert bulk_io.import_(make_args(target, input=backup)) == 0
+    assert "Resuming" in capsys.readouterr().out
+    assert sorted(CharacterStore(str(target / "players"), legacy_file=None).load_all()) == ["0", "1", "2", "3", "4"]
+    assert SessionLog("sulaco", root=str(target / "campaigns")).state.seq == 2
+    assert not os.path.exists(backup + bulk_io.PROGRESS_SUFFIX)
+
+# Validation rebuilds characters through the model and reports bad lines instead of stopping
+def test_validate_chunk_reports_bad_lines():
+    results = bulk_io.validate_chunk([
+        (1, b'{"kind": "character", "id": "7", "data": {"Name": "Vasquez", "Gear": ["Smartgun"]}}'),
+        (2, b'{"kind": "character", "id": "8", "da'),
+        (3, b'{"kind": "mystery"}'),
+    ])
+    assert results[0][1]["data"]["Gear"] == ["Smartgun (x1)"] and results[0][2] is None
+    assert [error is not None for _, _, error in results] == [False, True, True]
@@ -0,0 +1,78 @@
+import sys
+import os
+import dataclasses
+import tracemalloc
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models import catalog
+from models.items import Item, ItemInstance, Inventory, make_item
+from models.weapon_item import WeaponItem
+
+# Every catalog module imports and contributes shared definitions
+def test_catalog_loads_all_modules():
+    defs = catalog.definitions()
+    assert isinstance(catalog.lookup("m4a3 service pistol"), WeaponItem)
+    assert len(defs) > 100
+
+# Stored gear strings resolve regardless of case, punctuation or quantity suffix
+def test_registry_resolves_gear_names():
+    registry = catalog.ItemRegistry()
+    pistol = registry.get("M4A3 Service Pistol")
+    assert registry.resolve("m4a3  service-pistol (x3)") is pistol
+    assert registry.resolve(".357 magnum revolver").name == ".357 Magnum Revolver"
+    assert registry.resolve("Lucky Coin") is None
+
+# Tag queries only import the categories that can answer them
+def test_registry_indexes_load_per_category():
+    registry = catalog.ItemRegistry()
+    pistols = registry.by_weapon_class("Pistol")
+    assert pistols and all(item.weapon_class == "pistol" for item in pistols)
+    assert registry.loaded_categories == ["weapons"]
+    assert any(item.name == "M3 Personnel Armor" for item in registry.by_slot("torso"))
+    assert "consumables" in registry.loaded_categories
+
+# Instances share one definition and round-trip through the saved format
+def test_instances_share_definition():
+    inventory = Inventory.from_json(["M4A3 Service Pistol (x2)", "Flashlight"])
+    pistol = inventory.get_item("M4A3 Service Pistol")
+    # Guns track their own reloads, so the stack loads as two copies
+    assert isinstance(pistol, ItemInstance) and pistol.quantity == 1 and len(inventory) == 3
+    assert pistol.definition is make_item("M4A3 Service Pistol").definition
+    assert pistol.damage == 1 and pistol.lore.startswith("This inexpensive")
+    assert isinstance(inventory.get_item("Flashlight"), Item)
+    assert inventory.to_json() == ["M4A3 Service Pistol (x1)", "M4A3 Service Pistol (x1)", "Flashlight (x1)"]
+    try:
+        pistol.damage = 5
+        assert False, "definition fields are read-only through an instance"
+    except AttributeError:
+        pass
+
+# An instance is several times smaller than even a slotted copy of its definition
+def test_instance_memory():
+    definition = catalog.lookup("M4A3 Service Pistol")
+
+    def per_item(make):
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        carried = [make(definition) for _ in range(2000)]
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        return (sum(s.size_diff for s in after.compare_to(before, "filename")) - sys.getsizeof(carried)) / len(carried)
+
+    assert per_item(ItemInstance) * 3 < per_item(dataclasses.replace)
+
+# Inventory totals follow every add and remove without rescanning
+def test_inventory_running_totals():
+    inventory = Inventory()
+    inventory.add_item(make_item("M4A3 Service Pistol"))
+    inventory.add_item(make_item("M4A3 Service Pistol"))
+    inventory.add_item(make_item("M3 Personnel Armor"))
+    inventory.add_item(Item(name="Lucky Coin", stackable=False))
+    inventory.add_item(Item(name="Lucky Coin", stackable=False))
+    assert inventory.count == 5 and len(inventory) == 5  # Pistols carry their own ammo, so never stack
+    assert inventory.encumbrance == 0.5 * 2 + 1.0
+    assert inventory.value == 200 * 2 + 1200
+    assert inventory.is_over_encumbered(1.5) and not inventory.is_over_encumbered(2)
+    inventory.remove_item("M4A3 Service Pistol")
+    inventory.remove_item("Lucky Coin")
+    assert inventory.count == 3 and inventory.encumbrance == 1.5 and inventory.value == 1400
+    assert [str(item) for item in inventory.items] == ["M4A3 Service Pistol (x1)", "M3 Personnel Armor (x1)", "Lucky Coin"]
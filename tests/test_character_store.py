@@ -0,0 +1,57 @@
+import sys
+import os
+import json
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models.character import Character
+from models.character_store import CharacterStore
+
+def make_store(tmp_path, legacy=None):
+    legacy_file = tmp_path / "characters.json"
+    if legacy is not None:
+        legacy_file.write_text(json.dumps(legacy))
+    return CharacterStore(str(tmp_path / "players"), str(legacy_file))
+
+# The legacy single file is split into per-player files on first load
+def test_migrates_legacy_file(tmp_path):
+    store = make_store(tmp_path, {"1": {"Name": "Ripley", "Career": "Roughneck"}, "2": {"Name": "Hicks"}})
+    chars = store.load_all()
+    assert set(chars) == {"1", "2"}
+    assert (tmp_path / "players" / "1.json").exists()
+    assert json.loads((tmp_path / "players" / "index.json").read_text())["1"]["Career"] == "Roughneck"
+
+# Only dirty characters are rewritten
+def test_save_writes_only_dirty(tmp_path):
+    store = make_store(tmp_path)
+    chars = {str(i): Character.create_new(str(i), f"Marine {i}") for i in range(3)}
+    assert store.save(chars) == 3
+    chars["1"].cash = 500
+    store.mark_dirty("1")
+    assert store.save(chars) == 1
+    assert store.save(chars) == 0
+    assert CharacterStore(str(tmp_path / "players")).load_all()["1"].cash == 500
+
+# Deleted characters lose their file and index entry
+def test_delete_removes_file(tmp_path):
+    store = make_store(tmp_path)
+    chars = {"7": Character.create_new("7", "Vasquez")}
+    store.save(chars)
+    del chars["7"]
+    store.save(chars)
+    assert not (tmp_path / "players" / "7.json").exists()
+    assert store.load_index() == {}
+
+# Delta reload re-parses only edited sheets and keeps the rest as-is
+def test_load_changed_reparses_only_edits(tmp_path):
+    store = make_store(tmp_path)
+    chars = {str(i): Character.create_new(str(i), f"Marine {i}") for i in range(3)}
+    store.save(chars)
+    current = store.load_all()
+    path = tmp_path / "players" / "1.json"
+    data = json.loads(path.read_text())
+    data["Cash"] = 1234
+    path.write_text(json.dumps(data))
+    os.utime(tmp_path / "players" / "2.json")  # Touched, content unchanged
+    reloaded, reparsed = store.load_changed(current)
+    assert reparsed == 1
+    assert reloaded["1"].cash == 1234
+    assert reloaded["0"] is current["0"] and reloaded["2"] is current["2"]
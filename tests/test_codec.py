@@ -0,0 +1,37 @@
+import sys
+import os
+import json
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models import codec
+from models.character import Character, Skills, iter_fields
+
+# Compact by default, indented only when asked
+def test_dumps_pretty_only_on_request():
+    data = {"Name": "Ripley", "Skills": {"Comtech": 2}}
+    assert b"\n" not in codec.dumps(data, pretty=False)
+    assert b"\n  " in codec.dumps(data, pretty=True)
+    assert codec.loads(codec.dumps(data)) == data
+
+# Generated decoders match keys case-insensitively and drop unknown ones
+def test_compiled_decoder_fallback():
+    decode = codec.compile_decoder(Skills, str.title)
+    assert decode({"COMTECH": 3, "Bogus": 9}) == Skills(comtech=3)
+    assert codec.compile_encoder(Skills, str.title)(Skills(medical_aid=1))["Medical_Aid"] == 1
+
+# The compiled Character codec round-trips the saved sheet format unchanged
+def test_character_round_trip_keeps_format():
+    with open(os.path.join(os.path.dirname(__file__), '..', 'characters.json')) as f:
+        legacy = json.load(f)
+    for char_id, data in legacy.items():
+        sheet = Character.from_json(char_id, data).to_json()
+        assert Character.from_json(char_id, sheet).to_json()["Skills"] == sheet["Skills"]
+        assert list(sheet) == ["Name", "Career", "Gender", "Age", "Attributes", "Skills", "Talent",
+                               "Agenda", "Gear", "Signature Item", "Cash", "Equipped", "Conditions", "Supplies",
+                               "Version"]
+
+# Slotted model classes still iterate their fields for display
+def test_iter_fields_on_slotted_skills():
+    skills = Skills(comtech=2)
+    assert not hasattr(skills, "__dict__")
+    assert dict(iter_fields(skills))["comtech"] == 2
+    assert [name for name, _ in iter_fields(skills)][:2] == ["heavy_machinery", "stamina"]
@@ -0,0 +1,80 @@
+import sys
+import os
+import random
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models import codec
+from models.combat_snapshots import CombatSnapshotStore, diff, apply_patch
+
+def combat_turns(count, seed=3):
+    rng = random.Random(seed)
+    state = {
+        "players": [{"id": "young", "hp": 6, "stress": 0}, {"id": "doc/medic", "hp": 4, "stress": 1}],
+        "enemies": [{"type": "xenomorph", "hp": 8, "status": ["aggressive"]}],
+        "scene": {"location": "airlock_bay", "features": ["low_gravity"],
+                  "grid": [["floor"] * 16 for _ in range(16)]},
+        "log": [],
+    }
+    for turn in range(1, count + 1):
+        state["turn"] = turn
+        rng.choice(state["players"])["stress"] += 1
+        state["enemies"][0]["hp"] = max(0, state["enemies"][0]["hp"] - rng.randint(0, 1))
+        state["log"].append(f"Turn {turn}: shots fired.")
+        if turn % 7 == 0:
+            state["scene"]["features"].insert(0, "fire")
+        if turn == 9:
+            del state["scene"]["location"]
+        yield turn, codec.loads(codec.dumps(state))
+
+# Applying a diff reproduces the new document exactly
+def test_diff_round_trip():
+    states = [s for _, s in combat_turns(30)]
+    for old, new in zip(states, states[1:]):
+        assert apply_patch(codec.loads(codec.dumps(old)), diff(old, new)) == new
+
+# Keyframes every N turns, deltas in between, and any turn can be loaded
+def test_random_access(tmp_path):
+    store = CombatSnapshotStore("enc1", root=str(tmp_path), keyframe_every=5)
+    saved = {}
+    for turn, state in combat_turns(23):
+        size = store.save_turn(turn, state)
+        saved[turn] = state
+        if turn % 5 != 1:
+            assert size < len(codec.dumps(state)) / 4
+    assert (tmp_path / "enc1" / "snapshot_turn_6.json").exists()
+    assert (tmp_path / "enc1" / "delta_turn_7.json").exists()
+    for turn in (1, 4, 6, 13, 23):
+        assert store.load_turn(turn) == saved[turn]
+    # A restarted bot carries on from the last saved turn
+    resumed = CombatSnapshotStore("enc1", root=str(tmp_path), keyframe_every=5)
+    assert resumed.load_turn(23) == saved[23]
+
+# Deltas left without a keyframe are set aside instead of breaking the reload
+def test_orphan_deltas_are_ignored(tmp_path):
+    store = CombatSnapshotStore("enc3", root=str(tmp_path), keyframe_every=5)
+    saved = {}
+    for turn, state in combat_turns(8):
+        store.save_turn(turn, state)
+        saved[turn] = state
+    (tmp_path / "enc3" / "snapshot_turn_1.json").unlink()
+    resumed = CombatSnapshotStore("enc3", root=str(tmp_path), keyframe_every=5)
+    assert resumed.turns() == [6, 7, 8]
+    assert resumed.load_turn(8) == saved[8]
+    assert (tmp_path / "enc3" / "orphan_delta_turn_2.json").exists()
+    (tmp_path / "enc3" / "snapshot_turn_6.json").unlink()
+    empty = CombatSnapshotStore("enc3", root=str(tmp_path), keyframe_every=5)
+    assert empty.turns() == []
+    empty.save_turn(1, saved[1])
+    assert empty.load_turn(1) == saved[1]
+
+# Ending the encounter bundles every turn into one compressed archive
+def test_end_encounter_archives(tmp_path):
+    saved = {}
+    with CombatSnapshotStore("enc2", root=str(tmp_path), keyframe_every=4) as store:
+        for turn, state in combat_turns(10):
+            store.save_turn(turn, state)
+            saved[turn] = state
+    assert not (tmp_path / "enc2").exists()
+    assert (tmp_path / "archive" / "enc2.json.gz").exists()
+    reopened = CombatSnapshotStore("enc2", root=str(tmp_path))
+    assert reopened.turns() == list(range(1, 11))
+    assert reopened.load_turn(7) == saved[7]
@@ -0,0 +1,47 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models.character import Character
+from models.items import make_item
+
+def marine() -> Character:
+    char = Character.create_new("1", "Vasquez")
+    char.skills.survival = 1
+    char.skills.medical_aid = 1
+    char.inventory.add_item(make_item("Weyland-Yutani APEsuit"))
+    char.inventory.add_item(make_item("Personal Medkit"))
+    char.inventory.add_item(make_item("Ghillie Suit"))
+    return char
+
+# Equipped gear and conditions feed the effective pools; carried gear does not
+def test_pools_include_equipment_and_conditions():
+    char = marine()
+    assert char.stats.pool("Survival") == 2 + 1
+    assert char.equip("Weyland-Yutani APEsuit") and char.equip("Personal Medkit")
+    assert not char.equip("Flashlight")
+    stats = char.stats
+    assert stats.pool("SURVIVAL") == 2 + 1 + 3
+    assert stats.pool("medical_aid") == 2 + 1 + 2
+    assert char.unequip("Weyland-Yutani APEsuit") and char.equip("Ghillie Suit")
+    assert char.stats.situational["mobility"][0][:1] == (2,)
+    assert char.stats.pool("mobility") == 2  # Situational bonuses are left to the GM
+    assert char.unequip("Ghillie Suit") and char.equip("Weyland-Yutani APEsuit")
+    char.add_condition("Drunk", {"WITS": -1})
+    assert char.stats.attributes["wits"] == 1 and char.stats.pool("survival") == 1 + 1 + 3
+
+# The cached stats are reused until something they depend on changes
+def test_stats_cache_invalidation():
+    char = marine()
+    char.equip("Personal Medkit")
+    first = char.stats
+    assert char.stats is first
+    char.cash += 100
+    char.inventory.add_item(make_item("Flashlight"))
+    assert char.stats is first
+    char.attributes.empathy = 4
+    assert char.stats is not first and char.stats.pool("medical_aid") == 4 + 1 + 2
+    second = char.stats
+    char.inventory.remove_item("Personal Medkit")
+    assert char.stats is not second and char.stats.pool("medical_aid") == 4 + 1
+    restored = Character.from_json("1", char.to_json())
+    assert restored.equipped == ["Personal Medkit"] and restored.conditions == {}
@@ -0,0 +1,61 @@
+import sys
+import os
+import json
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models.gear_spec import compile_starting_gear, parse_gear
+from models.item_search import build_item_index
+from models.items import Item, ItemInstance, ConsumableItem
+
+# Dice, counts and catalog names are worked out once per gear string
+def test_parse_gear():
+    doses = parse_gear("1d6 doses of Neversleep pills")
+    assert (doses.name, doses.quantity_dice, doses.category, doses.consumable) == ("Neversleep Pills", "1d6", "consumable", True)
+    assert 1 <= doses.make().quantity <= 6 and isinstance(doses.make(), ItemInstance)
+    assert parse_gear("D6 doses experimental X-Drugs").quantity_dice == "1d6"
+    grenades = parse_gear("2 G2 Electroshock Grenades")
+    assert (grenades.name, grenades.quantity, grenades.is_weapon) == ("G2 Electroshock Grenade", 2, True)
+    assert parse_gear("Deck of cards").category == "gear"
+    assert parse_gear("Laser rifle").is_weapon  # Unknown gear falls back to keywords
+
+# Each career's menu is compiled from playerGenData, shortened names included
+def test_compile_starting_gear():
+    with open(os.path.join(os.path.dirname(__file__), '..', 'data', 'playerGenData.json')) as f:
+        playergen = json.load(f)
+    table = compile_starting_gear(playergen, build_item_index(playergen))
+    marine = table["Colonial Marine"]
+    assert [spec.text for spec in marine] == playergen["Careers"]["Colonial Marine"]["starting_gear"]
+    assert marine[0].name == "Armat M41A Pulse Rifle" and marine[0].is_weapon
+
+# The one-weapon rule allows the same gear pairs as it always has, career by career
+def test_one_weapon_rule_per_career():
+    with open(os.path.join(os.path.dirname(__file__), '..', 'data', 'playerGenData.json')) as f:
+        playergen = json.load(f)
+    table = compile_starting_gear(playergen, build_item_index(playergen))
+    limited = {career: [spec.text for spec in specs if spec.counts_as_weapon] for career, specs in table.items()}
+    assert limited == {
+        "Colonial Marine": ["M41A Pulse Rifle", "M56A2 Smart Gun"],
+        "Colonial Marshal": [], "Company Agent": ["M4A3 Service Pistol"], "Entertainer": [], "Kid": [],
+        "Medic": [], "Officer": ["M4A3 Service Pistol", "Rexim RXF-M5 EVA Pistol"], "Pilot": ["M4A3 Service Pistol"],
+        "Roughneck": ["Watatsumi DV-303 Bolt Gun"], "Scientist": [], "Wildcatter": ["M72 Starshell Flare Pistol"],
+    }
+
+    def allowed(career, first, second):
+        specs = {spec.text: spec for spec in table[career]}
+        return not (specs[first].counts_as_weapon and specs[second].counts_as_weapon)
+
+    assert not allowed("Colonial Marine", "M41A Pulse Rifle", "M56A2 Smart Gun")
+    # Catalog weapons outside the keyword rule still pair up, as before
+    assert allowed("Colonial Marine", "M41A Pulse Rifle", "2 G2 Electroshock Grenades")
+    assert allowed("Colonial Marshal", ".357 Magnum Revolver", "Armat Model 37A2 12-Gauge Pump-Action")
+    assert allowed("Colonial Marshal", ".357 Magnum Revolver", "Stun baton")
+    assert allowed("Roughneck", "Mechanical Cutting Torch", "Watatsumi DV-303 Bolt Gun")
+    assert not allowed("Officer", "M4A3 Service Pistol", "Rexim RXF-M5 EVA Pistol")
+
+# Saved sheets with dice gear load through the same parser
+def test_from_json_uses_gear_specs():
+    loaded = Item.from_json("1d6 doses Hydr8tion")[0]
+    assert loaded.name == "Hydr8tion" and loaded.quantity == 1 and 1 <= loaded.uses <= 6
+    assert isinstance(Item.from_json("1d6 doses Unknown Tonic")[0], ConsumableItem)
+    # Other saved names are taken as written, however they start
+    assert [(item.name, item.quantity) for item in Item.from_json("D20 Dice Set") + Item.from_json("2 Person Tent")] \
+        == [("D20 Dice Set", 1), ("2 Person Tent", 1)]
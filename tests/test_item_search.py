@@ -0,0 +1,33 @@
+import sys
+import os
+import json
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models.item_search import build_item_index, trigrams
+
+PLAYERGEN = os.path.join(os.path.dirname(__file__), '..', 'data', 'playerGenData.json')
+
+def load_index():
+    with open(PLAYERGEN) as f:
+        return build_item_index(json.load(f))
+
+# Partial names, nicknames and typos rank the intended item first
+def test_ranked_matches():
+    index = load_index()
+    assert index.search("M41A")[0][0] == "Armat M41A Pulse Rifle"
+    assert index.search("pulse rifle")[0][0] == "Armat M41A Pulse Rifle"
+    assert index.search("medkit")[0][0] == "Personal Medkit"
+    assert index.search("flashlite")[0][0] == "Hi-beam Flashlight"
+    # Starting gear with no catalog entry is still offered as written
+    assert index.search("deck of")[0][0] == "Deck of cards"
+    assert len(index.search("a")) <= 25
+    assert trigrams("M41A") == {"  m", " m4", "m41", "41a", "1a "}
+
+# Lookups stay far inside Discord's autocomplete window
+def test_search_is_fast():
+    index = load_index()
+    queries = ["m4", "pulse", "smart gun", "neversleep", "armor", "grenade launcher", "x"] * 30
+    start = time.perf_counter()
+    for query in queries:
+        index.search(query)
+    assert (time.perf_counter() - start) / len(queries) < 0.005
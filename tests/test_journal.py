@@ -0,0 +1,46 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models.character import Character
+from models.character_store import CharacterStore
+from models.journal import Journal
+
+# Background saves only append to the journal until a checkpoint
+def test_write_pending_appends_to_journal(tmp_path):
+    store = CharacterStore(str(tmp_path), None, checkpoint_every=3)
+    chars = {"1": Character.create_new("1", "Dallas")}
+    store.write_pending(store.take_pending(chars))
+    assert not (tmp_path / "1.json").exists()
+    assert store.journal.records_since_checkpoint == 1
+    chars["2"] = Character.create_new("2", "Kane")
+    chars["3"] = Character.create_new("3", "Lambert")
+    store.write_pending(store.take_pending(chars))
+    # Third record triggers a checkpoint into the player files
+    assert (tmp_path / "1.json").exists()
+    assert store.journal.records_since_checkpoint == 0
+
+# A crash after commit is recovered by replaying the journal tail
+def test_recovers_uncheckpointed_changes(tmp_path):
+    store = CharacterStore(str(tmp_path), None)
+    chars = {"1": Character.create_new("1", "Parker"), "2": Character.create_new("2", "Brett")}
+    store.save(chars)
+    chars["1"].cash = 250
+    store.mark_dirty("1")
+    del chars["2"]
+    store.write_pending(store.take_pending(chars))
+    # Simulate a torn append from the crash itself
+    with open(tmp_path / "journal.jsonl", "a") as f:
+        f.write('{"seq": 99, "op": "put", "id": "3"')
+    recovered = CharacterStore(str(tmp_path), None).load_all()
+    assert set(recovered) == {"1"}
+    assert recovered["1"].cash == 250
+
+# Records folded into a checkpoint are never replayed
+def test_checkpoint_skips_old_records(tmp_path):
+    journal = Journal(str(tmp_path))
+    journal.append("put", "1", {"Name": "Ash"})
+    journal.commit()
+    journal.checkpoint()
+    journal.append("delete", "1")
+    journal.commit()
+    assert [r["op"] for r in Journal(str(tmp_path)).replay()] == ["delete"]
@@ -0,0 +1,30 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models.character import Character
+from models.items import make_item
+from models import loadout
+
+# Pieces on the same layer and slot conflict; other layers and slots stack
+def test_equip_rejects_overlapping_armor():
+    char = Character.create_new("1", "Hicks")
+    for name in ("M3 Personnel Armor", "Kevlar Riot Vest", "Battledress Utilities (BDUs)", "M10 Ballistic Helmet"):
+        char.inventory.add_item(make_item(name))
+    assert char.equip("M3 Personnel Armor")
+    assert loadout.conflicts(char, "Kevlar Riot Vest") == ["M3 Personnel Armor"]
+    assert not char.equip("Kevlar Riot Vest")
+    assert char.equip("Battledress Utilities (BDUs)")  # Layer 0 under the armor
+    assert char.equip("M10 Ballistic Helmet")
+    assert char.equipped == ["M3 Personnel Armor", "Battledress Utilities (BDUs)", "M10 Ballistic Helmet"]
+
+# The optimizer picks the best-rated compatible set that fits the weight limit
+def test_best_loadout():
+    items = [make_item(name) for name in (
+        "M3 Personnel Armor", "Kevlar Riot Vest", "6B90 Combat Armor",
+        "Armat CM4 Plastisteel Riot Shield", "IRC Mk.35 Pressure Suit")]
+    unlimited = loadout.best_loadout(items)
+    assert unlimited.armor_rating == 6 + 5 and set(unlimited.items) == {"M3 Personnel Armor", "Armat CM4 Plastisteel Riot Shield"}
+    assert unlimited.encumbrance == 2.0
+    light = loadout.best_loadout(items, max_encumbrance=1.0)
+    assert light.items == ("M3 Personnel Armor",) and light.armor_rating == 6
+    assert loadout.best_loadout(items, max_encumbrance=0).items == ()
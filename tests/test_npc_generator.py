@@ -0,0 +1,38 @@
+import sys
+import os
+import json
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models.character import Character
+from models.npc_generator import NPCGenerator, ATTRIBUTE_POINTS, SKILL_POINTS
+
+def load_playergen():
+    with open(os.path.join(os.path.dirname(__file__), '..', 'data', 'playerGenData.json')) as f:
+        return json.load(f)
+
+# Every generated NPC follows the character creation rules for its career
+def test_generated_npcs_follow_creation_rules():
+    playergen = load_playergen()
+    batch = NPCGenerator(playergen, seed=7).generate(500)
+    assert len(batch) == 500
+    for npc in batch:
+        career = playergen["Careers"][npc.career]
+        attrs = {name: getattr(npc.attributes, name) for name in npc.attributes.__slots__}
+        key = career["key_attribute"].lower()
+        assert sum(attrs.values()) == 8 + ATTRIBUTE_POINTS
+        assert all(2 <= v <= (5 if name == key else 4) for name, v in attrs.items())
+        skills = {name: getattr(npc.skills, name) for name in npc.skills.__slots__}
+        key_skills = {s.lower().replace(" ", "_") for s in career["key_skills"]}
+        assert sum(skills.values()) == SKILL_POINTS
+        assert all(v <= (3 if name in key_skills else 1) for name, v in skills.items())
+        assert npc.talent in career["talents"] and npc.agenda in career["personal_agendas"]
+        assert npc.signature_item in career["signature_items"]
+        assert len(npc.inventory) == 2 and npc.cash > 0
+
+# Batches stay compact until an NPC is asked for; its sheet then round-trips
+def test_batch_builds_sheets_on_demand():
+    batch = NPCGenerator(load_playergen(), seed=1).generate(100, careers=["Kid"])
+    assert set(batch.career) == {batch.career[0]}
+    assert batch[-1].id == "npc-99"
+    sheet = batch.to_json(3)
+    assert Character.from_json("npc-3", sheet).to_json() == sheet
+    assert NPCGenerator(load_playergen(), seed=1).generate(100, careers=["Kid"]).to_json(3) == sheet
@@ -0,0 +1,31 @@
+import sys
+import os
+import asyncio
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models.character import Character
+from models.character_store import CharacterStore
+from models.persistence import PersistenceWorker
+
+# A burst of changes is coalesced into one background write
+def test_burst_coalesces_into_one_write(tmp_path):
+    store = CharacterStore(str(tmp_path / "players"), None)
+    chars = {}
+    worker = PersistenceWorker(lambda: store.take_pending(chars), store.write_pending,
+                               store.mark_all_dirty, debounce=0.05)
+
+    async def scenario():
+        worker.start()
+        for i in range(20):
+            chars[str(i)] = Character.create_new(str(i), f"Colonist {i}")
+            store.mark_dirty(str(i))
+            worker.mark_dirty()
+        await asyncio.sleep(0.2)
+        assert worker.writes == 1
+        chars["3"].cash = 99
+        store.mark_dirty("3")
+        await worker.stop()  # Flushes without waiting for the debounce
+
+    asyncio.run(scenario())
+    reloaded = CharacterStore(str(tmp_path / "players")).load_all()
+    assert len(reloaded) == 20
+    assert reloaded["3"].cash == 99
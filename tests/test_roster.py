@@ -0,0 +1,53 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models.character import Character
+from models.character_store import CharacterStore
+from models.sqlite_store import SqliteCharacterStore
+from models.roster import LazyCharacterMap
+
+def seed(store, count):
+    store.save({str(i): Character.create_new(str(i), f"Marine {i}") for i in range(count)})
+
+# Startup reads only the index; sheets are parsed on access and evicted by LRU
+def test_hydrates_on_access(tmp_path):
+    seed(CharacterStore(str(tmp_path / "players")), 10)
+    store = CharacterStore(str(tmp_path / "players"))
+    roster = LazyCharacterMap(store, store.load_roster(), capacity=3)
+    assert len(roster) == 10 and "7" in roster and roster.loads == 0
+    assert roster["7"].name == "Marine 7"
+    for i in range(5):
+        roster[str(i)]
+    assert roster.loads == 6
+    assert set(roster.cached()) == {"2", "3", "4"}
+
+# Unsaved characters are never evicted, and saves go through the map
+def test_pending_characters_stay_cached(tmp_path):
+    store = SqliteCharacterStore(str(tmp_path / "test.db"))
+    seed(store, 5)
+    roster = LazyCharacterMap(store, store.load_roster(), capacity=2)
+    roster["0"].cash = 999
+    store.mark_dirty("0")
+    for i in range(1, 5):
+        roster[str(i)]
+    assert "0" in roster.cached()
+    roster["9"] = Character.create_new("9", "Bishop")
+    store.mark_dirty("9")
+    del roster["1"]
+    store.mark_dirty("1")
+    assert store.save(roster) == 3
+    assert store.load("0").cash == 999
+    assert set(store.load_index()) == {"0", "2", "3", "4", "9"}
+
+# Deleting never parses the sheet, so even an unreadable one can be removed
+def test_discard_skips_loading(tmp_path):
+    store = CharacterStore(str(tmp_path / "players"))
+    seed(store, 3)
+    with open(store.path_for("1"), "w") as f:
+        f.write("{not json")
+    roster = LazyCharacterMap(store, store.load_roster())
+    assert roster.discard("1") and not roster.discard("1")
+    assert "1" not in roster and roster.loads == 0
+    store.mark_dirty("1")
+    store.save(roster)
+    assert set(store.load_index()) == {"0", "2"}
@@ -0,0 +1,92 @@
+import sys
+import os
+import json
+import asyncio
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models.character import Character
+from models.character_store import CharacterStore
+from models.persistence import PersistenceWorker
+from models.roster import LazyCharacterMap
+from models.schema import SchemaSweeper, SCHEMA_VERSION, migrate
+
+V1_SHEET = {"Name": "Parker", "Career": "Roughneck", "Cash": 50,
+            "Gear": ["Cutting Torch (x1) (x1) (x1)", "Flashlight (x1) (x2)", "Wrench", {"Maintenance Jack": 1}]}
+
+def write_v1(players_dir, count):
+    os.makedirs(players_dir, exist_ok=True)
+    index = {}
+    for i in range(count):
+        with open(os.path.join(players_dir, f"{i}.json"), "w") as f:
+            json.dump(V1_SHEET, f)
+        index[str(i)] = {"Name": "Parker", "Career": "Roughneck"}
+    with open(os.path.join(players_dir, "index.json"), "w") as f:
+        json.dump(index, f)
+
+# v1 gear loses its repeated quantity suffixes and then round-trips unchanged
+def test_v1_gear_is_normalized():
+    sheet = migrate(V1_SHEET)
+    assert sheet["Gear"] == ["Cutting Torch (x1)", "Flashlight (x2)", "Wrench", "Maintenance Jack"]
+    assert sheet["Version"] == SCHEMA_VERSION and "Version" not in V1_SHEET
+    saved = Character.from_json("1", V1_SHEET).to_json()
+    assert Character.from_json("1", saved).to_json() == saved
+    assert saved["Gear"][:2] == ["Cutting Torch (x1)", "Flashlight (x2)"]
+
+# Sheets upgraded on read are written back by the next save
+def test_upgraded_on_read_is_written_back(tmp_path):
+    players = str(tmp_path / "players")
+    write_v1(players, 2)
+    store = CharacterStore(players)
+    chars = {"0": store.load("0")}
+    assert store.is_pending("0") and not store.is_pending("1")
+    chars["1"] = store.load("1")
+    assert store.save(chars) == 2
+    with open(os.path.join(players, "0.json")) as f:
+        assert json.load(f)["Version"] == SCHEMA_VERSION
+
+# The sweeper upgrades cold sheets and leaves loaded ones to the save path
+def test_sweeper_upgrades_cold_sheets(tmp_path):
+    players = str(tmp_path / "players")
+    write_v1(players, 5)
+    store = CharacterStore(players)
+    roster = LazyCharacterMap(store, store.load_roster())
+    roster["2"].cash = 75  # Loaded, so the sweeper must not overwrite it
+    store.mark_dirty("2")
+    worker = PersistenceWorker(lambda: store.take_pending(roster), store.write_pending)
+    sweeper = SchemaSweeper(store, worker, roster.is_loaded, interval=0)
+    asyncio.run(sweeper.run())
+    assert sweeper.upgraded == 4
+    store.checkpoint()
+    sheets = []
+    for i in range(5):
+        with open(os.path.join(players, f"{i}.json")) as f:
+            sheets.append(json.load(f))
+    assert all(sheet["Version"] == SCHEMA_VERSION for sheet in sheets)
+    assert sheets[2]["Cash"] == 75
+
+# A sheet upgraded on read schedules its own save, then becomes evictable again
+def test_upgrade_on_read_schedules_save(tmp_path):
+    players = str(tmp_path / "players")
+    write_v1(players, 3)
+    store = CharacterStore(players)
+    roster = LazyCharacterMap(store, store.load_roster(), capacity=1)
+
+    async def main():
+        worker = PersistenceWorker(lambda: store.take_pending(roster), store.write_pending, debounce=0)
+        store.on_migrated = worker.mark_dirty
+        worker.start()
+        roster["0"]
+        await asyncio.to_thread(lambda: roster["1"])  # Reads off the event loop schedule it too
+        assert store.is_pending("0") and set(roster.cached()) == {"0", "1"}
+        for _ in range(100):
+            if not store.is_pending("0") and not store.is_pending("1"):
+                break
+            await asyncio.sleep(0.01)
+        assert not store.is_pending("0") and not store.is_pending("1")  # Written without an explicit save
+        await worker.stop()
+
+    asyncio.run(main())
+    roster["2"]
+    assert len(roster.cached()) == 1
+    store.checkpoint()
+    with open(os.path.join(players, "1.json")) as f:
+        assert json.load(f)["Version"] == SCHEMA_VERSION
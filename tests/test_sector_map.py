@@ -0,0 +1,52 @@
+import sys
+import os
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models import worldbuilding
+from models.sector_map import SectorMapRenderer, ColorMode
+
+def make_renderer(tmp_path):
+    renderer = SectorMapRenderer(cache_dir=str(tmp_path), tile_size=64)
+    renderer.add_systems(worldbuilding.generate_sector(0, 0, 20, seed=3))
+    return renderer
+
+# Tiles only contain systems inside their bounds
+def test_systems_in_tile(tmp_path):
+    renderer = make_renderer(tmp_path)
+    assert len(renderer.systems_in_tile(0, 0, 0)) == 20
+    quarters = sum(len(renderer.systems_in_tile(1, tx, ty)) for tx in (0, 1) for ty in (0, 1))
+    assert quarters == 20
+    assert renderer.systems_in_tile(0, 5, 5) == []
+
+# The tile hash only changes when a system on the tile changes
+def test_tile_hash_tracks_changes(tmp_path):
+    renderer = make_renderer(tmp_path)
+    before = renderer.tile_hash(0, 0, 0, ColorMode.EXPLORATION)
+    assert renderer.tile_hash(0, 0, 0, ColorMode.EXPLORATION) == before
+    assert renderer.tile_hash(0, 0, 0, ColorMode.ALLEGIANCE) != before
+    next(iter(renderer.systems.values())).touch()
+    assert renderer.tile_hash(0, 0, 0, ColorMode.EXPLORATION) != before
+
+# A system moved to another sector is re-bucketed, not left behind
+def test_moved_system_is_rebucketed(tmp_path):
+    renderer = make_renderer(tmp_path)
+    before = renderer.tile_hash(0, 0, 0, ColorMode.EXPLORATION)
+    system = next(iter(renderer.systems.values()))
+    system.x += worldbuilding.SECTOR_SIZE_LY * 2
+    renderer.add_systems([system])
+    assert system not in renderer.systems_in_tile(0, 0, 0)
+    assert renderer.systems_in_tile(0, 2, 0) == [system]
+    assert len(renderer.systems_in_tile(0, 0, 0)) == 19
+    assert renderer.tile_hash(0, 0, 0, ColorMode.EXPLORATION) != before
+
+# Rendered tiles are reused from disk until they change
+def test_render_tile_cached(tmp_path):
+    pytest.importorskip("PIL")
+    renderer = make_renderer(tmp_path)
+    path = renderer.render_tile(0, 0, 0)
+    mtime = os.path.getmtime(path)
+    assert renderer.render_tile(0, 0, 0) == path
+    assert os.path.getmtime(path) == mtime
+    next(iter(renderer.systems.values())).touch()
+    new_path = renderer.render_tile(0, 0, 0)
+    assert new_path != path and not os.path.exists(path)
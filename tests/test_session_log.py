@@ -0,0 +1,86 @@
+import sys
+import os
+import time
+import pytest
+from dataclasses import dataclass
+from typing import ClassVar
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models.session_log import SessionLog, GameEvent, DamageTaken, StressChanged, ItemUsed, SceneChanged
+
+# Events fold into the materialized state
+def test_events_update_state(tmp_path):
+    log = SessionLog("nostromo", root=str(tmp_path))
+    log.record(SceneChanged("galley", "Dinner before the chestburster"))
+    log.record(DamageTaken("kane", 2, source="facehugger"))
+    log.record(StressChanged("lambert", 3))
+    log.record(StressChanged("lambert", -5))
+    log.record(ItemUsed("ripley", "Flamethrower"))
+    state = log.state
+    assert state.scene == "galley"
+    assert state.characters["kane"]["damage"] == 2
+    assert state.characters["lambert"]["stress"] == 0
+    assert state.characters["ripley"]["items_used"] == {"Flamethrower": 1}
+    assert state.seq == 5 and len(state.recent) == 5
+
+# Reopening loads the snapshot and replays only newer events
+def test_reopen_replays_only_tail(tmp_path):
+    log = SessionLog("sulaco", root=str(tmp_path), snapshot_every=1000)
+    for i in range(2500):
+        log.record(StressChanged("hudson", 1))
+    log.close()
+    start = time.perf_counter()
+    reopened = SessionLog("sulaco", root=str(tmp_path), snapshot_every=1000)
+    assert time.perf_counter() - start < 0.5
+    assert reopened.replayed == 500
+    assert reopened.state.characters["hudson"]["stress"] == 2500
+    assert [seq for seq, _ in reopened.events(after_seq=2498)] == [2499, 2500]
+
+# A torn final line from a crash is dropped and the log stays appendable
+def test_torn_tail_is_dropped(tmp_path):
+    log = SessionLog("hadley", root=str(tmp_path))
+    log.record(DamageTaken("newt", 1))
+    log.close()
+    with open(tmp_path / "hadley" / "events.jsonl", "ab") as f:
+        f.write(b'{"seq": 2, "type": "dam')
+    reopened = SessionLog("hadley", root=str(tmp_path))
+    assert reopened.record(DamageTaken("newt", 1)) == 2
+    reopened.close()
+    assert SessionLog("hadley", root=str(tmp_path)).state.characters["newt"]["damage"] == 2
+
+# History reads stop at a torn final line instead of failing
+def test_records_skip_torn_tail(tmp_path):
+    log = SessionLog("gateway", root=str(tmp_path))
+    log.record(DamageTaken("ripley", 1))
+    with open(tmp_path / "gateway" / "events.jsonl", "ab") as f:
+        f.write(b'{"seq": 2, "type": "dam')
+    assert [seq for seq, _ in log.events()] == [1]
+
+# An event type without apply() fails when created, not during replay
+def test_event_without_apply_is_rejected():
+    @dataclass
+    class Forgetful(GameEvent):
+        TYPE: ClassVar[str] = "test_forgetful"
+        character_id: str
+
+    with pytest.raises(TypeError):
+        Forgetful("bishop")
+
+# A bad complete line mid-log is set aside; nothing after it is lost or truncated
+def test_corrupt_middle_line_is_skipped(tmp_path):
+    log = SessionLog("fiorina", root=str(tmp_path))
+    for _ in range(10):
+        log.record(StressChanged("ripley", 1))
+    log.close()
+    path = tmp_path / "fiorina" / "events.jsonl"
+    lines = path.read_bytes().splitlines(keepends=True)
+    lines[3] = lines[3].replace(b'"stress"', b'"mystery"')
+    path.write_bytes(b"".join(lines))
+    size = path.stat().st_size
+    for _ in range(2):  # Reopening again neither truncates nor re-records the reject
+        reopened = SessionLog("fiorina", root=str(tmp_path))
+        assert reopened.rejected == 1 and reopened.state.seq == 10
+        assert reopened.state.characters["ripley"]["stress"] == 9
+        reopened.close()
+    assert path.stat().st_size == size
+    assert len((tmp_path / "fiorina" / "rejected.jsonl").read_bytes().splitlines()) == 1
+    assert [seq for seq, _ in SessionLog("fiorina", root=str(tmp_path)).events()] == [1, 2, 3, 5, 6, 7, 8, 9, 10]
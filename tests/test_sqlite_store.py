@@ -0,0 +1,74 @@
+import sys
+import os
+import json
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models.character import Character
+from models.items import Item, make_item
+from models.sqlite_store import SqliteCharacterStore
+
+# Sheets survive a round trip through the normalized tables
+def test_round_trip(tmp_path):
+    db = str(tmp_path / "game.db")
+    store = SqliteCharacterStore(db)
+    char = Character.create_new("1", "Ripley")
+    char.skills.heavy_machinery = 3
+    char.inventory.add_item(Item(name="Flamethrower"))
+    char.equip("Flamethrower")
+    char.add_condition("Exhausted", {"STAMINA": -1})
+    char.inventory.add_item(make_item("IRC Mk.35 Pressure Suit"))
+    char.inventory.get_item("IRC Mk.35 Pressure Suit").air = 2
+    store.save({"1": char})
+    loaded = SqliteCharacterStore(db).load_all()["1"].to_json()
+    expected = char.to_json()
+    assert loaded["Skills"] == expected["Skills"]
+    assert loaded["Attributes"] == expected["Attributes"]
+    assert loaded["Gear"] == expected["Gear"] == ["Flamethrower (x1)", "IRC Mk.35 Pressure Suit (x1)"]
+    assert loaded["Equipped"] == ["Flamethrower"]
+    assert loaded["Conditions"] == {"Exhausted": {"STAMINA": -1}}
+    assert loaded["Supplies"] == {"1": {"air": 2}}
+
+# Deleting a character removes its skills and inventory rows too
+def test_delete_cascades(tmp_path):
+    store = SqliteCharacterStore(str(tmp_path / "game.db"))
+    chars = {"1": Character.create_new("1", "Bishop")}
+    chars["1"].inventory.add_item(Item(name="Knife"))
+    store.save(chars)
+    del chars["1"]
+    store.save(chars)
+    assert store.conn.execute("SELECT COUNT(*) FROM inventory_items").fetchone()[0] == 0
+    assert store.load_index() == {}
+
+# The legacy characters.json is imported into an empty database
+def test_migrates_legacy_file(tmp_path):
+    legacy = tmp_path / "characters.json"
+    legacy.write_text(json.dumps({"9": {"Name": "Hudson", "Career": "Colonial Marine", "Gear": ["M41A Pulse Rifle"]}}))
+    chars = SqliteCharacterStore(str(tmp_path / "game.db"), str(legacy)).load_all()
+    assert chars["9"].career == "Colonial Marine"
+    assert chars["9"].inventory.items[0].name == "M41A Pulse Rifle"
+
+# Session state is kept per campaign
+def test_session_state(tmp_path):
+    store = SqliteCharacterStore(str(tmp_path / "game.db"))
+    store.set_session_state("nostromo", {"turn": 3, "scene": "galley"})
+    assert store.get_session_state("nostromo") == {"turn": 3, "scene": "galley"}
+    assert store.get_session_state("sulaco") == {}
+
+# Delta reload re-parses only rows whose trigger-maintained revision changed
+def test_load_changed_reparses_only_edits(tmp_path):
+    store = SqliteCharacterStore(str(tmp_path / "game.db"))
+    store.save({str(i): Character.create_new(str(i), f"Marine {i}") for i in range(3)})
+    current = store.load_all()
+    with store.conn:
+        store.conn.execute("UPDATE characters SET cash = 50 WHERE id = '2'")
+    reloaded, reparsed = store.load_changed(current)
+    assert reparsed == 1
+    assert reloaded["2"].cash == 50
+    assert reloaded["0"] is current["0"]
+
+# Streaming export yields the same sheets as the bulk table scan
+def test_iter_data_matches_bulk_load(tmp_path):
+    store = SqliteCharacterStore(str(tmp_path / "test.db"))
+    chars = {str(i): Character.create_new(str(i), f"Marine {i}") for i in range(12)}
+    chars["3"].skills.mobility = 2
+    store.save(chars)
+    assert dict(store.iter_data()) == store.load_all_data()
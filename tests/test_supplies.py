@@ -0,0 +1,61 @@
+import sys
+import os
+import random
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models.character import Character
+from models.items import make_item
+from models import items
+from models import supplies
+
+# The exact chain matches the closed forms where they exist
+def test_forecasts_are_exact():
+    single = supplies.supply_forecast(1)
+    assert abs(single.expected - 6) < 1e-9  # One die: geometric with p = 1/6
+    assert abs(single.by(1) - 1 / 6) < 1e-12 and single.likely() == 4
+    assert supplies.supply_forecast(4).expected > supplies.supply_forecast(2).expected
+    assert supplies.supply_forecast(3) is supplies.supply_forecast(3)  # Cached
+    ammo = supplies.ammo_forecast(2, 3)
+    assert abs(ammo.expected - 2 / (1 - (5 / 6) ** 3)) < 1e-9
+    party = supplies.party_forecast([single, single])
+    assert abs(party.expected - 36 / 11) < 1e-4  # Min of two geometrics: p = 11/36
+
+# Live ratings live on the carried instance and drive the GM warning
+def test_live_supply_and_warning():
+    char = Character.create_new("1", "Ripley")
+    char.inventory.add_item(make_item("IRC Mk.35 Pressure Suit"))
+    char.equip("IRC Mk.35 Pressure Suit")
+    suit = char.inventory.get_item("IRC Mk.35 Pressure Suit")
+    assert supplies.supplies(suit) == {"air": 4}
+    assert supplies.warnings(char) == []
+    rng = random.Random(7)
+    while suit.air > 1:
+        supplies.roll_supply(suit, "air", rng)
+    assert supplies.warnings(char) == ["Your O2 in the IRC Mk.35 Pressure Suit will likely run out in 4 shifts."]
+    assert make_item("IRC Mk.35 Pressure Suit").air == 4  # Other copies are untouched
+
+# Live ratings are saved with the sheet, and suits with their own air never stack
+def test_live_supply_survives_save():
+    char = Character.create_new("1", "Ripley")
+    char.inventory.add_item(make_item("IRC Mk.35 Pressure Suit"))
+    char.inventory.add_item(make_item("IRC Mk.35 Pressure Suit"))
+    first, second = char.inventory.items
+    assert first is not second and len(char.inventory) == 2
+    first.air = 1
+    sheet = char.to_json()
+    assert sheet["Supplies"] == {"0": {"air": 1}, "1": {"air": 4}}
+    restored = Character.from_json("1", sheet)
+    assert [suit.air for suit in restored.inventory] == [1, 4]
+    assert restored.to_json() == sheet
+    # An old stacked entry is split into separate suits on load
+    assert [suit.quantity for suit in Character.from_json("1", {"Gear": ["IRC Mk.35 Pressure Suit (x2)"]}).inventory] == [1, 1]
+
+# Catalog guns start with reloads to spend; anything without ammo is left alone
+def test_weapons_start_with_reloads():
+    rifle = make_item("Armat M41A Pulse Rifle")
+    assert rifle.ammo == items.STARTING_RELOADS
+    rng = random.Random(1)
+    while supplies.roll_ammo(rifle, 6, rng) is False:
+        pass
+    assert rifle.ammo == items.STARTING_RELOADS - 1
+    suit = make_item("IRC Mk.35 Pressure Suit")
+    assert suit.ammo is None and not supplies.roll_ammo(suit, 6, rng) and suit.ammo is None
@@ -0,0 +1,39 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models import worldbuilding
+from models.system_renderer import SystemRenderer, DetailLevel, paginate, DISCORD_MESSAGE_LIMIT
+
+# Structured star system generation
+def test_generate_star_system():
+    system = worldbuilding.generate_star_system("sys-1", x=3.0, y=4.0)
+    assert system.id == "sys-1"
+    assert 3 <= len(system.bodies) <= 8
+    assert system.exploration_status in worldbuilding.ExplorationStatus
+
+# Every page fits in a Discord message
+def test_pages_fit_discord_limit():
+    system = worldbuilding.generate_star_system("sys-2")
+    for detail in DetailLevel:
+        for page in SystemRenderer().render(system, detail):
+            assert len(page) <= DISCORD_MESSAGE_LIMIT
+            assert page.startswith("```text") and page.endswith("```")
+
+# Long output is split across numbered pages
+def test_paginate_splits_long_output():
+    pages = paginate([f"line {i} " + "x" * 80 for i in range(100)])
+    assert len(pages) > 1
+    assert all(len(p) <= DISCORD_MESSAGE_LIMIT for p in pages)
+    assert f"[Page 1/{len(pages)}]" in pages[0]
+
+# Repeat views come from the cache until the system changes
+def test_render_cache_invalidated_on_touch():
+    system = worldbuilding.generate_star_system("sys-3")
+    renderer = SystemRenderer()
+    first = renderer.render(system)
+    assert renderer.render(system) is first
+    system.star.name = "Renamed"
+    system.touch()
+    second = renderer.render(system)
+    assert second is not first
+    assert "Renamed" in second[0]
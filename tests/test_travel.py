@@ -0,0 +1,65 @@
+import sys
+import os
+import random
+import asyncio
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models import worldbuilding
+from models.travel import RoutePlanner
+
+def random_planner(count=400, seed=7):
+    rng = random.Random(seed)
+    planner = RoutePlanner(jump_range_ly=20.0, num_landmarks=4)
+    planner.add_positions((f"S{i}", rng.uniform(0, 300), rng.uniform(0, 300)) for i in range(count))
+    return planner
+
+# Systems are only linked within jump range
+def test_edges_respect_jump_range():
+    planner = RoutePlanner(jump_range_ly=10.0)
+    planner.add_positions([("A", 0, 0), ("B", 8, 0), ("C", 30, 0)])
+    assert "B" in planner.edges["A"]
+    assert "C" not in planner.edges["B"]
+    assert planner.route("A", "C") is None
+
+# A* with landmarks finds the true shortest distance
+def test_route_matches_dijkstra():
+    planner = random_planner()
+    planner.build_landmarks()
+    ids = list(planner.positions)
+    for a, b in [(ids[0], ids[-1]), (ids[10], ids[200]), (ids[5], ids[6])]:
+        expected = planner._dijkstra(a).get(b)
+        route = planner.route(a, b)
+        if expected is None:
+            assert route is None
+        else:
+            assert abs(route.distance_ly - expected) < 1e-9
+            assert route.systems[0] == a and route.systems[-1] == b
+
+# Adding a sector repairs landmark distances incrementally
+def test_incremental_landmark_repair():
+    planner = random_planner()
+    planner.build_landmarks()
+    planner.add_systems(worldbuilding.generate_sector(3, 0, 30, seed=1))
+    for landmark, table in zip(planner._landmarks, planner._landmark_dist):
+        fresh = planner._dijkstra(landmark)
+        assert table.keys() == fresh.keys()
+        assert all(abs(table[k] - fresh[k]) < 1e-9 for k in fresh)
+
+# New systems bridge previously unreachable ones
+def test_route_through_new_systems():
+    planner = RoutePlanner(jump_range_ly=10.0)
+    planner.add_positions([("A", 0, 0), ("C", 18, 0)])
+    assert planner.route("A", "C") is None
+    planner.add_position("B", 9, 0)
+    route = planner.route("A", "C")
+    assert route.systems == ["A", "B", "C"]
+    assert route.jumps == 2
+
+# Queries never place landmarks; refresh_landmarks does, off the loop
+def test_landmarks_built_only_on_refresh():
+    planner = random_planner()
+    ids = list(planner.positions)
+    planner.route(ids[0], ids[1])
+    assert planner._landmarks == [] and planner.landmarks_stale
+    assert asyncio.run(planner.refresh_landmarks())
+    assert len(planner._landmarks) == 4 and not planner.landmarks_stale
+    assert not asyncio.run(planner.refresh_landmarks())
@@ -1,7 +1,10 @@
 import sys
 import os
+import threading
+import pytest
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from models import worldbuilding
+from models import generation_jobs
 
 # Star name generation
 def test_generate_star_name():
@@ -71,4 +74,28 @@ def test_get_colony_factions():
 # Colony allegiance
 def test_get_colony_allegiance():
     a = worldbuilding.get_colony_allegiance(7)
-    assert a in worldbuilding.ColonyAllegiance 
\ No newline at end of file
+    assert a in worldbuilding.ColonyAllegiance
+
+# Seeded sectors come out identical, whether generated whole or in chunks
+def test_generate_sector_is_deterministic():
+    whole = worldbuilding.generate_sector(0, 0, 4, seed=42)
+    chunk = worldbuilding.generate_sector(0, 0, 2, seed=42, start=2)
+    assert [s.star.name for s in whole[2:]] == [s.star.name for s in chunk]
+    assert all(0 <= s.x <= worldbuilding.SECTOR_SIZE_LY for s in whole)
+
+# A cancel check between orbital bodies stops generation part-way through a system
+def test_generation_stops_when_cancelled():
+    checks = []
+
+    def stop_after_two():
+        checks.append(1)
+        return len(checks) > 2
+
+    with pytest.raises(worldbuilding.GenerationCancelled):
+        worldbuilding.generate_seeded_system(7, should_stop=stop_after_two)
+    assert len(checks) == 3
+    cancel = threading.Event()
+    assert generation_jobs.system_lines(7, cancel=cancel) == generation_jobs.system_lines(7)
+    cancel.set()
+    with pytest.raises(worldbuilding.GenerationCancelled):
+        generation_jobs.sector_lines(7, 0, 0, 0, 3, cancel=cancel)